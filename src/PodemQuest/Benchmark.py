@@ -0,0 +1,419 @@
+# Apache License
+# Version 2.0, January 2004
+# http://www.apache.org/licenses/
+
+# Copyright (c) 2024, Youssef Kandil (youssefkandil@aucegypt.edu) 
+#                     Mohamed Shalan (mshalan@aucegypt.edu)
+# 
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import argparse
+import json
+import os
+import platform
+import random
+import sys
+import tempfile
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from .Circuit import Circuit
+from .PODEM import PODEM
+from .PhaseTimer import PhaseTimer
+
+try:
+    import resource
+except ImportError:  # Not available on Windows
+    resource = None
+
+# Version of the layout of the results file
+RESULTS_FORMAT = 1
+
+DEFAULT_BASELINE = os.path.join("benchmarks", "baseline.json")
+
+# Options of PODEM.compute() for the large circuits, which are not practical with one
+# fault simulation per PODEM vector and the default backtrack limit
+LARGE_CIRCUIT_OPTIONS = {
+    "random_patterns": True,
+    "fault_sim_batch": 64,
+    "backtrack_limit": 100,
+}
+
+# Benchmark cases: the bench file of the circuit under --bench_dir, or the parameters
+# (primary inputs, gates, seed) of a generated circuit, see generate_circuit(), and the
+# options of PODEM.compute()
+BENCHMARK_CASES = {
+    "c17": {"file": "c17.bench", "options": {}},
+    "s27": {"file": "s27.bench", "options": {}},
+    "aes128": {"file": "aes128.bench", "options": LARGE_CIRCUIT_OPTIONS},
+    "random_2k": {"generate": (64, 2000, 1), "options": LARGE_CIRCUIT_OPTIONS},
+    "random_10k": {"generate": (128, 10000, 2), "options": LARGE_CIRCUIT_OPTIONS},
+}
+
+# Gate types of the generated circuits, with their weights
+GENERATED_GATE_TYPES = (
+    ("AND", 3),
+    ("NAND", 3),
+    ("OR", 3),
+    ("NOR", 3),
+    ("XOR", 2),
+    ("XNOR", 2),
+    ("NOT", 2),
+    ("BUFF", 1),
+)
+
+# Number of most recent nets the inputs of a generated gate are drawn from, so the
+# generated circuits have reconvergent fanout but not the depth of a chain of gates,
+# where most faults are redundant or aborted
+GENERATED_WINDOW = 4096
+
+# Largest allowed regressions against the baseline: relative increase of the times and
+# of the peak memory and pattern count, and absolute drop of the coverage in percent
+DEFAULT_THRESHOLDS = {
+    "time": 0.25,
+    "memory": 0.10,
+    "patterns": 0.05,
+    "coverage": 0.0,
+}
+
+# Time differences below this number of seconds are never reported as regressions
+TIME_TOLERANCE = 0.05
+
+# Metrics compared against the baseline, with the threshold that applies to each of them
+COMPARED_METRICS = (
+    ("parse_time", "time"),
+    ("scoap_time", "time"),
+    ("atpg_time", "time"),
+    ("output_time", "time"),
+    ("total_time", "time"),
+    ("peak_memory_mib", "memory"),
+    ("patterns", "patterns"),
+    ("coverage", "coverage"),
+)
+
+
+def generate_circuit(path, inputs, gates, seed):
+    """
+    Writes a random combinational circuit in bench format.
+
+    Every gate reads from the GENERATED_WINDOW most recent nets, and every net that no
+    gate reads is a primary output, so every fault site is observable. The circuit only
+    depends on the arguments.
+
+    Args:
+        path (str): The path of the bench file to write.
+        inputs (int): The number of primary inputs.
+        gates (int): The number of gates.
+        seed (int): The seed of the generator.
+
+    Returns:
+        None
+    """
+    rng = random.Random(seed)
+    gate_types = [gate_type for gate_type, _ in GENERATED_GATE_TYPES]
+    weights = [weight for _, weight in GENERATED_GATE_TYPES]
+
+    nets = [f"I{idx}" for idx in range(inputs)]
+    lines = [f"INPUT({net})" for net in nets]
+    unread_nets = set(nets)
+    gate_lines = []
+
+    for idx in range(gates):
+        gate_type = rng.choices(gate_types, weights)[0]
+        window = nets[-GENERATED_WINDOW:]
+        if gate_type == "NOT" or gate_type == "BUFF":
+            fanin = 1
+        else:
+            fanin = min(rng.choice((2, 2, 2, 2, 3)), len(window))
+        gate_inputs = rng.sample(window, fanin)
+        unread_nets.difference_update(gate_inputs)
+
+        net = f"G{idx}"
+        gate_lines.append(f"{net} = {gate_type}({', '.join(gate_inputs)})")
+        nets.append(net)
+        unread_nets.add(net)
+
+    lines += [f"OUTPUT({net})" for net in nets if net in unread_nets]
+    lines += gate_lines
+
+    with open(path, "w") as f:
+        f.write("\n".join(lines) + "\n")
+
+    return
+
+
+def peak_memory_mib():
+    """
+    Returns the peak resident memory of the current process.
+
+    Returns:
+        float: The peak memory in MiB, or None if it cannot be measured on this platform.
+    """
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Bytes on macOS, KiB elsewhere
+    if sys.platform == "darwin":
+        peak /= 1024
+    return peak / 1024
+
+
+def run_case(bench_file, work_dir, options):
+    """
+    Runs the parse, SCOAP, ATPG and output phases on one circuit.
+
+    It runs in a fresh process, so the peak memory only covers this circuit. The phases
+    are timed by the PhaseTimer of the command line, so the results break the run down
+    like the report does: the parse time includes compiling the netlist, the ATPG time
+    covers every phase of PODEM.compute() up to compaction, and the output time covers
+    writing the pattern file and the report.
+
+    Args:
+        bench_file (str): The path of the bench file.
+        work_dir (str): The directory of the pattern and report files.
+        options (dict): The options of PODEM.compute().
+
+    Returns:
+        dict: The metrics of the run, with the time of every phase of the report in
+              'phase_times'.
+    """
+    name = os.path.splitext(os.path.basename(bench_file))[0]
+    timer = PhaseTimer()
+
+    circuit = Circuit(bench_file, timer=timer)
+    with timer.phase("SCOAP"):
+        circuit.calculate_SCOAP()
+
+    podem = PODEM(
+        circuit=circuit,
+        output_file=os.path.join(work_dir, f"{name}.txt"),
+        timer=timer,
+    )
+    podem.compute(algorithm="advanced", **options)
+
+    with timer.phase("report"):
+        with open(os.path.join(work_dir, f"{name}_report.txt"), "w") as f:
+            f.write(podem.report())
+
+    times = timer.times
+    parse_time = times.get("parse", 0.0) + times.get("compile", 0.0)
+    scoap_time = times.get("SCOAP", 0.0)
+    output_time = times.get("output", 0.0) + times.get("report", 0.0)
+    total_time = timer.total()
+    atpg_time = total_time - parse_time - scoap_time - output_time
+    return {
+        "gates": len(circuit.gates),
+        "faults": podem.no_of_faults,
+        "parse_time": parse_time,
+        "scoap_time": scoap_time,
+        "atpg_time": atpg_time,
+        "output_time": output_time,
+        "total_time": total_time,
+        "faults_per_second": podem.no_of_faults / atpg_time if atpg_time > 0 else 0.0,
+        "peak_memory_mib": peak_memory_mib(),
+        "coverage": podem.fault_coverage,
+        "patterns": podem.no_of_patterns,
+        "backtracks": podem.backtracks,
+        "phase_times": dict(times),
+    }
+
+
+def run_suite(cases, bench_dir, repeat):
+    """
+    Runs the benchmark cases, each in a fresh process.
+
+    With several repetitions, the smallest time of every phase and the smallest peak memory
+    are kept; the other metrics do not depend on the repetition.
+
+    Args:
+        cases (list): The names of the cases in BENCHMARK_CASES.
+        bench_dir (str): The directory of the bench files of the cases.
+        repeat (int): The number of runs of every case.
+
+    Returns:
+        dict: The metrics of every case, by case name.
+    """
+    # A spawned process starts from a fresh interpreter, unlike a forked one
+    context = multiprocessing.get_context("spawn")
+    results = {}
+
+    with tempfile.TemporaryDirectory(prefix="podemquest_bench_") as work_dir:
+        for name in cases:
+            case = BENCHMARK_CASES[name]
+            if "generate" in case:
+                bench_file = os.path.join(work_dir, f"{name}.bench")
+                generate_circuit(bench_file, *case["generate"])
+            else:
+                bench_file = os.path.join(bench_dir, case["file"])
+
+            runs = []
+            for _ in range(repeat):
+                with ProcessPoolExecutor(1, mp_context=context) as executor:
+                    future = executor.submit(
+                        run_case, bench_file, work_dir, case["options"]
+                    )
+                    runs.append(future.result())
+
+            metrics = dict(runs[0])
+            for key in metrics:
+                if key.endswith("_time") or key == "peak_memory_mib":
+                    values = [run[key] for run in runs if run[key] is not None]
+                    metrics[key] = min(values) if values else None
+            metrics["phase_times"] = {
+                phase: min(run["phase_times"][phase] for run in runs)
+                for phase in metrics["phase_times"]
+            }
+            if metrics["atpg_time"]:
+                metrics["faults_per_second"] = metrics["faults"] / metrics["atpg_time"]
+            results[name] = metrics
+
+            print(
+                f"{name}: {metrics['total_time']:.3f} s total, "
+                f"{metrics['atpg_time']:.3f} s ATPG, "
+                f"{metrics['faults_per_second']:.1f} faults/s, "
+                f"coverage {metrics['coverage']:.2f}%, {metrics['patterns']} patterns"
+            )
+            sys.stdout.flush()
+
+    return results
+
+
+def compare_results(results, baseline, thresholds):
+    """
+    Compares benchmark results against a baseline.
+
+    Args:
+        results (dict): The metrics of every case, by case name.
+        baseline (dict): The metrics of the baseline, by case name.
+        thresholds (dict): The largest allowed regressions, see DEFAULT_THRESHOLDS.
+
+    Returns:
+        list: One message per regression.
+    """
+    regressions = []
+    for name, metrics in results.items():
+        if name not in baseline:
+            continue
+        for metric, kind in COMPARED_METRICS:
+            old = baseline[name].get(metric)
+            new = metrics.get(metric)
+            if old is None or new is None:
+                continue
+
+            if kind == "coverage":
+                regressed = old - new > thresholds[kind]
+                change = f"{new - old:+.2f} points"
+            else:
+                regressed = new > old * (1 + thresholds[kind])
+                if kind == "time":
+                    regressed = regressed and new - old > TIME_TOLERANCE
+                change = f"{(new - old) / old * 100:+.1f}%" if old else "new"
+
+            if regressed:
+                regressions.append(f"{name}: {metric} {old:.4g} -> {new:.4g} ({change})")
+
+    return regressions
+
+
+def main(argv=None):
+    """
+    Runs the benchmark suite: podemquest bench [options].
+
+    Args:
+        argv (list): The command line arguments. Defaults to None, which uses sys.argv.
+
+    Returns:
+        int: 1 if a regression against the baseline is found, 0 otherwise.
+    """
+    parser = argparse.ArgumentParser(
+        prog="podemquest bench",
+        description="Run the PodemQuest benchmark suite and compare it against a baseline.",
+    )
+    parser.add_argument(
+        "--cases",
+        type=str,
+        nargs="+",
+        choices=list(BENCHMARK_CASES),
+        help="The benchmark cases to run",
+        default=list(BENCHMARK_CASES),
+    )
+    parser.add_argument(
+        "--bench_dir",
+        type=str,
+        help="The directory of the bench files of the cases",
+        default="test",
+    )
+    parser.add_argument(
+        "--repeat",
+        type=int,
+        help="Run every case this number of times and keep the fastest run",
+        default=1,
+    )
+    parser.add_argument(
+        "-o",
+        "--output_file",
+        type=str,
+        help="Write the results to this JSON file",
+    )
+    parser.add_argument(
+        "--baseline",
+        type=str,
+        help="The JSON file of the baseline results",
+        default=DEFAULT_BASELINE,
+    )
+    parser.add_argument(
+        "--update_baseline",
+        action="store_true",
+        help="Write the results to the baseline file instead of comparing against it",
+    )
+    for kind, default in DEFAULT_THRESHOLDS.items():
+        parser.add_argument(
+            f"--{kind}_threshold",
+            type=float,
+            help=f"The largest allowed {kind} regression (default {default})",
+            default=default,
+        )
+
+    args = parser.parse_args(argv)
+    results = {
+        "format": RESULTS_FORMAT,
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "cases": run_suite(args.cases, args.bench_dir, args.repeat),
+    }
+
+    if args.output_file:
+        with open(args.output_file, "w") as f:
+            json.dump(results, f, indent=2)
+
+    if args.update_baseline:
+        os.makedirs(os.path.dirname(args.baseline) or ".", exist_ok=True)
+        with open(args.baseline, "w") as f:
+            json.dump(results, f, indent=2)
+        print(f"Baseline written to {args.baseline}")
+        return 0
+
+    if not os.path.exists(args.baseline):
+        print(f"No baseline at {args.baseline}, nothing to compare")
+        return 0
+
+    with open(args.baseline) as f:
+        baseline = json.load(f)
+    thresholds = {kind: getattr(args, f"{kind}_threshold") for kind in DEFAULT_THRESHOLDS}
+    regressions = compare_results(results["cases"], baseline["cases"], thresholds)
+
+    for message in regressions:
+        print(f"REGRESSION {message}")
+    if not regressions:
+        print(f"No regression against {args.baseline}")
+
+    return 1 if regressions else 0
@@ -0,0 +1,251 @@
+# Apache License
+# Version 2.0, January 2004
+# http://www.apache.org/licenses/
+
+# Copyright (c) 2024, Youssef Kandil (youssefkandil@aucegypt.edu) 
+#                     Mohamed Shalan (mshalan@aucegypt.edu)
+# 
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+from .CompiledCircuit import ARRAY_NAMES
+from .CircuitCache import file_mode, tool_version
+from .FaultStatus import Fault_Status
+import hashlib
+import json
+import os
+import tempfile
+import time
+
+# Layout version of the checkpoint files, to be increased whenever the stored data changes
+CHECKPOINT_FORMAT = 1
+
+# Default minimum number of seconds between two checkpoints
+CHECKPOINT_INTERVAL = 60.0
+
+# Options of the run that change the list of target faults: a checkpoint can only be
+# resumed with the same values
+CHECKPOINT_STRICT_OPTIONS = (
+    "algorithm",
+    "collapse_faults",
+    "fault_sample",
+    "sample_strata",
+    "sample_seed",
+)
+
+
+class CheckpointError(ValueError):
+    """
+    Raised when a checkpoint file cannot be resumed by the current run.
+    """
+
+
+def netlist_digest(circuit):
+    """
+    Returns the SHA-256 of the compiled netlist and fault list of a circuit.
+
+    The digest only depends on the netlist, so it is the same whether the circuit was
+    parsed or loaded from the circuit cache.
+
+    Args:
+        circuit (Circuit): The circuit object.
+
+    Returns:
+        str: The hexadecimal digest.
+    """
+    compiled = circuit.compiled
+    digest = hashlib.sha256()
+    digest.update("\n".join(compiled.names).encode())
+    for name in ARRAY_NAMES:
+        digest.update(b"\0" + getattr(compiled, name).tobytes())
+    digest.update(
+        "\n".join(f"{name}/{value}" for name, value in circuit.faults).encode()
+    )
+
+    return digest.hexdigest()
+
+
+class Checkpoint:
+    """
+    Periodic checkpoint of an ATPG run, for resuming it after a crash or preemption.
+
+    A checkpoint file records the status of every resolved target fault, the test vectors
+    generated so far, the counters of the report, the options of the run and the digest of
+    the netlist. The faults that have no status are pending. The file is written to a
+    temporary file and renamed, so a run killed while writing leaves the previous
+    checkpoint intact.
+
+    The run calls due() as often as it likes, and saves a checkpoint when it returns True,
+    so the cost of a check is a single clock read and the number of saves is bounded by the
+    interval.
+    """
+
+    def __init__(self, filename, interval=CHECKPOINT_INTERVAL):
+        """
+        Initializes a Checkpoint object.
+
+        Args:
+            filename (str): The path of the checkpoint file.
+            interval (float): The minimum number of seconds between two checkpoints.
+                              Defaults to CHECKPOINT_INTERVAL.
+
+        Returns:
+            None
+        """
+        self.filename = filename
+        self.interval = interval
+
+        # Netlist digest and options of the run, see start()
+        self.netlist = None
+        self.options = {}
+
+        # Test vectors and fault status resolved before the checkpointed phase
+        self.base_vectors = []
+        self.base_status = {}
+
+        self.next_save = 0
+
+        # Number of checkpoints written, and the seconds spent writing them
+        self.saves = 0
+        self.save_time = 0.0
+
+        return
+
+    def load(self, circuit, options):
+        """
+        Reads the checkpoint file of an interrupted run.
+
+        Args:
+            circuit (Circuit): The circuit object of the run.
+            options (dict): The options of the run.
+
+        Returns:
+            tuple: The test vectors, a dict mapping every resolved fault to its
+                   Fault_Status, and the counters of the report, or None if there is no
+                   checkpoint file.
+
+        Raises:
+            CheckpointError: If the file is not a checkpoint, or if the checkpoint belongs
+                             to another netlist, another release of the tool, or a run with
+                             different strict options.
+        """
+        try:
+            with open(self.filename, "r") as f:
+                data = json.load(f)
+        except FileNotFoundError:
+            return None
+        except ValueError:
+            raise CheckpointError(f"{self.filename} is not a checkpoint file") from None
+
+        if not isinstance(data, dict) or data.get("format") != CHECKPOINT_FORMAT:
+            raise CheckpointError(f"Unsupported checkpoint format in {self.filename}")
+        if data["tool_version"] != tool_version():
+            raise CheckpointError(
+                f"Checkpoint {self.filename} was written by PodemQuest "
+                f"{data['tool_version']}, not {tool_version()}"
+            )
+        if data["netlist"] != netlist_digest(circuit):
+            raise CheckpointError(
+                f"Checkpoint {self.filename} is for a different netlist"
+            )
+        for name in CHECKPOINT_STRICT_OPTIONS:
+            if data["options"].get(name) != options.get(name):
+                raise CheckpointError(
+                    f"Checkpoint {self.filename} was written with {name}="
+                    f"{data['options'].get(name)}, not {options.get(name)}"
+                )
+
+        fault_status = {}
+        for status in Fault_Status:
+            for name, value in data["faults"][status.value]:
+                fault_status[(name, value)] = status
+
+        return data["vectors"], fault_status, data["counters"]
+
+    def start(self, circuit, options, base_vectors, base_status):
+        """
+        Starts checkpointing a run.
+
+        Args:
+            circuit (Circuit): The circuit object of the run.
+            options (dict): The options of the run.
+            base_vectors (list): The test vectors generated before the checkpointed phase.
+            base_status (dict): The status of the faults resolved before the checkpointed
+                                phase.
+
+        Returns:
+            None
+        """
+        self.netlist = netlist_digest(circuit)
+        self.options = options
+        self.base_vectors = base_vectors
+        self.base_status = base_status
+        self.next_save = time.monotonic() + self.interval
+
+        return
+
+    def due(self):
+        """
+        Returns whether the interval has elapsed since the previous checkpoint.
+
+        Returns:
+            bool: True if a checkpoint should be saved.
+        """
+        return time.monotonic() >= self.next_save
+
+    def save(self, vectors, fault_status, counters):
+        """
+        Writes a checkpoint atomically.
+
+        Args:
+            vectors (list): The test vectors of the checkpointed phase so far.
+            fault_status (dict): The status of the faults resolved by the checkpointed
+                                 phase so far.
+            counters (dict): The counters of the report, by PODEM attribute name.
+
+        Returns:
+            None
+        """
+        start_time = time.perf_counter()
+
+        # A fault resolved again by the checkpointed phase takes its new status
+        statuses = dict(self.base_status)
+        statuses.update(fault_status)
+        faults = {status.value: [] for status in Fault_Status}
+        for fault, status in statuses.items():
+            faults[status.value].append(fault)
+        data = {
+            "format": CHECKPOINT_FORMAT,
+            "tool_version": tool_version(),
+            "netlist": self.netlist,
+            "options": self.options,
+            "counters": counters,
+            "faults": faults,
+            "vectors": self.base_vectors + vectors,
+        }
+
+        directory = os.path.dirname(os.path.abspath(self.filename))
+        fd, temp_path = tempfile.mkstemp(dir=directory, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "w") as f:
+                json.dump(data, f)
+            os.chmod(temp_path, file_mode(directory))
+            os.replace(temp_path, self.filename)
+        except BaseException:
+            os.unlink(temp_path)
+            raise
+
+        self.saves += 1
+        self.save_time += time.perf_counter() - start_time
+        self.next_save = time.monotonic() + self.interval
+
+        return
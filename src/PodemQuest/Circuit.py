@@ -18,14 +18,26 @@
 # limitations under the License.
 
 from .Gate import Gate
+from .CompiledCircuit import CompiledCircuit
+from .CircuitCache import CircuitCache
+from .PhaseTimer import PhaseTimer
+import math
+import random
 import re
 
+# A line of a bench file: INPUT(net), OUTPUT(net) or net = TYPE(net, net, ...).
+# Comments and blank lines do not match.
+NET_NAME = r"[\w.\[\]]+"
+BENCH_LINE_PATTERN = re.compile(
+    rf"\s*(?:(INPUT|OUTPUT)\(\s*({NET_NAME})\s*\)|({NET_NAME})\s*=\s*(\w+)\(([^)]*)\))"
+)
+
 
 class Circuit:
 
     index_id = 0
 
-    def __init__(self, filename):
+    def __init__(self, filename=None, cache_dir=None, timer=None):
         """
         Initializes a Circuit object with default attributes.
 
@@ -33,9 +45,21 @@ class Circuit:
         a list of primary output gates, a dictionary of circuit information, and a dictionary that maps
         each primary input to the corresponding gates.
 
+        Args:
+            filename (str): The path of the bench file. Defaults to None, which creates an
+                             empty circuit, see extract_subcircuit().
+            cache_dir (str): Load the circuit and its SCOAP values from the cache in this
+                             directory, or parse the file and add it to the cache (see
+                             CircuitCache). Defaults to None, which disables the cache.
+            timer (PhaseTimer): Times the parse, compile and SCOAP phases. Defaults to
+                             None, which does not record the times.
+
         Returns:
             None
         """
+        if timer is None:
+            timer = PhaseTimer()
+
         # Dictionary of all gates in the circuit mapped to the ID of their output pins
         # This mapping is very useful for when searching for neighbouring gates
         self.gates = {}
@@ -52,85 +76,148 @@ class Circuit:
         # List of all faults in the circuit
         self.faults = []
 
-        self.parse_circuit_file(filename)
+        # Gate inputs that refer to a net defined later in the file, by net name, as
+        # (gate, input index) pairs that are filled in when the net is defined
+        self.pending_inputs = {}
+
+        # Levelized, integer-indexed netlist built after the graph, see compile()
+        self.compiled = None
+
+        # Fault collapsing results, see collapse_faults()
+        self.collapsed_faults = []
+        self.equivalent_faults = {}
+        self.dominating_faults = {}
+
+        # Fault sampling results, see sample_faults()
+        self.sampled_faults = []
+        self.fault_strata = {}
+
+        # Set once the SCOAP values of the gates are calculated
+        self.SCOAP_calculated = False
+
+        if filename is None:
+            return
+
+        if cache_dir is not None:
+            cache = CircuitCache(cache_dir)
+            with timer.phase("cache load"):
+                loaded = cache.load(self, filename)
+            if loaded:
+                return
+
+        self.parse_circuit_file(filename, timer)
         # circuit.parse_fault_file(fault_file)
-        self.generate_fault_vector()
+        with timer.phase("parse"):
+            self.generate_fault_vector()
+
+        if cache_dir is not None:
+            with timer.phase("SCOAP"):
+                self.calculate_SCOAP()
+            with timer.phase("cache store"):
+                cache.store(self, filename)
 
         return
 
-    def parse_circuit_file(self, filename):
+    def parse_circuit_file(self, filename, timer=None):
         """
         Parses a text file describing a circuit and adds the gates to the circuit.
 
+        The file is streamed line by line in a single pass instead of being read whole.
+        Every line is classified with one combined pattern, and each gate is connected to its
+        input gates as soon as they are defined (see add_gate()), so no intermediate lists
+        of pin names are kept.
+
         Args:
             filename (str): The name of the file to parse.
+            timer (PhaseTimer): Times the parse and compile phases. Defaults to None,
+                                which does not record the times.
 
         Returns:
             None
         """
-        # Open the file
-        with open(filename, "r") as file:
-            lines = file.readlines()
+        if timer is None:
+            timer = PhaseTimer()
 
-            # Define regular expression patterns
-            input_pattern = re.compile(r"INPUT\(([\w_.\[\]0-9]+)\)")
-            output_pattern = re.compile(r"OUTPUT\(([\w_.\[\]0-9]+)\)")
-            gate_pattern = re.compile(r"([\w_.\[\]0-9]+) = (\w+)\(([\w_.\[\]0-9 ,]+)\)")
+        with timer.phase("parse"):
+            self.read_bench_file(filename)
 
-            # Iterate over each line in the file
-            for line in lines:
-                line = line.strip()
+        with timer.phase("compile"):
+            self.compile()
+        return
 
-                # Check if the line starts with a comment
-                if line.startswith("#"):
-                    continue
+    def read_bench_file(self, filename):
+        """
+        Reads the gates of a bench file and connects them.
 
-                # Check if the line matches an input gate pattern
-                elif input_match := input_pattern.match(line):
-                    # Add the input gate id to the list of primary input gates
-                    self.add_gate("input_pin", [], str(input_match.group(1)).strip())
+        Args:
+            filename (str): The name of the file to parse.
+
+        Returns:
+            None
+        """
+        match_line = BENCH_LINE_PATTERN.match
 
-                # Check if the line matches an output gate pattern
-                elif output_match := output_pattern.match(line):
-                    # Add the output gate id to the list of primary output gates
+        with open(filename, "r") as file:
+            # Iterate over each line in the file
+            for line in file:
+                match = match_line(line)
+                # Comments and blank lines
+                if match is None:
+                    continue
+
+                pin_type, pin_net, gate_output, gate_type, gate_inputs = match.groups()
+                if gate_type is not None:
                     self.add_gate(
-                        "output_pin",
-                        [
-                            str(output_match.group(1)).strip(),
-                        ],
-                        "output_pin_" + str(output_match.group(1)).strip(),
+                        gate_type, "".join(gate_inputs.split()).split(","), gate_output
                     )
+                elif pin_type == "INPUT":
+                    self.add_gate("input_pin", [], pin_net)
+                else:
+                    self.add_gate("output_pin", [pin_net], "output_pin_" + pin_net)
 
-                # Check if the line matches a gate pattern
-                elif gate_match := gate_pattern.match(line):
-                    # Extract the gate information
-                    gate_output = str(gate_match.group(1)).strip()
-                    gate_type = gate_match.group(2).strip()
-                    gate_inputs = list(
-                        map(lambda x: x.strip(), gate_match.group(3).split(","))
-                    )
-                    # Add the gate to the circuit
-                    self.add_gate(gate_type, gate_inputs, gate_output)
+        # Every net must be defined somewhere in the file
+        if self.pending_inputs:
+            net = next(iter(self.pending_inputs))
+            raise ValueError(f"Net '{net}' is used but never defined in {filename}")
 
-        self.build_graph()
-        # Map each primary input to the corresponding gates
         return
 
     def add_gate(self, type, inputs, output_pin_id):
         """
-        Add a gate to the circuit.
+        Add a gate to the circuit and connect it to its input and output gates.
+
+        The inputs that are already defined are connected immediately. The others are
+        recorded in 'pending_inputs' and connected when their net is defined, so the output
+        gates of every gate are listed in file order.
 
         Args:
             type (str): The type of the gate.
-            inputs (List[int]): The inputs of the gate.
-            output (int): The output of the gate.
+            inputs (List[str]): The names of the input nets of the gate.
+            output_pin_id (str): The name of the output net of the gate.
 
         Returns:
             None
         """
 
         # Create a new gate with the given parameters
-        gate = Gate(self.index_id, type, inputs, output_pin_id)
+        gate = Gate(self.index_id, type, [], output_pin_id)
+
+        gates = self.gates
+        for input_id in inputs:
+            previous_gate = gates.get(input_id)
+            if previous_gate is None:
+                # Forward reference, filled in when the net is defined
+                self.pending_inputs.setdefault(input_id, []).append(
+                    (gate, len(gate.input_gates))
+                )
+            else:
+                previous_gate.output_gates.append(gate)
+            gate.input_gates.append(previous_gate)
+
+        # Connect the gates that were waiting for this net
+        for next_gate, input_index in self.pending_inputs.pop(output_pin_id, ()):
+            next_gate.input_gates[input_index] = gate
+            gate.output_gates.append(next_gate)
 
         if type == "input_pin":
             self.primary_input_gates.append(gate)
@@ -143,6 +230,42 @@ class Circuit:
         self.index_id += 1
         return
 
+    def extract_subcircuit(self, output_gates):
+        """
+        Extracts a set of primary outputs and their transitive fanin as a standalone circuit.
+
+        The gates of the sub-circuit keep their net names, so the faults and the primary
+        inputs of the sub-circuit map to the circuit by name. They are added in the order
+        of the circuit, and the sub-circuit is compiled and lists all of its faults.
+
+        Args:
+            output_gates (list): The primary output gates of the sub-circuit.
+
+        Returns:
+            Circuit: The sub-circuit.
+        """
+        # Transitive fanin of the outputs
+        cone = set()
+        stack = list(output_gates)
+        while stack:
+            gate = stack.pop()
+            if gate not in cone:
+                cone.add(gate)
+                stack.extend(gate.input_gates)
+
+        subcircuit = Circuit()
+        for gate in self.gates.values():
+            if gate in cone:
+                subcircuit.add_gate(
+                    gate.type,
+                    [input_gate.outputpin for input_gate in gate.input_gates],
+                    gate.outputpin,
+                )
+        subcircuit.compile()
+        subcircuit.generate_fault_vector()
+
+        return subcircuit
+
     def map_gates_to_PI(self):  # todo: remove this (build graph fulfills the purpose)
         """
         Maps each primary input to the corresponding gates.
@@ -165,33 +288,25 @@ class Circuit:
                     self.get_gates_from_PI[input].append(gate.id)
         return
 
-    def build_graph(self):
+    def compile(self, arrays=None):
         """
-        Builds the graph representation of the circuit, connecting the gates based on their input and output pins.
+        Compiles the circuit graph into a levelized, integer-indexed netlist.
 
-        This function iterates over all the gates in the circuit and connects them based on their input pins.
-        For each gate, it retrieves its input pins and clears the list of input gates.
-        Then, for each input pin, it retrieves the corresponding gate from the circuit's dictionary of gates,
-        and connects the current gate to it as an input gate.
-        It also connects the previous gate to the current gate as an output gate.
+        The compiled netlist is stored in the 'compiled' attribute and the logic level of
+        every gate is stored in its PI_distance attribute.
+
+        Args:
+            arrays (dict): The arrays of a previous compilation of the circuit, see
+                           CompiledCircuit. Defaults to None, which compiles the circuit.
 
         Returns:
             None
         """
-        # Iterate over each gate in the circuit
-        for current_gate in self.gates.values():
-            # Get the input pins of the gate
-            input_ids = current_gate.input_gates[:]
-            # Clear the list of input gates
-            current_gate.input_gates.clear()
-            # Iterate over each input pin
-            for input_id in input_ids:
-                # Retrieve the corresponding previous gate from the circuit's dictionary of gates
-                previous_gate = self.gates[input_id]
-                # Connect the current gate to the previous gate as an input gate
-                current_gate.input_gates.append(previous_gate)
-                # Connect the previous gate to the current gate as an output gate
-                previous_gate.output_gates.append(current_gate)
+        self.compiled = CompiledCircuit(self, arrays)
+        for gate, level in zip(self.compiled.gates, self.compiled.levels):
+            gate.PI_distance = level
+
+        return
 
     def print_circuit(self):
 
@@ -231,46 +346,49 @@ class Circuit:
         return
 
     def calculate_SCOAP(self):
+        """
+        Calculates the SCOAP controllability and observability values of every gate.
+
+        Returns:
+            None
+        """
         self.calculate_SCOAP_controlability()
-        self.reset_explored()
         self.calculate_SCOAP_observability()
+        self.SCOAP_calculated = True
 
     def calculate_SCOAP_controlability(self):
-        for pi in self.primary_input_gates:
-            self._SCOAP_controlability_recursive(pi)
-        return
-
-    def _SCOAP_controlability_recursive(self, gate):
-        if gate.explored:
-            return
-        if any(not g.explored for g in gate.input_gates):
-            return
-
-        gate.calculate_CC0()
-        gate.calculate_CC1()
-        gate.explored = True
+        """
+        Calculates CC0 and CC1 of every gate in a single pass in level order, so the inputs
+        of a gate are always calculated before the gate.
 
-        for g in gate.output_gates:
-            self._SCOAP_controlability_recursive(g)
+        Returns:
+            None
+        """
+        for gate in self.compiled.gates:
+            gate.calculate_CC0()
+            gate.calculate_CC1()
         return
 
     def calculate_SCOAP_observability(self):
-        for po in self.primary_output_gates:
-            self._SCOAP_observability_recursive(po)
-        return
-
-    def _SCOAP_observability_recursive(self, gate):
-        if gate.explored:
-            return
-        if any(not g.explored for g in gate.output_gates):
-            return
-
-        gate.calculate_CCb()
-        gate.explored = True
+        """
+        Calculates the observability of every gate and of its input pins in a single pass
+        in reverse level order.
 
-        for g in gate.input_gates:
-            self._SCOAP_observability_recursive(g)
+        The observability (CCb) of a net is the smallest observability of the input pins it
+        drives, and 0 for a primary output. Every gate output is final once all the gates
+        it drives are processed. Nets that reach no primary output have an infinite CCb.
 
+        Returns:
+            None
+        """
+        for gate in self.compiled.gates:
+            gate.CCb = 0 if gate.type == "output_pin" else math.inf
+
+        for gate in reversed(self.compiled.gates):
+            gate.calculate_CCb()
+            for input_gate, pin_CCb in zip(gate.input_gates, gate.pin_CCb):
+                if pin_CCb < input_gate.CCb:
+                    input_gate.CCb = pin_CCb
         return
 
     def reset_explored(self):
@@ -296,3 +414,192 @@ class Circuit:
             self.faults.append((gate.outputpin, 0))
             self.faults.append((gate.outputpin, 1))
         return
+
+    def collapse_faults(self):
+        """
+        Collapses the fault list using structural equivalence and dominance.
+
+        A net that drives a single gate input is the same line as that input, so its faults
+        can be related to the faults of the gate output:
+        - BUFF/output pin: input s-a-v is equivalent to output s-a-v.
+        - NOT: input s-a-v is equivalent to output s-a-(not v).
+        - AND/NAND/OR/NOR: input s-a-c is equivalent to the output fault produced by the
+          controlling value c, and the opposite output fault dominates the input s-a-(not c)
+          fault, so it is dropped in favour of the input fault.
+
+        The results are stored in three attributes:
+        - collapsed_faults: the fault class representatives to target, in the order of 'faults'.
+        - equivalent_faults: maps each representative to the faults of its equivalence class.
+        - dominating_faults: maps a representative to the dropped representatives whose faults
+          are detected by any test that detects it.
+
+        Returns:
+            None
+        """
+        # Union-find forest over the faults
+        parent = {fault: fault for fault in self.faults}
+
+        def find(fault):
+            while parent[fault] != fault:
+                parent[fault] = parent[parent[fault]]
+                fault = parent[fault]
+            return fault
+
+        def union(fault_a, fault_b):
+            # The fault list may be a subset of the structural faults (see parse_fault_file)
+            if fault_a not in parent or fault_b not in parent:
+                return
+            root_a, root_b = find(fault_a), find(fault_b)
+            if root_a != root_b:
+                parent[root_b] = root_a
+
+        # Dominance relations (dominating fault, dominated fault)
+        dominance = []
+
+        for gate in self.gates.values():
+            for input_gate in gate.input_gates:
+                # Only fanout-free nets are the same line as the gate input
+                if len(input_gate.output_gates) != 1:
+                    continue
+
+                net = input_gate.outputpin
+                out = gate.outputpin
+                if gate.type in ("BUFF", "BUF", "output_pin"):
+                    union((out, 0), (net, 0))
+                    union((out, 1), (net, 1))
+                elif gate.type == "NOT":
+                    union((out, 1), (net, 0))
+                    union((out, 0), (net, 1))
+                elif gate.type in ("AND", "NAND", "OR", "NOR"):
+                    # Controlling value of the gate and output value it produces
+                    controlling = 0 if gate.type in ("AND", "NAND") else 1
+                    controlled_out = controlling ^ gate.inversion_parity
+                    union((out, controlled_out), (net, controlling))
+                    dominance.append(((out, 1 - controlled_out), (net, 1 - controlling)))
+
+        # Group the faults of each equivalence class under its first fault
+        self.equivalent_faults = {}
+        representative = {}
+        for fault in self.faults:
+            root = find(fault)
+            if root not in representative:
+                representative[root] = fault
+                self.equivalent_faults[fault] = []
+            self.equivalent_faults[representative[root]].append(fault)
+
+        # Drop the dominating classes, making sure every dropped class is credited
+        # by a class that stays in the target list
+        dropped_by = {}
+
+        def resolve(fault):
+            while fault in dropped_by:
+                fault = dropped_by[fault]
+            return fault
+
+        for dominating, dominated in dominance:
+            if dominating not in parent or dominated not in parent:
+                continue
+            dominating = representative[find(dominating)]
+            dominated = representative[find(dominated)]
+            if dominating in dropped_by:
+                continue
+            if resolve(dominated) == dominating:
+                continue
+            dropped_by[dominating] = dominated
+
+        self.dominating_faults = {}
+        for dropped, dominated in dropped_by.items():
+            self.dominating_faults.setdefault(dominated, []).append(dropped)
+
+        self.collapsed_faults = [
+            fault for fault in self.equivalent_faults if fault not in dropped_by
+        ]
+
+        return
+
+    def sample_faults(self, size, strata="type", seed=0):
+        """
+        Draws a stratified random sample of the fault list.
+
+        The faults are grouped into strata by the type or the logic level of the gate they
+        are on, and every stratum gets a share of the sample proportional to its size, with
+        at least one fault, so the coverage of every stratum can be estimated. The shares
+        are rounded by the largest remainder method, so they add up to 'size' unless there
+        are more strata than 'size': the sample then holds one fault of every stratum.
+
+        The results are stored in two attributes:
+        - sampled_faults: the sampled faults, in the order of 'faults'.
+        - fault_strata: maps each stratum to its number of faults and its sampled faults.
+
+        Args:
+            size (int): The number of faults to sample.
+            strata (str): Group the faults by gate "type" or by logic "level".
+                          Defaults to "type".
+            seed (int): The seed of the sample. Defaults to 0.
+
+        Returns:
+            None
+        """
+        rng = random.Random(seed)
+
+        population = {}
+        for fault in self.faults:
+            gate = self.gates[fault[0]]
+            key = gate.type if strata == "type" else gate.PI_distance
+            population.setdefault(key, []).append(fault)
+
+        total = len(self.faults)
+        size = min(size, total)
+        quotas = {key: size * len(faults) / total for key, faults in population.items()}
+        shares = {key: max(1, math.floor(quota)) for key, quota in quotas.items()}
+
+        # Largest remainder method: the faults left go to the strata with the largest
+        # fractional quotas, and the faults added by the one-fault minimum are taken back
+        # from the strata with the smallest ones
+        order = sorted(population, key=lambda key: shares[key] - quotas[key])
+        for key in order[: max(0, size - sum(shares.values()))]:
+            shares[key] += 1
+        for _ in range(sum(shares.values()) - size):
+            reducible = [key for key in population if shares[key] > 1]
+            if not reducible:
+                break
+            key = max(reducible, key=lambda key: shares[key] - quotas[key])
+            shares[key] -= 1
+
+        sampled = set()
+        self.fault_strata = {}
+        for key, faults in population.items():
+            stratum_sample = rng.sample(faults, shares[key])
+            sampled.update(stratum_sample)
+            self.fault_strata[key] = (len(faults), stratum_sample)
+
+        self.sampled_faults = [fault for fault in self.faults if fault in sampled]
+
+        return
+
+    def expand_faults(self, detected_faults):
+        """
+        Expands detected fault class representatives back to the full fault list.
+
+        Args:
+            detected_faults (set): The detected representatives from 'collapsed_faults'.
+
+        Returns:
+            tuple: The set of detected faults of the full fault list, and the list of
+                   dominating faults whose detection could not be inferred.
+        """
+        detected = set()
+        stack = list(detected_faults)
+        while stack:
+            fault = stack.pop()
+            detected.update(self.equivalent_faults[fault])
+            stack.extend(self.dominating_faults.get(fault, []))
+
+        # Dominating faults are usually detected even when the fault they dominate is not
+        unresolved = []
+        for dropped_faults in self.dominating_faults.values():
+            for fault in dropped_faults:
+                if fault not in detected:
+                    unresolved.extend(self.equivalent_faults[fault])
+
+        return detected, unresolved
@@ -0,0 +1,372 @@
+# Apache License
+# Version 2.0, January 2004
+# http://www.apache.org/licenses/
+
+# Copyright (c) 2024, Youssef Kandil (youssefkandil@aucegypt.edu) 
+#                     Mohamed Shalan (mshalan@aucegypt.edu)
+# 
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+from .Gate import Gate
+from .CompiledCircuit import ARRAY_NAMES
+from array import array
+from importlib.metadata import version, PackageNotFoundError
+import functools
+import hashlib
+import json
+import math
+import mmap
+import os
+import stat
+import struct
+import tempfile
+
+# Layout version of the cache files, to be increased whenever the stored data changes
+CACHE_FORMAT = 2
+
+CACHE_MAGIC = b"PODEMQC\0"
+
+# Stored in place of the infinite CCb of the nets that reach no primary output
+UNOBSERVABLE = -1
+
+
+def source_digest(package_dir=None):
+    """
+    Returns the SHA-256 of the module sources of the package.
+
+    Args:
+        package_dir (str): The directory of the sources. Defaults to None, which is the
+                           directory of this module.
+
+    Returns:
+        str: The hex digest of the names and contents of the .py files of the package.
+    """
+    if package_dir is None:
+        package_dir = os.path.dirname(os.path.abspath(__file__))
+    digest = hashlib.sha256()
+    for name in sorted(os.listdir(package_dir)):
+        if name.endswith(".py"):
+            digest.update(name.encode() + b"\0")
+            with open(os.path.join(package_dir, name), "rb") as file:
+                digest.update(file.read())
+    return digest.hexdigest()
+
+
+@functools.lru_cache(maxsize=None)
+def tool_version():
+    """
+    Returns the version of the tool that keys the cache and checkpoint files.
+
+    Running from a source tree, the sources identify the release instead, so the cache
+    and checkpoint files of modified sources are not used. The sources are only hashed
+    on the first call.
+
+    Returns:
+        str: The version of the installed package, or "unknown-" followed by the start
+             of the source_digest() of the package.
+    """
+    try:
+        return version("podemquest")
+    except PackageNotFoundError:
+        return "unknown-" + source_digest()[:16]
+
+
+def default_cache_dir():
+    """
+    Returns the default directory of the circuit cache.
+
+    Returns:
+        str: $XDG_CACHE_HOME/podemquest, or ~/.cache/podemquest.
+    """
+    cache_home = os.environ.get("XDG_CACHE_HOME") or os.path.join(
+        os.path.expanduser("~"), ".cache"
+    )
+    return os.path.join(cache_home, "podemquest")
+
+
+def file_mode(directory=None):
+    """
+    Returns the permissions of a new file under the umask of the process.
+
+    tempfile.mkstemp() creates its files readable by the owner only, so the files written
+    atomically through a temporary file are given these permissions before the rename.
+    The umask can only be read by setting it for every thread of the process, so the
+    permissions are taken from a probe file created with the mode of open() instead.
+
+    Args:
+        directory (str): The directory of the probe file. Defaults to None, which is the
+                         temporary directory.
+
+    Returns:
+        int: The permission bits of a file created by open().
+    """
+    if directory is None:
+        directory = tempfile.gettempdir()
+    while True:
+        path = os.path.join(directory, f".podemquest-{os.urandom(8).hex()}.probe")
+        try:
+            fd = os.open(path, os.O_WRONLY | os.O_CREAT | os.O_EXCL, 0o666)
+        except FileExistsError:
+            continue
+        break
+    try:
+        return stat.S_IMODE(os.fstat(fd).st_mode)
+    finally:
+        os.close(fd)
+        os.unlink(path)
+
+
+class CircuitCache:
+    """
+    On-disk cache of parsed circuits.
+
+    A cache file holds everything needed to rebuild a Circuit without parsing the bench
+    file or running the testability analysis: the gate names and types, the fanin and
+    fanout lists, the logic levels, the fault list, and the CC0/CC1/CCb values with the
+    observability of every input pin. The file
+    name is the SHA-256 of the bench file contents, the tool version and the cache format,
+    so a cache file is never used for a different netlist or by a different release.
+
+    The file starts with CACHE_MAGIC and a JSON header giving the type code, offset and
+    length of every section, followed by the sections as raw arrays aligned to 8 bytes.
+    The file is memory-mapped and each array is copied out of the mapping in one block.
+    """
+
+    def __init__(self, cache_dir):
+        """
+        Initializes a CircuitCache object.
+
+        Args:
+            cache_dir (str): The directory of the cache files, created when needed.
+
+        Returns:
+            None
+        """
+        self.cache_dir = cache_dir
+
+    def get_path(self, filename):
+        """
+        Returns the path of the cache file of a bench file.
+
+        Args:
+            filename (str): The path of the bench file.
+
+        Returns:
+            str: The path of the cache file.
+        """
+        digest = hashlib.sha256()
+        with open(filename, "rb") as file:
+            for chunk in iter(lambda: file.read(1 << 20), b""):
+                digest.update(chunk)
+        digest.update(f"\0{tool_version()}\0{CACHE_FORMAT}".encode())
+
+        return os.path.join(self.cache_dir, digest.hexdigest() + ".bin")
+
+    def load(self, circuit, filename):
+        """
+        Rebuilds a circuit from its cache file.
+
+        Args:
+            circuit (Circuit): An empty circuit object, filled in place.
+            filename (str): The path of the bench file.
+
+        Returns:
+            bool: True if the circuit was loaded, False if there is no valid cache file.
+        """
+        try:
+            with open(self.get_path(filename), "rb") as file:
+                with mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as data:
+                    return self.read_sections(circuit, data)
+        except (OSError, ValueError, KeyError, IndexError, struct.error):
+            # Drop a partially loaded circuit
+            circuit.gates.clear()
+            circuit.primary_input_gates = []
+            circuit.primary_output_gates = []
+            circuit.faults = []
+            circuit.index_id = 0
+            circuit.compiled = None
+            return False
+
+    def read_sections(self, circuit, data):
+        """
+        Rebuilds a circuit from the contents of a cache file.
+
+        Args:
+            circuit (Circuit): An empty circuit object, filled in place.
+            data (mmap): The contents of the cache file.
+
+        Returns:
+            bool: True if the circuit was loaded, False if the file is not a cache file.
+        """
+        if data[: len(CACHE_MAGIC)] != CACHE_MAGIC:
+            return False
+        (header_length,) = struct.unpack_from("<I", data, len(CACHE_MAGIC))
+        header_start = len(CACHE_MAGIC) + 4
+        header = json.loads(bytes(data[header_start : header_start + header_length]))
+
+        # Copy the sections out of the mapped file
+        sections = {}
+        for name, (typecode, offset, length) in header["sections"].items():
+            # Truncated file
+            if offset + length > len(data):
+                return False
+            if typecode == "s":
+                sections[name] = data[offset : offset + length]
+            else:
+                sections[name] = array(typecode)
+                sections[name].frombytes(data[offset : offset + length])
+
+        # Sections other than the compiled arrays are indexed by gate id
+        names = sections["names"].decode().split("\n")
+        type_names = [header["type_names"][idx] for idx in sections["type_indices"]]
+
+        # Gates in netlist order
+        gates = [None] * len(names)
+        for gate_idx, gid in enumerate(sections["netlist_ids"]):
+            gate = Gate(gate_idx, type_names[gid], [], names[gid])
+            circuit.gates[names[gid]] = gate
+            gates[gid] = gate
+        circuit.index_id = len(gates)
+
+        fanin, fanin_offsets = sections["fanin"], sections["fanin_offsets"]
+        fanout, fanout_offsets = sections["fanout"], sections["fanout_offsets"]
+        for gid, gate in enumerate(gates):
+            gate.input_gates = [
+                gates[idx] for idx in fanin[fanin_offsets[gid] : fanin_offsets[gid + 1]]
+            ]
+            gate.output_gates = [
+                gates[idx] for idx in fanout[fanout_offsets[gid] : fanout_offsets[gid + 1]]
+            ]
+
+        circuit.primary_input_gates = [gates[gid] for gid in sections["primary_inputs"]]
+        circuit.primary_output_gates = [
+            gates[gid] for gid in sections["primary_outputs"]
+        ]
+        circuit.compile(sections)
+
+        # A fault is stored as 2 * gate id + stuck-at value
+        circuit.faults = [(names[code >> 1], code & 1) for code in sections["faults"]]
+
+        pin_CCb = [
+            math.inf if value == UNOBSERVABLE else value for value in sections["pin_CCb"]
+        ]
+        for gid, (gate, CC0, CC1, CCb) in enumerate(
+            zip(gates, sections["CC0"], sections["CC1"], sections["CCb"])
+        ):
+            gate.CC0 = CC0
+            gate.CC1 = CC1
+            gate.CCb = math.inf if CCb == UNOBSERVABLE else CCb
+            gate.pin_CCb = pin_CCb[fanin_offsets[gid] : fanin_offsets[gid + 1]]
+        circuit.SCOAP_calculated = True
+
+        return True
+
+    def store(self, circuit, filename):
+        """
+        Writes the cache file of a circuit whose SCOAP values are calculated.
+
+        The file is written to a temporary file and renamed, so concurrent runs never see a
+        partial cache file. Errors are ignored, the cache is only an optimization.
+
+        Args:
+            circuit (Circuit): The circuit object.
+            filename (str): The path of the bench file.
+
+        Returns:
+            bool: True if the cache file was written.
+        """
+        compiled = circuit.compiled
+        gates = compiled.gates
+
+        type_names = sorted({gate.type for gate in gates})
+        type_index = {type: idx for idx, type in enumerate(type_names)}
+
+        try:
+            sections = {
+                "names": "\n".join(compiled.names).encode(),
+                "type_indices": array("b", [type_index[gate.type] for gate in gates]),
+            }
+            for name in ARRAY_NAMES:
+                sections[name] = getattr(compiled, name)
+            sections["faults"] = array(
+                "q", [2 * compiled.index[name] + value for name, value in circuit.faults]
+            )
+            sections["CC0"] = array("q", [gate.CC0 for gate in gates])
+            sections["CC1"] = array("q", [gate.CC1 for gate in gates])
+            sections["CCb"] = array(
+                "q",
+                [UNOBSERVABLE if gate.CCb == math.inf else gate.CCb for gate in gates],
+            )
+            # Observability of the input pins, in the order of the fanin array
+            sections["pin_CCb"] = array(
+                "q",
+                [
+                    UNOBSERVABLE if value == math.inf else value
+                    for gate in gates
+                    for value in gate.pin_CCb
+                ],
+            )
+        except OverflowError:
+            # SCOAP values too large for 64-bit integers
+            return False
+
+        # Lay out the sections after the header, aligned to 8 bytes
+        header = {"type_names": type_names, "sections": {}}
+        payload = []
+        offset = 0
+        for name, section in sections.items():
+            raw = section if isinstance(section, bytes) else section.tobytes()
+            typecode = "s" if isinstance(section, bytes) else section.typecode
+            header["sections"][name] = [typecode, offset, len(raw)]
+            payload.append(raw + b"\0" * (-len(raw) % 8))
+            offset += len(payload[-1])
+
+        # The offsets are relative to the first section, move them past the header. The
+        # header grows with the offsets, so repeat until it fits before the first section
+        data_start = 0
+        while True:
+            header_bytes = json.dumps(
+                {
+                    "type_names": type_names,
+                    "sections": {
+                        name: [typecode, offset + data_start, length]
+                        for name, (typecode, offset, length) in header[
+                            "sections"
+                        ].items()
+                    },
+                }
+            ).encode()
+            header_end = len(CACHE_MAGIC) + 4 + len(header_bytes)
+            if header_end <= data_start:
+                break
+            data_start = header_end + (-header_end % 8)
+        header_bytes += b" " * (data_start - header_end)
+
+        try:
+            os.makedirs(self.cache_dir, exist_ok=True)
+            fd, temp_path = tempfile.mkstemp(dir=self.cache_dir, suffix=".tmp")
+            try:
+                with os.fdopen(fd, "wb") as file:
+                    file.write(CACHE_MAGIC)
+                    file.write(struct.pack("<I", len(header_bytes)))
+                    file.write(header_bytes)
+                    file.writelines(payload)
+                os.chmod(temp_path, file_mode(self.cache_dir))
+                os.replace(temp_path, self.get_path(filename))
+            except BaseException:
+                os.unlink(temp_path)
+                raise
+        except OSError:
+            return False
+
+        return True
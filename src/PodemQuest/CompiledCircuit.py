@@ -0,0 +1,260 @@
+# Apache License
+# Version 2.0, January 2004
+# http://www.apache.org/licenses/
+
+# Copyright (c) 2024, Youssef Kandil (youssefkandil@aucegypt.edu) 
+#                     Mohamed Shalan (mshalan@aucegypt.edu)
+# 
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+from array import array
+from collections import deque
+
+# Integer codes of the gate types
+INPUT_PIN = 0
+OUTPUT_PIN = 1
+BUFF = 2
+NOT = 3
+AND = 4
+NAND = 5
+OR = 6
+NOR = 7
+XOR = 8
+XNOR = 9
+
+# Arrays of a compiled circuit, rebuilt without levelization by CircuitCache
+ARRAY_NAMES = (
+    "netlist_ids",
+    "types",
+    "levels",
+    "level_offsets",
+    "fanin_offsets",
+    "fanin",
+    "fanout_offsets",
+    "fanout",
+    "primary_inputs",
+    "primary_outputs",
+)
+
+GATE_TYPE_CODES = {
+    "input_pin": INPUT_PIN,
+    "output_pin": OUTPUT_PIN,
+    "BUFF": BUFF,
+    "BUF": BUFF,
+    "NOT": NOT,
+    "AND": AND,
+    "NAND": NAND,
+    "OR": OR,
+    "NOR": NOR,
+    "XOR": XOR,
+    "XNOR": XNOR,
+}
+
+
+class CompiledCircuit:
+    """
+    Levelized, integer-indexed representation of a circuit.
+
+    Gates are numbered 0..size-1 in topological order (sorted by logic level), so every
+    gate id is larger than the ids of its input gates. Gate types are stored as integer
+    codes and the fanin/fanout lists as CSR arrays: the fanin gate ids of gate g are
+    fanin[fanin_offsets[g]:fanin_offsets[g + 1]], and likewise for fanout.
+
+    The arrays are built once after the circuit is parsed and must not be modified.
+
+    The fault simulator, the partitioner and static learning run on these arrays. The
+    PODEM search only takes the levels and the output reachability of the gates from
+    them, and keeps its five-valued values on the Gate objects: implication, backtrace,
+    the D-frontier and the assignment trail all read and restore the same values, with
+    the fault injected into one Gate, so moving implication alone to the arrays would
+    keep every value in two places.
+    """
+
+    def __init__(self, circuit, arrays=None):
+        """
+        Compiles a circuit whose graph has been built.
+
+        Args:
+            circuit (Circuit): The circuit object representing the design.
+            arrays (dict): The arrays named in ARRAY_NAMES of a previous compilation of the
+                           same circuit. Defaults to None, which compiles the circuit.
+
+        Returns:
+            None
+        """
+        gates = list(circuit.gates.values())
+
+        if arrays is not None:
+            self.load_arrays(gates, arrays)
+            return
+
+        gate_levels = self.levelize(gates)
+
+        # Sort the gates by level, keeping the netlist order within a level
+        order = sorted(range(len(gates)), key=gate_levels.__getitem__)
+
+        # The Gate object of every gate id
+        self.gates = [gates[idx] for idx in order]
+        self.size = len(self.gates)
+
+        # Gate id of each Gate object and of each net name
+        gate_ids = {gate: gid for gid, gate in enumerate(self.gates)}
+        self.names = [gate.outputpin for gate in self.gates]
+        self.index = {name: gid for gid, name in enumerate(self.names)}
+
+        # Gate id of every gate in the order of circuit.gates
+        self.netlist_ids = array("i", [gate_ids[gate] for gate in gates])
+
+        self.types = array("b", [GATE_TYPE_CODES[gate.type] for gate in self.gates])
+        self.levels = array("i", [gate_levels[idx] for idx in order])
+
+        # First gate id of every level, plus a sentinel
+        self.depth = self.levels[-1] + 1 if self.size else 0
+        self.level_offsets = array("i", [0] * (self.depth + 1))
+        for level in self.levels:
+            self.level_offsets[level + 1] += 1
+        for level in range(self.depth):
+            self.level_offsets[level + 1] += self.level_offsets[level]
+
+        # Fanin and fanout in CSR format
+        self.fanin_offsets = array("i", [0])
+        self.fanin = array("i")
+        self.fanout_offsets = array("i", [0])
+        self.fanout = array("i")
+        for gate in self.gates:
+            self.fanin.extend(gate_ids[g] for g in gate.input_gates)
+            self.fanin_offsets.append(len(self.fanin))
+            self.fanout.extend(gate_ids[g] for g in gate.output_gates)
+            self.fanout_offsets.append(len(self.fanout))
+
+        # Primary inputs and outputs, in the order of the circuit
+        self.primary_inputs = array(
+            "i", [gate_ids[g] for g in circuit.primary_input_gates]
+        )
+        self.primary_outputs = array(
+            "i", [gate_ids[g] for g in circuit.primary_output_gates]
+        )
+
+        self.po_reach = self.compute_po_reach()
+
+        return
+
+    def load_arrays(self, gates, arrays):
+        """
+        Restores the arrays of a previous compilation of the circuit.
+
+        Args:
+            gates (list): The Gate objects in the order of circuit.gates.
+            arrays (dict): The arrays named in ARRAY_NAMES.
+
+        Returns:
+            None
+        """
+        for name in ARRAY_NAMES:
+            setattr(self, name, arrays[name])
+
+        self.size = len(gates)
+        self.gates = [None] * self.size
+        for gate, gid in zip(gates, self.netlist_ids):
+            self.gates[gid] = gate
+        self.names = [gate.outputpin for gate in self.gates]
+        self.index = {name: gid for gid, name in enumerate(self.names)}
+        self.depth = len(self.level_offsets) - 1
+
+        self.po_reach = self.compute_po_reach()
+
+        return
+
+    def compute_po_reach(self):
+        """
+        Computes the set of primary outputs reachable from every gate.
+
+        Each set is a bitset stored in a Python integer: bit k is set if the gate has a path
+        to the k-th primary output of the circuit. The sets are built in one pass in reverse
+        topological order.
+
+        Returns:
+            list: The reachable primary output bitset of every gate, indexed by gate id.
+        """
+        po_reach = [0] * self.size
+        for idx, gid in enumerate(self.primary_outputs):
+            po_reach[gid] = 1 << idx
+
+        fanout = self.fanout
+        fanout_offsets = self.fanout_offsets
+        for gid in range(self.size - 1, -1, -1):
+            reach = po_reach[gid]
+            for idx in range(fanout_offsets[gid], fanout_offsets[gid + 1]):
+                reach |= po_reach[fanout[idx]]
+            po_reach[gid] = reach
+
+        return po_reach
+
+    def levelize(self, gates):
+        """
+        Computes the logic level of every gate (Kahn's algorithm).
+
+        Primary inputs are at level 0 and every other gate is one level above its deepest input.
+
+        Args:
+            gates (list): The gates of the circuit.
+
+        Returns:
+            list: The level of each gate, in the order of 'gates'.
+        """
+        position = {gate: idx for idx, gate in enumerate(gates)}
+        levels = [0] * len(gates)
+
+        # Number of input gates that have not been levelized yet
+        pending_inputs = [len(gate.input_gates) for gate in gates]
+        ready = deque(idx for idx, count in enumerate(pending_inputs) if count == 0)
+
+        done = 0
+        while ready:
+            idx = ready.popleft()
+            done += 1
+            for next_gate in gates[idx].output_gates:
+                next_idx = position[next_gate]
+                levels[next_idx] = max(levels[next_idx], levels[idx] + 1)
+                pending_inputs[next_idx] -= 1
+                if pending_inputs[next_idx] == 0:
+                    ready.append(next_idx)
+
+        if done != len(gates):
+            raise ValueError("The circuit contains a combinational loop")
+
+        return levels
+
+    def get_fanin(self, gid):
+        """
+        Returns the fanin gate ids of a gate.
+
+        Args:
+            gid (int): The gate id.
+
+        Returns:
+            array: The ids of the input gates.
+        """
+        return self.fanin[self.fanin_offsets[gid] : self.fanin_offsets[gid + 1]]
+
+    def get_fanout(self, gid):
+        """
+        Returns the fanout gate ids of a gate.
+
+        Args:
+            gid (int): The gate id.
+
+        Returns:
+            array: The ids of the output gates.
+        """
+        return self.fanout[self.fanout_offsets[gid] : self.fanout_offsets[gid + 1]]
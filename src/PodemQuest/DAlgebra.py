@@ -17,16 +17,111 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
-from enum import Enum
+from enum import IntEnum
 
 
-class D_Value(Enum):
+class D_Value(IntEnum):
     """
     The D_Value class represents the D value of a gate {0,1,D,D',x}.
+
+    Values are small integers so they can index the lookup tables below directly.
+    """
+
+    ZERO = 0
+    ONE = 1
+    D = 2
+    D_PRIME = 3
+    X = 4
+
+
+# Good and faulty circuit components of each D value (None for X)
+GOOD_VALUE = (0, 1, 1, 0, None)
+FAULTY_VALUE = (0, 1, 0, 1, None)
+
+# Character of the good circuit value of each D value, used to print test vectors
+GOOD_VALUE_CHARS = ("0", "1", "1", "0", "X")
+
+# Gate evaluation folds the inputs into a state that keeps the three-valued (0, 1, X)
+# good and faulty components separately: state = 3 * good + faulty, with X encoded as 2.
+# This keeps the fold exact and independent of the input order, e.g. AND(D, D', X) = 0.
+_X3 = 2
+
+
+def _to_state(good, faulty):
+    return 3 * good + faulty
+
+
+def _to_value(state):
+    good, faulty = divmod(state, 3)
+    if good == _X3 or faulty == _X3:
+        return D_Value.X
+    if good == faulty:
+        return D_Value(good)
+    return D_Value.D if good else D_Value.D_PRIME
+
+
+def _and3(a, b):
+    if a == 0 or b == 0:
+        return 0
+    if a == _X3 or b == _X3:
+        return _X3
+    return 1
+
+
+def _or3(a, b):
+    if a == 1 or b == 1:
+        return 1
+    if a == _X3 or b == _X3:
+        return _X3
+    return 0
+
+
+def _xor3(a, b):
+    if a == _X3 or b == _X3:
+        return _X3
+    return a ^ b
+
+
+def _fold_table(op):
+    """
+    Builds the table state x input value -> state for a three-valued operator.
     """
+    table = []
+    for state in range(9):
+        good, faulty = divmod(state, 3)
+        row = []
+        for value in D_Value:
+            value_good = _X3 if value == D_Value.X else GOOD_VALUE[value]
+            value_faulty = _X3 if value == D_Value.X else FAULTY_VALUE[value]
+            row.append(_to_state(op(good, value_good), op(faulty, value_faulty)))
+        table.append(tuple(row))
+    return tuple(table)
+
+
+AND_FOLD = _fold_table(_and3)
+OR_FOLD = _fold_table(_or3)
+XOR_FOLD = _fold_table(_xor3)
+
+# Initial fold state of each operator (its identity element)
+AND_INIT = _to_state(1, 1)
+OR_INIT = _to_state(0, 0)
+XOR_INIT = _to_state(0, 0)
+
+# Final state -> D value, without and with output inversion
+STATE_VALUE = tuple(_to_value(state) for state in range(9))
+INVERTED_STATE_VALUE = tuple(
+    _to_value(_to_state(*(_X3 if c == _X3 else 1 - c for c in divmod(state, 3))))
+    for state in range(9)
+)
 
-    ZERO = [0, 0]
-    ONE = [1, 1]
-    D = [1, 0]
-    D_PRIME = [0, 1]
-    X = ["X", "X"]
+# Value of a faulty gate: FAULT_TABLE[fault-free value][fault value], where the stuck-at
+# value is the faulty component of the fault value (ZERO/D for s-a-0, ONE/D' for s-a-1)
+FAULT_TABLE = tuple(
+    tuple(
+        D_Value.X
+        if value == D_Value.X or fault_value == D_Value.X
+        else _to_value(_to_state(GOOD_VALUE[value], FAULTY_VALUE[fault_value]))
+        for fault_value in D_Value
+    )
+    for value in D_Value
+)
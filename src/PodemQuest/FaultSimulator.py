@@ -0,0 +1,260 @@
+# Apache License
+# Version 2.0, January 2004
+# http://www.apache.org/licenses/
+
+# Copyright (c) 2024, Youssef Kandil (youssefkandil@aucegypt.edu) 
+#                     Mohamed Shalan (mshalan@aucegypt.edu)
+# 
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import heapq
+from .CompiledCircuit import (
+    INPUT_PIN,
+    OUTPUT_PIN,
+    AND,
+    NAND,
+    OR,
+    NOR,
+    XOR,
+    XNOR,
+    NOT,
+)
+
+# Gate types whose output is inverted
+INVERTING_TYPES = frozenset((NOT, NAND, NOR, XNOR))
+
+
+class FaultSimulator:
+    """
+    Parallel-pattern single-fault-propagation (PPSFP) fault simulator.
+
+    Each net of the circuit holds a Python integer whose bit p is the value of the net
+    under test pattern p, so a batch of patterns of any width is simulated with a single
+    pass of bitwise operations over the netlist. The simulator runs on the compiled
+    netlist of the circuit (see CompiledCircuit).
+    """
+
+    def __init__(self, circuit):
+        """
+        Initializes a FaultSimulator object.
+
+        Args:
+            circuit (Circuit): The circuit object representing the design.
+
+        Returns:
+            None
+        """
+        self.circuit = circuit
+        self.compiled = circuit.compiled
+
+    def evaluate_word(self, gid, values, mask):
+        """
+        Evaluates a gate on packed pattern words.
+
+        Args:
+            gid (int): The id of the gate in the compiled netlist.
+            values (list or dict): The packed value of the gate inputs, indexed by gate id.
+            mask (int): A word with one bit set per simulated pattern.
+
+        Returns:
+            int: The packed value of the gate output.
+        """
+        compiled = self.compiled
+        gate_type = compiled.types[gid]
+        inputs = compiled.fanin[compiled.fanin_offsets[gid] : compiled.fanin_offsets[gid + 1]]
+
+        if gate_type == AND or gate_type == NAND:
+            res = mask
+            for input_gid in inputs:
+                res &= values[input_gid]
+        elif gate_type == OR or gate_type == NOR:
+            res = 0
+            for input_gid in inputs:
+                res |= values[input_gid]
+        elif gate_type == XOR or gate_type == XNOR:
+            res = 0
+            for input_gid in inputs:
+                res ^= values[input_gid]
+        else:
+            # BUFF, NOT and output pins have a single input
+            res = values[inputs[0]]
+
+        # Invert the result for NOT, NAND, NOR and XNOR gates
+        if gate_type in INVERTING_TYPES:
+            res ^= mask
+
+        return res
+
+    def pack_patterns(self, patterns):
+        """
+        Packs test patterns into one word per primary input.
+
+        Args:
+            patterns (list): Test patterns as strings of '0'/'1', one character per primary input.
+
+        Returns:
+            list: The packed word of every primary input, in the order of the circuit.
+        """
+        words = []
+        for idx in range(len(self.compiled.primary_inputs)):
+            # Bit p of the word is character idx of pattern p
+            column = "".join(pattern[idx] for pattern in reversed(patterns))
+            words.append(int(column, 2) if column else 0)
+        return words
+
+    def unpack_pattern(self, words, bit):
+        """
+        Extracts a single test pattern from packed primary input words.
+
+        Args:
+            words (list): The packed word of every primary input, in the order of the circuit.
+            bit (int): The index of the pattern in the words.
+
+        Returns:
+            str: The test pattern as a string of '0'/'1', one character per primary input.
+        """
+        return "".join("1" if (word >> bit) & 1 else "0" for word in words)
+
+    def good_simulate(self, patterns):
+        """
+        Simulates the fault-free circuit for a batch of test patterns.
+
+        Args:
+            patterns (list): Test patterns as strings of '0'/'1', one character per primary input.
+
+        Returns:
+            list: The packed value of every gate, indexed by gate id.
+        """
+        mask = (1 << len(patterns)) - 1
+        return self.good_simulate_words(self.pack_patterns(patterns), mask)
+
+    def good_simulate_words(self, words, mask):
+        """
+        Simulates the fault-free circuit for primary input words that are already packed.
+
+        Args:
+            words (list): The packed word of every primary input, in the order of the circuit.
+            mask (int): A word with one bit set per simulated pattern.
+
+        Returns:
+            list: The packed value of every gate, indexed by gate id.
+        """
+        compiled = self.compiled
+        values = [0] * compiled.size
+
+        for gid, word in zip(compiled.primary_inputs, words):
+            values[gid] = word
+
+        types = compiled.types
+        for gid in range(compiled.size):
+            if types[gid] != INPUT_PIN:
+                values[gid] = self.evaluate_word(gid, values, mask)
+
+        return values
+
+    def propagate_fault(self, fault, good_values, mask):
+        """
+        Propagates a single stuck-at fault through its fanout cone for all patterns at once.
+
+        Args:
+            fault (Tuple): A tuple containing the fault site and stuck-at value.
+            good_values (list): The packed fault-free value of every gate.
+            mask (int): A word with one bit set per simulated pattern.
+
+        Returns:
+            int: A word with bit p set if pattern p detects the fault at a primary output.
+        """
+        compiled = self.compiled
+        fault_gid = compiled.index[fault[0]]
+        stuck_word = mask if fault[1] == 1 else 0
+
+        # The fault is only excited by the patterns that drive the site to the opposite value
+        if good_values[fault_gid] == stuck_word:
+            return 0
+
+        types = compiled.types
+        if types[fault_gid] == OUTPUT_PIN:
+            return good_values[fault_gid] ^ stuck_word
+
+        fanout = compiled.fanout
+        fanout_offsets = compiled.fanout_offsets
+
+        # Faulty values are written over a copy-on-write view of the good values
+        faulty_values = _FaultyValues(good_values)
+        faulty_values[fault_gid] = stuck_word
+        detected = 0
+
+        # Gate ids are topological, so popping the smallest id evaluates every gate once
+        events = list(fanout[fanout_offsets[fault_gid] : fanout_offsets[fault_gid + 1]])
+        heapq.heapify(events)
+        scheduled = set(events)
+
+        while events:
+            gid = heapq.heappop(events)
+            value = self.evaluate_word(gid, faulty_values, mask)
+
+            difference = value ^ good_values[gid]
+            # The fault effect is masked at this gate
+            if difference == 0:
+                continue
+
+            if types[gid] == OUTPUT_PIN:
+                detected |= difference
+                continue
+
+            faulty_values[gid] = value
+            for idx in range(fanout_offsets[gid], fanout_offsets[gid + 1]):
+                next_gid = fanout[idx]
+                if next_gid not in scheduled:
+                    scheduled.add(next_gid)
+                    heapq.heappush(events, next_gid)
+
+        return detected
+
+    def simulate(self, patterns, faults):
+        """
+        Fault simulates a batch of test patterns against a list of faults.
+
+        Args:
+            patterns (list): Test patterns as strings of '0'/'1', one character per primary input.
+            faults (iterable): The faults to simulate.
+
+        Returns:
+            dict: Maps every detected fault to a word with bit p set if pattern p detects it.
+        """
+        detections = {}
+        if not patterns:
+            return detections
+
+        mask = (1 << len(patterns)) - 1
+        good_values = self.good_simulate(patterns)
+
+        for fault in faults:
+            detected = self.propagate_fault(fault, good_values, mask)
+            if detected:
+                detections[fault] = detected
+
+        return detections
+
+
+class _FaultyValues(dict):
+    """
+    Values of the faulty circuit, stored as differences over the good circuit values.
+    """
+
+    def __init__(self, good_values):
+        super().__init__()
+        self.good_values = good_values
+
+    def __missing__(self, gid):
+        return self.good_values[gid]
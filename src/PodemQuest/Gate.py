@@ -17,10 +17,48 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
-from .DAlgebra import D_Value
+from .DAlgebra import (
+    D_Value,
+    AND_FOLD,
+    AND_INIT,
+    OR_FOLD,
+    OR_INIT,
+    XOR_FOLD,
+    XOR_INIT,
+    STATE_VALUE,
+    INVERTED_STATE_VALUE,
+    FAULT_TABLE,
+)
 
 
 class Gate:
+    # Fixed attribute slots keep the gates small on large netlists
+    __slots__ = (
+        "id",
+        "type",
+        "input_gates",
+        "output_gates",
+        "outputpin",
+        "value",
+        "faulty",
+        "fault_value",
+        "is_pin",
+        "inversion_parity",
+        "non_controlling_value",
+        "fold_table",
+        "fold_init",
+        "output_table",
+        "explored",
+        "PI_distance",
+        "PO_distance",
+        "CC0",
+        "CC1",
+        "CCb",
+        "pin_CCb",
+        "is_zero_out_controllable",
+        "is_one_out_controllable",
+    )
+
     def __init__(self, id, type, input_gates, outputpin):
         self.id = id
         self.type = type
@@ -48,6 +86,25 @@ class Gate:
         elif type == "AND" or type == "NAND":
             self.non_controlling_value = D_Value.ONE
 
+        # Lookup tables used by evaluate(): the inputs are folded into a state with
+        # fold_table starting from fold_init, and output_table maps the state to the value
+        if type == "AND" or type == "NAND":
+            self.fold_table, self.fold_init = AND_FOLD, AND_INIT
+        elif type == "OR" or type == "NOR":
+            self.fold_table, self.fold_init = OR_FOLD, OR_INIT
+        elif type == "XOR" or type == "XNOR":
+            self.fold_table, self.fold_init = XOR_FOLD, XOR_INIT
+        elif type == "input_pin":
+            self.fold_table, self.fold_init = None, None
+        else:
+            # BUFF, NOT and output pins pass their single input through
+            self.fold_table, self.fold_init = AND_FOLD, AND_INIT
+
+        if self.inversion_parity:
+            self.output_table = INVERTED_STATE_VALUE
+        else:
+            self.output_table = STATE_VALUE
+
         self.explored = False
 
         # Distance Parameters
@@ -64,13 +121,15 @@ class Gate:
         self.CCb = 0  # Combinational observability of line l.
         # The number of lines that have to be traced to observe value of line l on a primary output.
 
+        self.pin_CCb = []  # Combinational observability of every input pin of the gate.
+
         self.is_zero_out_controllable = False
         self.is_one_out_controllable = False
 
         if self.type in ["AND", "NOR", "XNOR"]:
             self.is_one_out_controllable = False
             self.is_zero_out_controllable = True
-        elif ["NOT", "BUFF", "BUF"]:
+        elif self.type in ["NOT", "BUFF", "BUF"]:
             self.is_one_out_controllable = True
             self.is_zero_out_controllable = True
         else:
@@ -83,7 +142,11 @@ class Gate:
         """
         Evaluates the value of the gate based on its type.
 
-        This function determines the value of the gate by calling the appropriate evaluation method based on its type. If the gate is of type "AND", it calls the `evaluate_and` method. If the gate is of type "OR", it calls the `evaluate_or` method. If the gate is of type "XOR", it calls the `evaluate_xor` method. If the gate is of type "NOT", it calls the `evaluate_not` method.
+        The values of the input gates are folded with the lookup table of the gate type
+        (AND, OR or XOR, see DAlgebra), and the final state is mapped to the output value,
+        inverted for NOT, NAND, NOR and XNOR gates. If the gate is faulty, the fault-free
+        value is combined with the fault value through FAULT_TABLE. No objects are
+        allocated during the evaluation.
 
         Parameters:
             self (Gate): The gate object.
@@ -91,285 +154,25 @@ class Gate:
         Returns:
             None
         """
-        if self.type == "input_pin":
-            pass
-        elif self.type == "output_pin":
-            self.value = self.input_gates[0].value
-        elif self.type == "AND":
-            self.value = self.evaluate_and()
-        elif self.type == "OR":
-            self.value = self.evaluate_or()
-        elif self.type == "XOR":
-            self.value = self.evaluate_xor()
-        elif self.type == "BUFF" or self.type == "BUF":
-            self.value = self.evaluate_buff()
-        elif self.type == "NOT":
-            self.value = self.evaluate_not()
-        elif self.type == "NAND":
-            self.value = self.evaluate_nand()
-        elif self.type == "NOR":
-            self.value = self.evaluate_nor()
-        elif self.type == "XNOR":
-            self.value = self.evaluate_xnor()
+        table = self.fold_table
+        if table is not None:
+            state = self.fold_init
+            for g in self.input_gates:
+                state = table[state][g.value]
+            self.value = self.output_table[state]
 
         if self.faulty:
-            tempval = [self.value.value[1], self.fault_value.value[1]]
-            if tempval == [1, 0]:
-                self.value = D_Value.D
-            elif tempval == [0, 1]:
-                self.value = D_Value.D_PRIME
-            elif tempval == [0, 0]:
-                self.value = D_Value.ZERO
-            elif tempval == [1, 1]:
-                self.value = D_Value.ONE
-            elif "X" in tempval:
-                self.value = D_Value.X
+            self.value = FAULT_TABLE[self.value][self.fault_value]
 
         return
 
-    def evaluate_and(self):
-        """
-        Evaluates the value of an AND gate based on its input_gates.
-
-        This function checks the input_gates of an AND gate and determines the value based on the following rules:
-        - If any input is ZERO, the value is ZERO.
-        - If any input is X, the value is X.
-        - If both D and D_PRIME are in the input_gates, the value is ZERO.
-        - If D is in the input_gates and all input_gates are either ONE or D, the value is D.
-        - If D_PRIME is in the input_gates and all input_gates are either ONE or D_PRIME, the value is D_PRIME.
-        - Otherwise, the value is ONE.
-
-        Returns:
-            D_Value: The value value of the AND gate.
-        """
-        temp_input_gates = []
-        for g in self.input_gates:
-            temp_input_gates.append(g.value)
-
-        # Check if any input is ZERO
-        if D_Value.ZERO in temp_input_gates:
-            return D_Value.ZERO
-
-        # Check if any input is X
-        if D_Value.X in temp_input_gates:
-            return D_Value.X
-
-        # Check if both D and D_PRIME are in the input_gates
-        if D_Value.D in temp_input_gates and D_Value.D_PRIME in temp_input_gates:
-            return D_Value.ZERO
-
-        # Check if D is in the input_gates and if all input_gates are either ONE or D
-        if D_Value.D in temp_input_gates:
-            if all(val in [D_Value.ONE, D_Value.D] for val in temp_input_gates):
-                return D_Value.D
-
-        # Check if D_PRIME is in the input_gates and if all input_gates are either ONE or D_PRIME
-        if D_Value.D_PRIME in temp_input_gates:
-            if all(val in [D_Value.ONE, D_Value.D_PRIME] for val in temp_input_gates):
-                return D_Value.D_PRIME
-
-        # Return ONE if none of the above conditions are met
-        return D_Value.ONE
-
-    def evaluate_or(self):
-        """
-        Evaluates the value of an OR gate based on its input_gates.
-
-        This function checks the input_gates of an OR gate and determines the value based on the following rules:
-        - If any input is ONE, the value is ONE.
-        - If any input is X, the value is X.
-        - If both D and D_PRIME are in the input_gates, the value is ONE.
-        - If D is in the input_gates and any input is either ONE or D, the value is D.
-        - If D_PRIME is in the input_gates and any input is either ONE or D_PRIME, the value is D_PRIME.
-        - Otherwise, the value is ZERO.
-
-        Returns:
-            D_Value: The value value of the OR gate.
-        """
-        temp_input_gates = []
-        for g in self.input_gates:
-            temp_input_gates.append(g.value)
-        # Check if any input is ONE
-        if D_Value.ONE in temp_input_gates:
-            return D_Value.ONE
-
-        # Check if any input is X
-        if D_Value.X in temp_input_gates:
-            return D_Value.X
-
-        # Check if both D and D_PRIME are in the input_gates
-        if D_Value.D in temp_input_gates and D_Value.D_PRIME in temp_input_gates:
-            return D_Value.ONE
-
-        # Check if D is in the input_gates and if all input_gates are either ONE or D
-        if D_Value.D in temp_input_gates:
-            if any(val in [D_Value.ONE, D_Value.D] for val in temp_input_gates):
-                return D_Value.D
-
-        # Check if D_PRIME is in the input_gates and if all input_gates are either ONE or D_PRIME
-        if D_Value.D_PRIME in temp_input_gates:
-            if any(val in [D_Value.ONE, D_Value.D_PRIME] for val in temp_input_gates):
-                return D_Value.D_PRIME
-
-        # Return ZERO if none of the above conditions are met
-        return D_Value.ZERO
-
-    def evaluate_xor(self):
-        """
-        Evaluates the value of an XOR gate based on its input_gates.
-
-        This function checks the input_gates of an XOR gate and determines the value based on the following rules:
-        - If any input is X, the value is X.
-        - If the count of D and D_PRIME are not equal, the value is determined based on the count of ONE and ZERO.
-        - If the count of D and D_PRIME are equal, the value is determined based on the count of ONE and ZERO and the greater count.
-
-        Returns:
-            D_Value: The value value of the XOR gate.
-        """
-        temp_input_gates = []
-        for g in self.input_gates:
-            temp_input_gates.append(g.value)
-        # Count the occurrences of D and D_PRIME
-        d_count = temp_input_gates.count(D_Value.D)
-        d_prime_count = temp_input_gates.count(D_Value.D_PRIME)
-
-        # Count the occurrences of ONE and ZERO
-        one_count = temp_input_gates.count(D_Value.ONE)
-        zero_count = temp_input_gates.count(D_Value.ZERO)
-
-        # Count the occurrences of X
-        x_count = temp_input_gates.count(D_Value.X)
-
-        # If any input is X, the value is X
-        if x_count > 0:
-            return D_Value.X
-
-        # If the count of D and D_PRIME are not equal, the value is determined based on the count of ONE and ZERO
-        if d_count % 2 != d_prime_count % 2:
-            if one_count % 2 == 0:
-                return D_Value.ZERO
-            else:
-                return D_Value.ONE
-        else:
-            # If the count of D and D_PRIME are equal, the value is determined based on the count of ONE and ZERO and the greater count
-            if one_count % 2 == 0:
-                if d_count > d_prime_count:
-                    return D_Value.D
-                else:
-                    return D_Value.D_PRIME
-            else:
-                if d_count > d_prime_count:
-                    return D_Value.D_PRIME
-                else:
-                    return D_Value.D
-
-    def evaluate_not(self):
-        """
-        Evaluates the value of a NOT gate based on its input.
-
-        This function checks the input of a NOT gate and determines the value based on the following rules:
-        - If the input is D, the value is D_PRIME.
-        - If the input is D_PRIME, the value is D.
-        - If the input is ONE, the value is ZERO.
-        - If the input is ZERO, the value is ONE.
-        - If the input is X, the value is X.
-
-        Returns:
-            D_Value: The value value of the NOT gate.
-        """
-        temp_input_gates = []
-        for g in self.input_gates:
-            temp_input_gates.append(g.value)
-        # Check the input value
-        input_val = temp_input_gates[0]
-        if input_val == D_Value.D:
-            return D_Value.D_PRIME
-        elif input_val == D_Value.D_PRIME:
-            return D_Value.D
-        elif input_val == D_Value.ONE:
-            return D_Value.ZERO
-        elif input_val == D_Value.ZERO:
-            return D_Value.ONE
-        else:
-            return D_Value.X
-
-    def evaluate_buff(self):
-        """
-        Evaluates the value of a BUFF gate based on its input.
-
-        This function checks the input of a BUFF gate and determines the value based on the following rules:
-        - If the input is D, the value is D.
-        - If the input is D_PRIME, the value is D_PRIME.
-        - If the input is X, the value is X.
-
-        Returns:
-            D_Value: The value value of the BUFF gate.
-        """
-        temp_input_gates = []
-        for g in self.input_gates:
-            temp_input_gates.append(g.value)
-        # Check the input value
-        return temp_input_gates[0]
-
-    def evaluate_nand(self):
-        """
-        Evaluates the value of a NAND gate based on its input_gates.
-
-        This function creates an AND gate and evaluates its value. Then, it creates a NOT gate for the AND gate's value.
-
-        Returns:
-            The value value of the NAND gate.
-        """
-        # Create an AND gate
-        and_gate = Gate("AND", "AND", self.input_gates, None)
-        and_gate.evaluate()
-
-        # Create a NOT gate for the AND gate's value
-        not_gate = Gate("NOT", "NOT", [and_gate], None)
-        not_gate.evaluate()
-
-        return not_gate.value
-
-    def evaluate_nor(self):
-        """
-        Evaluates the value of a NOR gate based on its input_gates.
-
-        This function creates an OR gate and evaluates its value. Then, it creates a NOT gate for the OR gate's value.
-
-        Returns:
-            The value value of the NOR gate.
-        """
-
-        # Create an OR gate
-        or_gate = Gate("OR", "OR", self.input_gates, None)  # Create an OR gate
-        or_gate.evaluate()  # Evaluate the OR gate
-
-        # Create a NOT gate for the OR gate's value
-        not_gate = Gate("NOT", "NOT", [or_gate], None)  # Create a NOT gate
-        not_gate.evaluate()  # Evaluate the NOT gate
-
-        return not_gate.value  # Return the value of the NOT gate
-
-    def evaluate_xnor(self):
+    def calculate_CC0(self):
         """
-        Evaluates the value of an XNOR gate based on its input_gates.
-
-        This function creates an XOR gate and evaluates its value. Then, it creates a NOT gate for the XOR gate's value.
+        Calculates the 0-controllability of the gate from the controllability of its inputs.
 
         Returns:
-            The value value of the XNOR gate.
+            None
         """
-        # Create an XOR gate
-        xor_gate = Gate("XOR", "XOR", self.input_gates, None)  # Create an XOR gate
-        xor_gate.evaluate()  # Evaluate the XOR gate
-
-        # Create a NOT gate for the XOR gate's value
-        not_gate = Gate("NOT", "NOT", [xor_gate], None)  # Create a NOT gate
-        not_gate.evaluate()  # Evaluate the NOT gate
-
-        return not_gate.value  # Return the value of the NOT gate
-
-    def calculate_CC0(self):
         res = 0
         if self.type == "AND":
             res = min(g.CC0 for g in self.input_gates) + 1
@@ -379,22 +182,10 @@ class Gate:
             res = sum(g.CC0 for g in self.input_gates) + 1
         elif self.type == "NOR":
             res = min(g.CC1 for g in self.input_gates) + 1
-        elif self.type == "XOR":  # todo: support multiple inputs
-            res = (
-                min(
-                    self.input_gates[0].CC0 + self.input_gates[1].CC0,
-                    self.input_gates[0].CC1 + self.input_gates[1].CC1,
-                )
-                + 1
-            )
-        elif self.type == "XNOR":  # todo: support multiple inputs
-            res = (
-                min(
-                    self.input_gates[0].CC1 + self.input_gates[1].CC0,
-                    self.input_gates[0].CC0 + self.input_gates[1].CC1,
-                )
-                + 1
-            )
+        elif self.type == "XOR":
+            res = self.calculate_parity_CC()[0] + 1
+        elif self.type == "XNOR":
+            res = self.calculate_parity_CC()[1] + 1
         elif self.type == "NOT":
             res = self.input_gates[0].CC1 + 1
         elif self.type == "BUFF" or self.type == "BUF":
@@ -407,6 +198,12 @@ class Gate:
         self.CC0 = res
 
     def calculate_CC1(self):
+        """
+        Calculates the 1-controllability of the gate from the controllability of its inputs.
+
+        Returns:
+            None
+        """
         res = -1
         if self.type == "AND":
             res = sum(g.CC1 for g in self.input_gates) + 1
@@ -416,22 +213,10 @@ class Gate:
             res = min(g.CC1 for g in self.input_gates) + 1
         elif self.type == "NOR":
             res = sum(g.CC0 for g in self.input_gates) + 1
-        elif self.type == "XOR":  # todo: support multiple inputs
-            res = (
-                min(
-                    self.input_gates[0].CC0 + self.input_gates[1].CC1,
-                    self.input_gates[0].CC1 + self.input_gates[1].CC0,
-                )
-                + 1
-            )
-        elif self.type == "XNOR":  # todo: support multiple inputs
-            res = (
-                min(
-                    self.input_gates[0].CC0 + self.input_gates[1].CC0,
-                    self.input_gates[0].CC1 + self.input_gates[1].CC1,
-                )
-                + 1
-            )
+        elif self.type == "XOR":
+            res = self.calculate_parity_CC()[1] + 1
+        elif self.type == "XNOR":
+            res = self.calculate_parity_CC()[0] + 1
         elif self.type == "NOT":
             res = self.input_gates[0].CC0 + 1
         elif self.type == "BUFF" or self.type == "BUF":
@@ -443,33 +228,52 @@ class Gate:
 
         self.CC1 = res
 
+    def calculate_parity_CC(self):
+        """
+        Calculates the cost of setting the parity of the inputs to 0 and to 1.
+
+        The inputs are folded one at a time: an even parity is reached from an even parity
+        with a 0 input or from an odd parity with a 1 input, and likewise for an odd parity,
+        so gates with any number of inputs are supported.
+
+        Returns:
+            tuple: The cost of an even parity and the cost of an odd parity.
+        """
+        even = self.input_gates[0].CC0
+        odd = self.input_gates[0].CC1
+        for g in self.input_gates[1:]:
+            even, odd = min(even + g.CC0, odd + g.CC1), min(even + g.CC1, odd + g.CC0)
+
+        return even, odd
+
     def calculate_CCb(self):
-        res = -1
-        CCb_output = 0
-        if self.output_gates:
-            CCb_output = min(g.CCb for g in self.output_gates)
-        if self.type == "AND":
-            res = CCb_output + sum(g.CC1 for g in self.input_gates) + 1
-        elif self.type == "NAND":
-            res = CCb_output + sum(g.CC1 for g in self.input_gates) + 1
-        elif self.type == "OR":
-            res = CCb_output + sum(g.CC0 for g in self.input_gates) + 1
-        elif self.type == "NOR":
-            res = CCb_output + sum(g.CC0 for g in self.input_gates) + 1
-        elif self.type == "XOR":  # todo: support XOR
-            pass
-        elif self.type == "XNOR":  # todo: support XNOR
-            pass
-        elif self.type == "NOT":
-            res = CCb_output + 1
-        elif self.type == "BUFF" or self.type == "BUF":
-            res = CCb_output + 1
-        elif self.type == "input_pin":
-            res = CCb_output
-        elif self.type == "output_pin":
-            res = 0
+        """
+        Calculates the observability of every input pin of the gate.
+
+        The observability of the gate output (CCb) must be known. Observing an input pin
+        requires observing the output and setting every other input to its non-controlling
+        value (AND/NAND: 1, OR/NOR: 0, XOR/XNOR: either value), plus one for the gate.
+        The results are stored in pin_CCb, in the order of input_gates.
 
-        self.CCb = res
+        Returns:
+            None
+        """
+        if self.type == "AND" or self.type == "NAND":
+            side_costs = [g.CC1 for g in self.input_gates]
+        elif self.type == "OR" or self.type == "NOR":
+            side_costs = [g.CC0 for g in self.input_gates]
+        elif self.type == "XOR" or self.type == "XNOR":
+            side_costs = [min(g.CC0, g.CC1) for g in self.input_gates]
+        else:
+            # BUFF, NOT and output pins have a single input, input pins have none
+            side_costs = [0 for g in self.input_gates]
+
+        # An output pin is the observation point itself
+        gate_cost = 0 if self.type == "output_pin" else 1
+        total_side_cost = sum(side_costs)
+        self.pin_CCb = [
+            self.CCb + total_side_cost - side_cost + gate_cost for side_cost in side_costs
+        ]
 
     def check_controllable_value(self, value):
         ret = False
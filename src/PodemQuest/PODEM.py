@@ -17,10 +17,55 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
-from .DAlgebra import D_Value
+from .DAlgebra import D_Value, GOOD_VALUE_CHARS
+from .FaultSimulator import FaultSimulator
+from .FaultStatus import Fault_Status
+from .Partitioner import Partitioner
+from .PatternWriter import PatternWriter
+from .PhaseTimer import PhaseTimer
+from .StaticLearning import StaticLearning
+import heapq
 import math
+import multiprocessing
+import random
+import time
 from collections import Counter
 
+# Number of faults in a shard of a parallel run
+SHARD_SIZE = 256
+
+# Number of random patterns simulated together by the random pattern phase
+RANDOM_BATCH_SIZE = 64
+
+# Standard normal quantile of the confidence interval of a sampled coverage estimate
+SAMPLE_CONFIDENCE = 95
+SAMPLE_CONFIDENCE_Z = 1.96
+
+# Backtrack limit of the searches for secondary faults during dynamic compaction
+SECONDARY_BACKTRACK_LIMIT = 10
+
+# PODEM counters of a shard that are summed over the shards of a parallel run
+SHARD_COUNTERS = (
+    "atpg_detected",
+    "fault_sim_detected",
+    "podem_calls",
+    "unobservable_faults",
+    "backtracks",
+    "secondary_detected",
+    "secondary_calls",
+    "implication_events",
+    "gate_evaluations",
+    "cone_restricted_faults",
+    "learned_applied",
+)
+
+# PODEM counters saved in a checkpoint and restored when the run is resumed
+CHECKPOINT_COUNTERS = SHARD_COUNTERS + (
+    "random_patterns",
+    "random_detected",
+    "random_batches",
+)
+
 
 class PODEM:
     """
@@ -28,12 +73,15 @@ class PODEM:
 
     """
 
-    def __init__(self, circuit, output_file):
+    def __init__(self, circuit, output_file, timer=None):
         """
         Initializes a PODEM object.
 
         Args:
             circuit (Circuit): The circuit object representing the design.
+            output_file (str): The path of the test pattern file.
+            timer (PhaseTimer): Times the phases of compute(). Defaults to None, which
+                                uses a new PhaseTimer.
 
         Returns:
             None
@@ -41,35 +89,278 @@ class PODEM:
         # Assign the circuit object to the PODEM object
         self.circuit = circuit
         self.output_file = output_file
+        self.timer = timer if timer is not None else PhaseTimer()
         self.fault_is_activated = False
 
         # Initialize the list of gates with D/D' input and X output
         self.D_Frontier = []
 
+        # Incrementally maintained D-frontier: maps every member gate to the CCb of its
+        # most observable D input pin, and a heap of (CCb, gate id, gate) entries used to
+        # select the most observable member.
+        # A new entry is pushed whenever the CCb of a gate changes, and the entries of
+        # gates that left the D-frontier or whose CCb has changed are discarded lazily.
+        self.d_frontier_gates = {}
+        self.d_frontier_heap = []
+
+        # Bitset of the primary outputs reachable from each gate, and bitset of the
+        # primary outputs whose value is still X
+        compiled = self.circuit.compiled
+        self.po_reach = dict(zip(compiled.gates, compiled.po_reach))
+        self.all_outputs = (1 << len(compiled.primary_outputs)) - 1
+        self.unresolved_outputs = self.all_outputs
+        # Bitset of the primary outputs whose value is D or D'
+        self.error_outputs = 0
+
+        # Cone of influence of the current fault: bitset of the primary outputs reachable
+        # from the fault site, or None for the whole circuit. A gate is in the cone if it
+        # reaches one of these outputs, see in_cone()
+        self.cone_restriction = True
+        self.cone_outputs = None
+
+        # Implications learned by static learning, by source gate (see StaticLearning), and
+        # the transitive fanout of the current fault, where the learned implications of
+        # the fault-free circuit do not hold. Learned implications are only applied while
+        # the fanout is set.
+        self.learning = None
+        self.learned_implications = None
+        self.fault_fanout = None
+
+        # Level-ordered implication: the logic level of each gate, one bucket of scheduled
+        # gates per level, and the set of scheduled gates, see imply()
+        self.implication = "event"
+        self.gate_levels = dict(zip(compiled.gates, compiled.levels))
+        self.level_buckets = [[] for _ in range(compiled.depth)]
+        self.scheduled_gates = set()
+
+        # Assignment trail: stack of (gate, old value) pairs recorded on every value change,
+        # so that backtracking and moving to the next fault only undo the touched gates
+        self.trail = []
+
         # fault gate and value
 
         self.fault_gate = None
         self.fault_value = None
 
+        # Search limits, see compute()
+        self.backtrack_limit = None
+        self.fault_time_limit = None
+        self.deadline = None
+
+        # Test cube settings, see compute()
+        self.secondary_faults = 0
+        self.x_fill = "zero"
+        self.random_seed = 0
+
+        # Outcome of every targeted fault
+        self.fault_status = {}
+
+        # ProgressReporter of the run, None in quiet mode, see compute()
+        self.progress = None
+
+        # Checkpoint of the run, None when the run is not checkpointed, see compute()
+        self.checkpoint = None
+
+        # PatternWriter the test vectors are streamed to as they are generated, when the
+        # test set is not compacted, see add_vector()
+        self.pattern_writer = None
+
+        # Number of slowest PODEM searches kept, and min-heap of the slowest ones as
+        # (seconds, fault, backtracks, Fault_Status) tuples, see record_search_time()
+        self.slow_fault_limit = 0
+        self.slowest_faults = []
+
         self.no_of_faults = self.circuit.faults.__len__()
         self.uncovered_faults = 0
         self.failures = 0
         self.fault_coverage = 0
-
-    def compute(self, algorithm="basic"):
+        self.fault_efficiency = 0
+
+        # Breakdown of the faults that are not detected
+        self.untestable_faults = 0
+        self.aborted_faults = 0
+        self.backtracks = 0
+
+        # Implication statistics: changed gate to output gate events, and gate evaluations
+        self.implication_events = 0
+        self.gate_evaluations = 0
+        # Faults whose search was restricted to a cone smaller than the whole circuit
+        self.cone_restricted_faults = 0
+        # Values set by learned implications during the search
+        self.learned_applied = 0
+
+        # Breakdown of the detected faults
+        self.atpg_detected = 0
+        self.fault_sim_detected = 0
+        self.podem_calls = 0
+        self.no_of_patterns = 0
+        self.unobservable_faults = 0
+
+        # Random pattern phase statistics
+        self.random_patterns = 0
+        self.random_detected = 0
+        self.random_batches = 0
+
+        # Number of test patterns before static compaction
+        self.patterns_before_compaction = 0
+
+        # Dominating faults targeted after the expansion of the collapsed fault list
+        self.dominating_targeted = 0
+        self.dominating_detected = 0
+
+        # Dynamic compaction statistics
+        self.secondary_detected = 0
+        self.secondary_calls = 0
+
+        # Output-cone partitioning statistics: the number of partitions, the faults that
+        # reach the outputs of several partitions, and those targeted again on the circuit
+        self.partition_count = 0
+        self.boundary_faults = 0
+        self.boundary_retargeted = 0
+
+        # Fault sampling statistics: the number of faults the sample is drawn from, the
+        # grouping of the strata, and the estimated coverage with its confidence interval
+        self.sample_population = 0
+        self.sample_strata = None
+        self.estimated_coverage = 0
+        self.coverage_interval = (0, 0)
+
+        # Fault collapsing statistics
+        self.no_of_collapsed_faults = self.no_of_faults
+        self.collapsed_detected = 0
+        self.collapsed_untestable = 0
+        self.collapsed_aborted = 0
+        self.collapsed_fault_coverage = 0
+
+    def compute(
+        self,
+        algorithm="basic",
+        fault_simulation=True,
+        fault_sim_batch=1,
+        collapse_faults=True,
+        jobs=None,
+        partitions=None,
+        backtrack_limit=1000,
+        fault_time_limit=None,
+        time_budget=None,
+        random_patterns=False,
+        random_threshold=0.01,
+        random_seed=0,
+        compaction=True,
+        compaction_orders=0,
+        secondary_faults=0,
+        x_fill="zero",
+        implication="event",
+        cone_restriction=True,
+        static_learning=False,
+        progress=None,
+        slowest_faults=0,
+        pattern_format="text",
+        pattern_header=False,
+        checkpoint=None,
+        resume=False,
+        fault_sample=None,
+        sample_strata="type",
+    ):
         """
         Computes the PODEM using the specified algorithm.
 
         Args:
             algorithm (str): The algorithm to use. Possible values are "basic" and "advanced".
                              Defaults to "basic".
+            fault_simulation (bool): Fault simulate every new test vector and drop the faults
+                             it detects from the target list. Defaults to True.
+            fault_sim_batch (int): The number of test vectors collected before they are fault
+                             simulated together. Defaults to 1.
+            collapse_faults (bool): Target only the representatives of the collapsed fault
+                             list and expand the results to all faults. Defaults to True.
+            jobs (int): Shard the faults over this number of worker processes. The results do
+                             not depend on the number of jobs. Defaults to None, which runs
+                             a single process without sharding.
+            partitions (int): Split the circuit into this number of output-cone partitions
+                             and run PODEM on each of them, with 'jobs' worker processes
+                             if set, see generate_tests_partitioned(). Defaults to None,
+                             which runs PODEM on the whole circuit.
+            backtrack_limit (int): Abort the search for a fault after this number of
+                             backtracks. Defaults to 1000, None disables the limit.
+            fault_time_limit (float): Abort the search for a fault after this number of
+                             seconds. Defaults to None, which disables the limit.
+            time_budget (float): Stop targeting new faults after this number of seconds;
+                             the remaining faults are aborted. Defaults to None, which
+                             disables the budget.
+            random_patterns (bool): Detect the random pattern testable faults with random
+                             test vectors before running PODEM. Defaults to False.
+            random_threshold (float): Stop the random pattern phase when a batch detects
+                             less than this fraction of the faults left. Defaults to 0.01.
+            random_seed (int): The seed of the random test vectors, also used to shuffle
+                             the test vectors for compaction. Defaults to 0.
+            compaction (bool): Remove the test vectors that are not needed to keep the fault
+                             coverage, see compact_tests(). Defaults to True.
+            compaction_orders (int): The number of random vector orders tried after the
+                             reverse order by compaction. Defaults to 0.
+            secondary_faults (int): The number of secondary faults targeted under the test
+                             cube of every detected fault, see extend_test_cube().
+                             Defaults to 0, which disables dynamic compaction.
+            x_fill (str): How the X values left in the test cubes are filled, "zero" or
+                             "random". Defaults to "zero".
+            implication (str): The implication engine, "event" for the level-ordered
+                             engine of imply() or "recursive" for imply_recursive().
+                             Defaults to "event".
+            cone_restriction (bool): Restrict the implication of every PODEM search to
+                             the cone of influence of the fault, see in_cone(). The results
+                             do not depend on it. Defaults to True.
+            static_learning (bool): Learn the indirect implications of the circuit before
+                             the search and apply them during implication, see
+                             StaticLearning. Defaults to False.
+            progress (ProgressReporter): Reports the progress of the random pattern and
+                             PODEM phases. Defaults to None, which runs quietly.
+            slowest_faults (int): Time every PODEM search and keep this number of the
+                             slowest ones for the report. Defaults to 0, which times no
+                             search.
+            pattern_format (str): The format of the test pattern file, see
+                             PatternWriter. Defaults to "text".
+            pattern_header (bool): List the primary inputs and outputs in a text pattern
+                             file. Defaults to False.
+            checkpoint (Checkpoint): Periodically saves the resolved faults and the test
+                             vectors of the PODEM phase. Defaults to None, which saves no
+                             checkpoint.
+            resume (bool): Resume the run from the checkpoint file, if it exists: the
+                             random pattern phase is skipped and only the pending faults
+                             are targeted. Defaults to False.
+            fault_sample (int): Target a stratified random sample of this number of faults
+                             instead of the fault list, without collapsing, and estimate
+                             the fault coverage, see estimate_coverage(). The sample is
+                             drawn with random_seed. Defaults to None, which targets
+                             every fault.
+            sample_strata (str): Stratify the sample by gate "type" or logic "level".
+                             Defaults to "type".
 
         Returns:
             None
 
         """
 
-        self.circuit.calculate_SCOAP()
+        self.backtrack_limit = backtrack_limit
+        self.fault_time_limit = fault_time_limit
+        self.secondary_faults = secondary_faults
+        self.x_fill = x_fill
+        self.random_seed = random_seed
+        self.implication = implication
+        self.cone_restriction = cone_restriction
+        self.progress = progress
+        # A negative number of slowest faults times no search, like 0
+        self.slow_fault_limit = max(0, slowest_faults)
+        self.slowest_faults = []
+        self.checkpoint = checkpoint
+        if time_budget is not None:
+            self.deadline = time.monotonic() + time_budget
+        timer = self.timer
+
+        # The SCOAP values of a cached circuit are already known
+        if not self.circuit.SCOAP_calculated:
+            with timer.phase("SCOAP"):
+                self.circuit.calculate_SCOAP()
+        self.reset_values()
         if algorithm == "basic":
             for fault in self.circuit.faults:
                 self.init_PODEM()
@@ -84,79 +375,1619 @@ class PODEM:
                 #    print("Fault: ", fault)
                 #    print("test vector: NOT FOUND ")
         elif algorithm == "advanced":
-            test_vectors = []  # Initialize an empty list to store the test vectors
-            total_faults = len(self.circuit.faults)  # Total number of faults to process
-            progress_threshold = total_faults // 20  # Every 5% of total faults
-
-            for idx, fault in enumerate(self.circuit.faults):
-                fault_site = fault[0]
-                self.fault_gate = self.circuit.gates[fault_site]
-                self.fault_gate.faulty = True
-                if fault[1] == 0:
-                    self.fault_value = D_Value.ZERO
-                    self.fault_gate.fault_value = D_Value.ZERO
-                elif fault[1] == 1:
-                    self.fault_value = D_Value.ONE
-                    self.fault_gate.fault_value = D_Value.ONE
+            if static_learning:
+                with timer.phase("static learning"):
+                    learning = StaticLearning(self.circuit)
+                    learning.learn()
+                self.set_static_learning(learning)
+
+            # Faults targeted by PODEM
+            if fault_sample is not None:
+                with timer.phase("fault sampling"):
+                    self.circuit.sample_faults(fault_sample, sample_strata, random_seed)
+                # The equivalence classes of the sampled faults are not in the sample
+                collapse_faults = False
+                target_faults = self.circuit.sampled_faults
+                self.sample_population = self.no_of_faults
+                self.sample_strata = sample_strata
+                self.no_of_faults = len(target_faults)
+            elif collapse_faults:
+                with timer.phase("fault collapsing"):
+                    self.circuit.collapse_faults()
+                target_faults = self.circuit.collapsed_faults
+            else:
+                target_faults = self.circuit.faults
+            self.no_of_collapsed_faults = len(target_faults)
+
+            fault_simulator = None
+            if fault_simulation:
+                fault_simulator = FaultSimulator(self.circuit)
+
+            # Options recorded in the checkpoint
+            options = {
+                "algorithm": algorithm,
+                "collapse_faults": collapse_faults,
+                "fault_simulation": fault_simulation,
+                "backtrack_limit": backtrack_limit,
+                "random_patterns": random_patterns,
+                "random_seed": random_seed,
+                "secondary_faults": secondary_faults,
+                "x_fill": x_fill,
+                "partitions": partitions,
+                "static_learning": static_learning,
+                "fault_sample": fault_sample,
+                "sample_strata": sample_strata if fault_sample is not None else None,
+                "sample_seed": random_seed if fault_sample is not None else None,
+            }
+            resumed = None
+            if checkpoint is not None and resume:
+                with timer.phase("checkpoint"):
+                    resumed = checkpoint.load(self.circuit, options)
+
+            # The pattern file is only opened once the checkpoint is validated. Without
+            # compaction, every generated vector is final and is written at once
+            pattern_writer = PatternWriter(
+                self.output_file,
+                [gate.outputpin for gate in self.circuit.primary_input_gates],
+                [
+                    gate.input_gates[0].outputpin
+                    for gate in self.circuit.primary_output_gates
+                ],
+                format=pattern_format,
+                header=pattern_header,
+            )
+            if not compaction:
+                self.pattern_writer = pattern_writer
+
+            try:
+                # Leave only the faults that random patterns do not detect to PODEM
+                random_vectors = []
+                self.fault_status = {}
+                if resumed is not None:
+                    # The vectors and resolved faults of the interrupted run stand in
+                    # for the random pattern phase
+                    random_vectors, self.fault_status, counters = resumed
+                    for name, value in counters.items():
+                        setattr(self, name, value)
+                    if self.pattern_writer is not None:
+                        for vector in random_vectors:
+                            self.pattern_writer.write(vector)
+                    hard_faults = [
+                        fault
+                        for fault in target_faults
+                        if fault not in self.fault_status
+                    ]
+                elif random_patterns:
+                    with timer.phase("random patterns"):
+                        random_vectors, self.fault_status = self.random_pattern_phase(
+                            target_faults,
+                            fault_simulator or FaultSimulator(self.circuit),
+                            random_threshold,
+                            random_seed,
+                        )
+                    hard_faults = [
+                        fault
+                        for fault in target_faults
+                        if fault not in self.fault_status
+                    ]
+                else:
+                    hard_faults = target_faults
 
-                self.init_PODEM()
-                ret = self.advanced_PODEM()
-                self.fault_gate.faulty = False
-                if ret == True:
-                    self.uncovered_faults += 1
-                    success_vector = self.ret_success_vector()  # Get the test vector
-                    
-                    success_vector = "".join(
-                        ["0" if char == "X" else char for char in success_vector]
+                if checkpoint is not None:
+                    checkpoint.start(
+                        self.circuit, options, random_vectors, dict(self.fault_status)
                     )
-                    test_vectors.append(
-                        str(self.uncovered_faults) + ": " + f"{success_vector}\n"
+
+                # The aborted faults of the shards and partitions of an interrupted run
+                # are fault simulated again with the vectors of the resumed run
+                if resumed is not None:
+                    resumed = (random_vectors, dict(self.fault_status))
+
+                with timer.phase("ATPG search"):
+                    if partitions:
+                        vectors, hard_fault_status = self.generate_tests_partitioned(
+                            hard_faults,
+                            fault_simulator,
+                            fault_sim_batch,
+                            partitions,
+                            jobs,
+                            resumed,
+                        )
+                    elif jobs is None:
+                        vectors, hard_fault_status = self.generate_tests(
+                            hard_faults, fault_simulator, fault_sim_batch
+                        )
+                    else:
+                        vectors, hard_fault_status = self.generate_tests_parallel(
+                            hard_faults, fault_simulator, fault_sim_batch, jobs, resumed
+                        )
+                if checkpoint is not None:
+                    self.save_checkpoint(vectors, hard_fault_status)
+                vectors = random_vectors + vectors
+                self.fault_status.update(hard_fault_status)
+
+                status_counts = Counter(self.fault_status.values())
+                self.collapsed_detected = status_counts[Fault_Status.DETECTED]
+                self.collapsed_untestable = status_counts[Fault_Status.UNTESTABLE]
+                self.collapsed_aborted = status_counts[Fault_Status.ABORTED]
+                detected_faults = {
+                    fault
+                    for fault, status in self.fault_status.items()
+                    if status is Fault_Status.DETECTED
+                }
+
+                # Faults equivalent to an untestable representative are untestable
+                untestable_faults = set()
+                for fault, status in self.fault_status.items():
+                    if status is Fault_Status.UNTESTABLE:
+                        if collapse_faults:
+                            untestable_faults.update(
+                                self.circuit.equivalent_faults[fault]
+                            )
+                        else:
+                            untestable_faults.add(fault)
+
+                # Expand the results to the full fault list
+                if collapse_faults:
+                    detected_faults, unresolved_faults = self.circuit.expand_faults(
+                        detected_faults
                     )
+                    if fault_simulator is not None:
+                        with timer.phase("fault simulation"):
+                            for start in range(0, len(vectors), 64):
+                                detected_faults.update(
+                                    fault_simulator.simulate(
+                                        vectors[start : start + 64], unresolved_faults
+                                    )
+                                )
+
+                    # Target the dominating faults that the test vectors miss
+                    missed_faults = [
+                        fault
+                        for fault in unresolved_faults
+                        if fault not in detected_faults
+                        and fault in self.circuit.equivalent_faults
+                    ]
+                    if missed_faults:
+                        with timer.phase("ATPG search"):
+                            vectors += self.target_missed_faults(
+                                missed_faults,
+                                fault_simulator,
+                                fault_sim_batch,
+                                detected_faults,
+                                untestable_faults,
+                            )
+
+                if fault_sample is not None:
+                    self.estimate_coverage(detected_faults)
+
+                # The remaining undetected faults are aborted
+
+                self.uncovered_faults = len(detected_faults)
+                self.untestable_faults = len(untestable_faults - detected_faults)
+                self.failures = self.no_of_faults - self.uncovered_faults
+                self.aborted_faults = self.failures - self.untestable_faults
+
+                self.patterns_before_compaction = len(vectors)
+                if compaction:
+                    with timer.phase("compaction"):
+                        if collapse_faults:
+                            compaction_faults = self.compaction_faults(detected_faults)
+                        else:
+                            compaction_faults = [
+                                fault
+                                for fault in self.circuit.faults
+                                if fault in detected_faults
+                            ]
+                        vectors = self.compact_tests(
+                            vectors,
+                            compaction_faults,
+                            fault_simulator or FaultSimulator(self.circuit),
+                            compaction_orders,
+                            random_seed,
+                        )
+
+                with timer.phase("output"):
+                    if self.pattern_writer is None:
+                        for vector in vectors:
+                            pattern_writer.write(vector)
+                    self.no_of_patterns = pattern_writer.close()
+            finally:
+                # A failed run stops the writer thread and keeps the patterns written
+                self.pattern_writer = None
+                pattern_writer.close()
+
+        return
+
+    def estimate_coverage(self, detected_faults):
+        """
+        Estimates the fault coverage of the full fault list from a stratified sample.
+
+        The estimate weighs the coverage of every stratum by its share of the fault list.
+        Its variance is the weighted sum of the binomial variances of the strata, with the
+        finite population correction. The confidence interval is the Wilson score interval
+        of the estimate for the effective sample size of this variance, so it does not
+        collapse to a single point when every sampled fault is detected.
+
+        Args:
+            detected_faults (set): The detected faults of the sample.
+
+        Returns:
+            None
+        """
+        total = self.sample_population
+        estimate = 0.0
+        variance = 0.0
+        sample_size = 0
+        for population, sample in self.circuit.fault_strata.values():
+            sample_size += len(sample)
+            weight = population / total
+            coverage = sum(1 for fault in sample if fault in detected_faults) / len(
+                sample
+            )
+            estimate += weight * coverage
+            if len(sample) > 1:
+                correction = (population - len(sample)) / (population - 1)
+                variance += (
+                    weight**2
+                    * coverage
+                    * (1 - coverage)
+                    / (len(sample) - 1)
+                    * correction
+                )
+
+        # Sample size of a simple random sample with the same variance
+        if variance > 0:
+            sample_size = estimate * (1 - estimate) / variance
+
+        z_squared = SAMPLE_CONFIDENCE_Z**2
+        denominator = 1 + z_squared / sample_size
+        center = (estimate + z_squared / (2 * sample_size)) / denominator
+        margin = (
+            SAMPLE_CONFIDENCE_Z
+            * math.sqrt(
+                estimate * (1 - estimate) / sample_size
+                + z_squared / (4 * sample_size**2)
+            )
+            / denominator
+        )
+
+        self.estimated_coverage = estimate * 100
+        self.coverage_interval = (
+            max(0.0, center - margin) * 100,
+            min(1.0, center + margin) * 100,
+        )
+
+        return
+
+    def target_missed_faults(
+        self,
+        missed_faults,
+        fault_simulator,
+        fault_sim_batch,
+        detected_faults,
+        untestable_faults,
+    ):
+        """
+        Runs PODEM on the dominating faults whose detection could not be inferred.
+
+        The counters of the collapsed fault list are left unchanged.
+
+        Args:
+            missed_faults (list): The representatives of the missed dominating fault classes.
+            fault_simulator (FaultSimulator): The fault simulator, or None to disable fault dropping.
+            fault_sim_batch (int): The number of test vectors fault simulated together.
+            detected_faults (set): The detected faults of the full fault list, updated in place.
+            untestable_faults (set): The untestable faults of the full fault list, updated in place.
+
+        Returns:
+            list: The new test vectors.
+        """
+        counters = (
+            self.atpg_detected,
+            self.fault_sim_detected,
+            self.secondary_detected,
+        )
+
+        vectors, fault_status = self.generate_tests(
+            missed_faults, fault_simulator, fault_sim_batch, show_progress=False
+        )
+        for fault, status in fault_status.items():
+            if status is Fault_Status.DETECTED:
+                detected_faults.update(self.circuit.equivalent_faults[fault])
+                self.dominating_detected += 1
+            elif status is Fault_Status.UNTESTABLE:
+                untestable_faults.update(self.circuit.equivalent_faults[fault])
+
+        self.dominating_targeted = len(missed_faults)
+        (
+            self.atpg_detected,
+            self.fault_sim_detected,
+            self.secondary_detected,
+        ) = counters
+
+        return vectors
+
+    def compaction_faults(self, detected_faults):
+        """
+        Selects the faults that compaction fault simulates on a collapsed fault list.
+
+        A test set that detects a representative of the collapsed fault list detects
+        its equivalent faults and the dominating faults inferred by expand_faults(), so
+        only the detected representatives are simulated, along with the representatives
+        of the dominating classes that were detected without being inferred.
+
+        Args:
+            detected_faults (set): The detected faults of the full fault list.
+
+        Returns:
+            list: The fault class representatives to simulate.
+        """
+        faults = [
+            fault for fault in self.circuit.collapsed_faults if fault in detected_faults
+        ]
+        inferred_faults, _ = self.circuit.expand_faults(faults)
+        faults += [
+            fault
+            for fault in self.circuit.equivalent_faults
+            if fault in detected_faults and fault not in inferred_faults
+        ]
+
+        return faults
+
+    def compact_tests(self, vectors, faults, fault_simulator, orders, seed):
+        """
+        Statically compacts a test set by fault simulation in reverse order.
+
+        The vectors are fault simulated in reverse order with fault dropping, and only the
+        vectors that detect a fault first are kept. The vectors generated last target the
+        hardest faults and usually detect many of the easy faults as well, so most of the
+        early vectors are dropped. The kept vectors are then simulated again in the given
+        number of random orders, keeping the smallest set. Every pass keeps a vector for each
+        fault, so the fault coverage is unchanged.
+
+        Args:
+            vectors (list): The test vectors, with no X values.
+            faults (list): The faults detected by the test vectors.
+            fault_simulator (FaultSimulator): The fault simulator of the circuit.
+            orders (int): The number of random orders tried after the reverse order.
+            seed (int): The seed used to shuffle the test vectors.
+
+        Returns:
+            list: The compacted test vectors, in their original relative order.
+        """
+        rng = random.Random(seed)
+
+        # Position of every vector in the original test set
+        position = {}
+        for idx, vector in enumerate(vectors):
+            position.setdefault(vector, idx)
+
+        order = list(reversed(list(position)))
+        compacted = self.first_detecting_vectors(order, faults, fault_simulator)
+
+        for _ in range(orders):
+            order = list(compacted)
+            rng.shuffle(order)
+            candidate = self.first_detecting_vectors(order, faults, fault_simulator)
+            if len(candidate) < len(compacted):
+                compacted = candidate
+
+        return sorted(compacted, key=position.get)
+
+    def first_detecting_vectors(self, vectors, faults, fault_simulator):
+        """
+        Fault simulates test vectors in order with fault dropping.
+
+        Args:
+            vectors (list): The test vectors, with no X values.
+            faults (list): The faults to simulate.
+            fault_simulator (FaultSimulator): The fault simulator of the circuit.
+
+        Returns:
+            list: The vectors that are the first to detect at least one fault, in order.
+        """
+        kept_vectors = []
+        remaining_faults = faults
+
+        for start in range(0, len(vectors), RANDOM_BATCH_SIZE):
+            if not remaining_faults:
+                break
+
+            batch = vectors[start : start + RANDOM_BATCH_SIZE]
+            mask = (1 << len(batch)) - 1
+            good_values = fault_simulator.good_simulate(batch)
+
+            # Within a batch, the lowest detecting bit is the first detecting vector
+            kept_bits = set()
+            undetected_faults = []
+            for fault in remaining_faults:
+                detected = fault_simulator.propagate_fault(fault, good_values, mask)
+                if detected:
+                    kept_bits.add((detected & -detected).bit_length() - 1)
                 else:
-                    self.failures += 1
+                    undetected_faults.append(fault)
+
+            kept_vectors.extend(batch[bit] for bit in sorted(kept_bits))
+            remaining_faults = undetected_faults
+
+        return kept_vectors
+
+    def random_pattern_phase(self, target_faults, fault_simulator, threshold, seed):
+        """
+        Detects the random pattern testable faults with batches of random test vectors.
+
+        Every batch of RANDOM_BATCH_SIZE random vectors is packed into one word per primary
+        input and fault simulated against the faults left. A vector is kept only if it is
+        the first vector of the batch to detect one of the newly detected faults. The phase
+        stops when a batch detects less than the given fraction of the faults left.
+
+        Args:
+            target_faults (list): The faults to target.
+            fault_simulator (FaultSimulator): The fault simulator of the circuit.
+            threshold (float): The lowest fraction of the faults left a batch must detect.
+            seed (int): The seed of the random test vectors.
+
+        Returns:
+            tuple: The list of kept test vectors, and a dict mapping every detected fault
+                   to Fault_Status.DETECTED.
+        """
+        rng = random.Random(seed)
+        no_of_inputs = len(self.circuit.primary_input_gates)
+        mask = (1 << RANDOM_BATCH_SIZE) - 1
+
+        vectors = []
+        fault_status = {}
+        remaining_faults = list(target_faults)
+
+        progress = self.progress
+        if progress is not None:
+            progress.start("Random", len(target_faults), len(target_faults))
+
+        while remaining_faults:
+            words = [rng.getrandbits(RANDOM_BATCH_SIZE) for _ in range(no_of_inputs)]
+            good_values = fault_simulator.good_simulate_words(words, mask)
+            self.random_batches += 1
+
+            # Index of the first vector of the batch detecting each new fault
+            kept_bits = set()
+            undetected_faults = []
+            for fault in remaining_faults:
+                detected = fault_simulator.propagate_fault(fault, good_values, mask)
+                if detected:
+                    fault_status[fault] = Fault_Status.DETECTED
+                    kept_bits.add((detected & -detected).bit_length() - 1)
+                else:
+                    undetected_faults.append(fault)
+
+            for bit in sorted(kept_bits):
+                self.add_vector(vectors, fault_simulator.unpack_pattern(words, bit))
+
+            no_of_detected = len(remaining_faults) - len(undetected_faults)
+            self.random_detected += no_of_detected
+            if progress is not None:
+                progress.update(len(fault_status), len(fault_status), len(vectors))
+            if no_of_detected < threshold * len(remaining_faults):
+                break
+            remaining_faults = undetected_faults
+
+        self.random_patterns = len(vectors)
+        if progress is not None:
+            progress.update(len(fault_status), len(fault_status), len(vectors), final=True)
+
+        return vectors, fault_status
+
+    def generate_tests(
+        self, target_faults, fault_simulator, fault_sim_batch, show_progress=True
+    ):
+        """
+        Runs PODEM on a list of faults, dropping the faults detected by fault simulation.
+
+        Every test cube found by PODEM is extended with secondary faults when dynamic
+        compaction is enabled, then its X values are filled. Identical vectors are kept once.
+        Once the time budget of compute() is spent, the faults that have not been targeted
+        yet are aborted.
 
-                # Print progress bar for every 5% completion
-                print(f"idx: {idx} / {total_faults}")
-                if (idx + 1) % progress_threshold == 0 or idx == total_faults - 1:
-                    percentage_done = (idx + 1) / total_faults * 100
-                    print(f"Progress: {percentage_done:.2f}% done")
+        Args:
+            target_faults (list): The faults to target.
+            fault_simulator (FaultSimulator): The fault simulator, or None to disable fault dropping.
+            fault_sim_batch (int): The number of test vectors fault simulated together.
+            show_progress (bool): Report the progress of the run to the ProgressReporter of
+                                  compute(), if any. Defaults to True.
 
+        Returns:
+            tuple: The list of test vectors, and a dict mapping every target fault to its
+                   Fault_Status.
+        """
+        vectors = []  # Initialize an empty list to store the test vectors
+        total_faults = len(target_faults)  # Total number of faults to process
+
+        progress = self.progress if show_progress else None
+        if progress is not None:
+            progress.start(
+                "PODEM",
+                total_faults,
+                self.no_of_collapsed_faults,
+                detected=self.random_detected + self.detected_count(),
+                patterns=self.random_patterns,
+            )
+            detected_before = self.detected_count()
+        checkpoint = self.checkpoint if show_progress else None
+
+        # Faults resolved so far: detected by PODEM or by fault simulation, proven
+        # untestable, or aborted
+        fault_status = {}
+        # Test vectors that have not been fault simulated yet
+        pending_vectors = []
+        seen_vectors = set()
+
+        for idx, fault in enumerate(target_faults):
+            if progress is not None:
+                progress.update(
+                    len(fault_status),
+                    self.detected_count() - detected_before,
+                    len(vectors),
+                )
 
-            # Write the entire list to the file at once
-            header_pin_names = """* Test pattern file
-            * generated by PodemQuest"""
+            # The faults detected by the vectors that are not fault simulated yet are not
+            # resolved, so a checkpoint waits for the end of the batch
+            if checkpoint is not None and not pending_vectors and checkpoint.due():
+                self.save_checkpoint(vectors, fault_status)
 
-            with open(self.output_file, "w") as f:
-                f.write(header_pin_names + "\n")
-                f.writelines(test_vectors)
+            # Drop the fault if one of the previous test vectors already detects it
+            if fault in fault_status:
+                continue
+
+            # Abort the faults left once the time budget is spent
+            if self.deadline is not None and time.monotonic() > self.deadline:
+                if fault_simulator is not None and pending_vectors:
+                    self.drop_detected_faults(
+                        fault_simulator,
+                        pending_vectors,
+                        target_faults[idx:],
+                        fault_status,
+                    )
+                for remaining_fault in target_faults[idx:]:
+                    fault_status.setdefault(remaining_fault, Fault_Status.ABORTED)
+                break
+
+            fault_site = fault[0]
+            self.fault_gate = self.circuit.gates[fault_site]
+
+            # A fault whose site reaches no primary output is untestable
+            if not self.po_reach[self.fault_gate]:
+                self.unobservable_faults += 1
+                fault_status[fault] = Fault_Status.UNTESTABLE
+                continue
+            self.set_cone(self.fault_gate)
+            if self.learned_implications is not None:
+                self.fault_fanout = self.transitive_fanout(self.fault_gate)
+
+            self.fault_gate.faulty = True
+            if fault[1] == 0:
+                self.fault_value = D_Value.ZERO
+                self.fault_gate.fault_value = D_Value.ZERO
+            elif fault[1] == 1:
+                self.fault_value = D_Value.ONE
+                self.fault_gate.fault_value = D_Value.ONE
+
+            self.init_PODEM()
+            self.podem_calls += 1
+            if self.slow_fault_limit:
+                search_start = time.perf_counter()
+                backtracks_before = self.backtracks
+                ret = self.advanced_PODEM()
+                self.record_search_time(
+                    fault,
+                    time.perf_counter() - search_start,
+                    self.backtracks - backtracks_before,
+                    ret,
+                )
+            else:
+                ret = self.advanced_PODEM()
+            self.fault_gate.faulty = False
+            fault_status[fault] = ret
+            if ret is Fault_Status.DETECTED:
+                self.atpg_detected += 1
+                test_cube = self.ret_success_vector()  # Get the test cube
+
+                if self.secondary_faults:
+                    test_cube = self.extend_test_cube(
+                        test_cube, target_faults[idx + 1 :], fault_status
+                    )
+
+                success_vector = self.fill_test_cube(test_cube)
+                if success_vector in seen_vectors:
+                    continue
+                seen_vectors.add(success_vector)
+                self.add_vector(vectors, success_vector)
+
+                if fault_simulator is not None:
+                    pending_vectors.append(success_vector)
+                    if len(pending_vectors) >= fault_sim_batch:
+                        self.drop_detected_faults(
+                            fault_simulator,
+                            pending_vectors,
+                            target_faults[idx + 1 :],
+                            fault_status,
+                        )
+                        pending_vectors = []
+
+        self.cone_outputs = None
+        self.fault_fanout = None
+
+        if progress is not None:
+            progress.update(
+                len(fault_status),
+                self.detected_count() - detected_before,
+                len(vectors),
+                final=True,
+            )
+
+        return vectors, fault_status
+
+    def set_cone(self, fault_gate):
+        """
+        Restricts the search to the cone of influence of a fault site.
+
+        Only the transitive fanout of the fault site and the transitive fanin of the primary
+        outputs in that fanout can take part in detecting the fault. This is exactly the set
+        of gates that reach one of the primary outputs reachable from the fault site, so the
+        cone is kept as the bitset of those outputs and nothing is built per fault.
+
+        Args:
+            fault_gate (Gate): The fault site, which reaches at least one primary output.
+
+        Returns:
+            None
+        """
+        cone_outputs = self.po_reach[fault_gate]
+        if not self.cone_restriction or cone_outputs == self.all_outputs:
+            self.cone_outputs = None
+        else:
+            self.cone_outputs = cone_outputs
+            self.cone_restricted_faults += 1
 
         return
 
+    def in_cone(self, gate):
+        """
+        Checks if a gate is in the cone of influence of the current fault.
 
-    def init_PODEM(self):
+        Args:
+            gate (Gate): The gate to check.
+
+        Returns:
+            bool: True if the gate is in the cone or the search is not restricted.
         """
-        Initializes the output of each gate to X.
+        return self.cone_outputs is None or bool(self.po_reach[gate] & self.cone_outputs)
 
-        This function iterates through all the gates in the circuit and sets their output to X.
+    def set_static_learning(self, learning):
+        """
+        Uses the implications learned on the circuit, or on the circuit it was extracted
+        from, during the search.
+
+        Args:
+            learning (StaticLearning): The learned implications.
+
+        Returns:
+            None
+        """
+        self.learning = learning
+        self.learned_implications = learning.gate_implications(self.circuit)
+
+        return
+
+    def transitive_fanout(self, gate):
+        """
+        Returns the transitive fanout of a gate, including the gate itself.
+
+        Args:
+            gate (Gate): The gate.
+
+        Returns:
+            set: The gates of the transitive fanout.
+        """
+        fanout = {gate}
+        stack = [gate]
+        while stack:
+            for next_gate in stack.pop().output_gates:
+                if next_gate not in fanout:
+                    fanout.add(next_gate)
+                    stack.append(next_gate)
+
+        return fanout
+
+    def apply_learned_implications(self, gate):
+        """
+        Sets the values implied by the learned implications of the value of a gate.
+
+        The implications are those of the fault-free circuit, so they are only applied to
+        gates outside the transitive fanout of the fault, whose faulty values are equal to
+        their fault-free values, and inside the cone of the fault. The implications of the
+        values they set are applied in turn.
+
+        Args:
+            gate (Gate): The gate whose value has changed.
+
+        Returns:
+            list: The gate and the gates set by learned implications, whose output gates
+                  must be implied.
+        """
+        learned = self.learned_implications
+        fault_fanout = self.fault_fanout
+        po_reach = self.po_reach
+        cone_outputs = self.cone_outputs
+        trail = self.trail
+
+        changed_gates = [gate]
+        for changed_gate in changed_gates:
+            implications = learned.get(changed_gate)
+            if implications is None:
+                continue
+            if changed_gate.value == D_Value.ZERO:
+                targets = implications[0]
+            elif changed_gate.value == D_Value.ONE:
+                targets = implications[1]
+            else:
+                continue
+
+            for target, value in targets:
+                if (
+                    target.value == D_Value.X
+                    and target not in fault_fanout
+                    and (cone_outputs is None or po_reach[target] & cone_outputs)
+                ):
+                    trail.append((target, D_Value.X))
+                    target.value = value
+                    self.value_changed(target)
+                    self.learned_applied += 1
+                    changed_gates.append(target)
+
+        return changed_gates
+
+    def add_vector(self, vectors, vector):
+        """
+        Adds a new test vector to a list of test vectors, and streams it to the pattern
+        file when the test set is not compacted.
+
+        Args:
+            vectors (list): The test vectors, updated in place.
+            vector (str): The new test vector, with no X values.
+
+        Returns:
+            None
+        """
+        vectors.append(vector)
+        if self.pattern_writer is not None:
+            self.pattern_writer.write(vector)
+
+        return
+
+    def save_checkpoint(self, vectors, fault_status):
+        """
+        Saves a checkpoint of the PODEM phase.
+
+        Args:
+            vectors (list): The test vectors generated by the phase so far.
+            fault_status (dict): The status of the faults resolved by the phase so far.
+
+        Returns:
+            None
+        """
+        with self.timer.phase("checkpoint"):
+            counters = {name: getattr(self, name) for name in CHECKPOINT_COUNTERS}
+            self.checkpoint.save(vectors, fault_status, counters)
+
+        return
+
+    def record_search_time(self, fault, seconds, backtracks, status):
+        """
+        Keeps a PODEM search if it is one of the slow_fault_limit slowest so far.
+
+        Args:
+            fault (tuple): The targeted fault.
+            seconds (float): The time of the search.
+            backtracks (int): The backtracks of the search.
+            status (Fault_Status): The outcome of the search.
+
+        Returns:
+            None
+        """
+        entry = (seconds, fault, backtracks, status)
+        if len(self.slowest_faults) < self.slow_fault_limit:
+            heapq.heappush(self.slowest_faults, entry)
+        elif seconds > self.slowest_faults[0][0]:
+            heapq.heapreplace(self.slowest_faults, entry)
+
+        return
+
+    def detected_count(self):
+        """
+        Returns the number of faults detected by PODEM, as secondary faults, or by fault
+        simulation so far.
+
+        Returns:
+            int: The number of detected faults.
+        """
+        return self.atpg_detected + self.secondary_detected + self.fault_sim_detected
+
+    def extend_test_cube(self, test_cube, faults, fault_status):
+        """
+        Targets secondary faults under the assignment of a test cube (dynamic compaction).
+
+        The primary inputs assigned by the cube are implied on the fault-free circuit. Each
+        secondary fault is then injected on top of this state and PODEM may only assign the
+        primary inputs that are still X, with a small backtrack limit. When it succeeds, the
+        new assignments are added to the cube, so the X values of the cube are spent on
+        detecting more faults instead of being filled blindly.
+
+        Args:
+            test_cube (str): The test cube of the primary fault, with '0', '1' and 'X'.
+            faults (list): The candidate secondary faults, in order.
+            fault_status (dict): The status of the faults resolved so far, updated in place.
+
+        Returns:
+            str: The extended test cube.
+        """
+        primary_inputs = self.circuit.primary_input_gates
+        primary_fault = self.fault_gate, self.fault_value
+        backtrack_limit = self.backtrack_limit
+        cone_outputs = self.cone_outputs
+        fault_fanout = self.fault_fanout
+
+        # Imply the cube on the whole fault-free circuit, since the secondary faults do not
+        # share the cone of the primary fault, and without learned implications, which
+        # would not hold once a secondary fault is injected
+        self.init_PODEM()
+        self.cone_outputs = None
+        self.fault_fanout = None
+        for PI, char in zip(primary_inputs, test_cube):
+            if char != "X":
+                self.assign(PI, D_Value.ONE if char == "1" else D_Value.ZERO)
+        trail_mark = len(self.trail)
+
+        self.backtrack_limit = SECONDARY_BACKTRACK_LIMIT
+        attempts = 0
+        for fault in faults:
+            if attempts >= self.secondary_faults or "X" not in test_cube:
+                break
+            if fault in fault_status:
+                continue
+
+            fault_gate = self.circuit.gates[fault[0]]
+            if not self.po_reach[fault_gate]:
+                continue
+            # The cube already drives the fault site to the stuck-at value
+            if fault_gate.value == fault[1]:
+                continue
+
+            attempts += 1
+            self.secondary_calls += 1
+            self.fault_gate = fault_gate
+            self.fault_value = D_Value.ONE if fault[1] == 1 else D_Value.ZERO
+            fault_gate.faulty = True
+            fault_gate.fault_value = self.fault_value
+
+            # Inject the fault on top of the fault-free values and search from there
+            self.imply(fault_gate)
+            ret = self.advanced_PODEM()
+            if ret is Fault_Status.DETECTED:
+                fault_status[fault] = Fault_Status.DETECTED
+                self.secondary_detected += 1
+                extended_cube = self.ret_success_vector()
+
+            self.undo(trail_mark)
+            fault_gate.faulty = False
+
+            if ret is Fault_Status.DETECTED:
+                # Imply the new assignments on the fault-free circuit
+                for PI, old_char, char in zip(primary_inputs, test_cube, extended_cube):
+                    if old_char == "X" and char != "X":
+                        self.assign(PI, D_Value.ONE if char == "1" else D_Value.ZERO)
+                trail_mark = len(self.trail)
+                test_cube = extended_cube
+
+        self.backtrack_limit = backtrack_limit
+        self.fault_gate, self.fault_value = primary_fault
+        self.cone_outputs = cone_outputs
+        self.fault_fanout = fault_fanout
+
+        return test_cube
+
+    def fill_test_cube(self, test_cube):
+        """
+        Fills the X values of a test cube.
+
+        With random fill, the bits only depend on the cube and the random seed, so the
+        vectors do not depend on the order in which the cubes are generated.
+
+        Args:
+            test_cube (str): The test cube, with '0', '1' and 'X'.
+
+        Returns:
+            str: The test vector, with no X values.
+        """
+        if self.x_fill == "random":
+            rng = random.Random(f"{self.random_seed}:{test_cube}")
+            return "".join(
+                rng.choice("01") if char == "X" else char for char in test_cube
+            )
+
+        return test_cube.replace("X", "0")
+
+    def generate_tests_parallel(
+        self, target_faults, fault_simulator, fault_sim_batch, jobs, resumed=None
+    ):
+        """
+        Runs PODEM on a list of faults with a pool of worker processes.
+
+        The faults are split into shards of SHARD_SIZE faults, independently of the number of
+        jobs, and every shard is processed from a clean state by generate_tests() in a worker.
+        The results are merged in shard order, identical vectors are removed, and the merged
+        vectors are fault simulated against the faults that are still undetected, so the
+        output only depends on the fault list and not on the number of jobs, unless a time
+        limit aborts some faults.
+
+        Each worker holds its own copy of the circuit, inherited once when the pool starts.
+
+        Args:
+            target_faults (list): The faults to target.
+            fault_simulator (FaultSimulator): The fault simulator, or None to disable fault dropping.
+            fault_sim_batch (int): The number of test vectors fault simulated together.
+            jobs (int): The number of worker processes. With 1, the shards run in this process.
+            resumed (tuple): The test vectors and the fault status of the interrupted run
+                             when resuming from a checkpoint, see resumed_aborted_faults().
+                             Defaults to None.
+
+        Returns:
+            tuple: The list of test vectors, and a dict mapping every target fault to its
+                   Fault_Status.
+        """
+        shards = [
+            target_faults[start : start + SHARD_SIZE]
+            for start in range(0, len(target_faults), SHARD_SIZE)
+        ]
+        worker_args = (
+            self.circuit,
+            fault_simulator is not None,
+            fault_sim_batch,
+            self.worker_settings(),
+        )
+
+        progress = self.progress
+        if progress is not None:
+            progress.start(
+                "PODEM",
+                len(target_faults),
+                self.no_of_collapsed_faults,
+                detected=self.random_detected + self.detected_count(),
+                patterns=self.random_patterns,
+            )
+            detected_before = self.detected_count()
+
+        vectors = []
+        # The vectors of an interrupted run are not generated again
+        seen_vectors = set(resumed[0]) if resumed is not None else set()
+        fault_status = {}
+
+        def merge(results):
+            # The results are merged in shard order as the shards complete
+            for shard_vectors, shard_status, counters, slowest in results:
+                for vector in shard_vectors:
+                    if vector not in seen_vectors:
+                        seen_vectors.add(vector)
+                        self.add_vector(vectors, vector)
+                fault_status.update(shard_status)
+                self.merge_shard_counters(counters)
+                for seconds, fault, backtracks, status in slowest:
+                    self.record_search_time(fault, seconds, backtracks, status)
+                if self.checkpoint is not None and self.checkpoint.due():
+                    self.save_checkpoint(vectors, fault_status)
+                if progress is not None:
+                    progress.update(
+                        len(fault_status),
+                        self.detected_count() - detected_before,
+                        len(vectors),
+                    )
+
+        if jobs == 1:
+            _init_worker(*worker_args)
+            merge(_run_shard(shard) for shard in shards)
+            # The worker agent leaves the values of its last search on the shared gates,
+            # which are not on the trail of this agent
+            self.reset_values()
+        else:
+            # Forked workers inherit the circuit without pickling it
+            if "fork" in multiprocessing.get_all_start_methods():
+                context = multiprocessing.get_context("fork")
+            else:
+                context = multiprocessing.get_context()
+            with context.Pool(
+                jobs, initializer=_init_worker, initargs=worker_args
+            ) as pool:
+                merge(pool.imap(_run_shard, shards, chunksize=1))
+
+        # Aborted faults of a shard may be detected by the vectors of another shard
+        if fault_simulator is not None:
+            remaining_faults, all_vectors = self.resumed_aborted_faults(
+                resumed, vectors, fault_status
+            )
+            remaining_faults += [
+                fault
+                for fault in target_faults
+                if fault_status[fault] is Fault_Status.ABORTED
+            ]
+            for start in range(0, len(all_vectors), 64):
+                self.drop_detected_faults(
+                    fault_simulator,
+                    all_vectors[start : start + 64],
+                    remaining_faults,
+                    fault_status,
+                )
+
+        if progress is not None:
+            progress.update(
+                len(fault_status),
+                self.detected_count() - detected_before,
+                len(vectors),
+                final=True,
+            )
+
+        return vectors, fault_status
+
+    def generate_tests_partitioned(
+        self,
+        target_faults,
+        fault_simulator,
+        fault_sim_batch,
+        partitions,
+        jobs,
+        resumed=None,
+    ):
+        """
+        Runs PODEM on the output-cone partitions of the circuit.
+
+        The primary outputs are grouped into clusters with overlapping fanin cones (see
+        Partitioner) and every fault is assigned to the cluster holding the most of the
+        outputs it reaches. Each cluster is extracted as a standalone sub-circuit with its
+        own primary inputs and outputs, and its faults are run by generate_tests() on it,
+        serially or with a pool of worker processes. The vectors of the sub-circuits are
+        merged in partition order into full-width vectors, the primary inputs outside a
+        partition being X-filled, so the output does not depend on the number of jobs.
+
+        A sub-circuit holds the whole fanin of its outputs, so its tests and untestable
+        faults stand for the circuit, except for the boundary faults that also reach the
+        outputs of another partition: those left undetected are targeted again on the
+        whole circuit after fault simulating all the merged vectors.
+
+        Args:
+            target_faults (list): The faults to target.
+            fault_simulator (FaultSimulator): The fault simulator, or None to disable fault dropping.
+            fault_sim_batch (int): The number of test vectors fault simulated together.
+            partitions (int): The number of partitions.
+            jobs (int): The number of worker processes, or None to run the partitions in
+                        this process.
+            resumed (tuple): The test vectors and the fault status of the interrupted run
+                             when resuming from a checkpoint, see resumed_aborted_faults().
+                             Defaults to None.
+
+        Returns:
+            tuple: The list of test vectors, and a dict mapping every target fault to its
+                   Fault_Status.
+        """
+        with self.timer.phase("partitioning"):
+            partitioner = Partitioner(self.circuit)
+            clusters = partitioner.cluster_outputs(partitions)
+            (
+                cluster_faults,
+                boundary_faults,
+                unobservable_faults,
+            ) = partitioner.assign_faults(target_faults, clusters)
+        self.partition_count = len(clusters)
+        self.boundary_faults = len(boundary_faults)
+
+        # A fault whose site reaches no primary output is untestable
+        fault_status = {fault: Fault_Status.UNTESTABLE for fault in unobservable_faults}
+        self.unobservable_faults += len(unobservable_faults)
+
+        tasks = [
+            (outputs, faults)
+            for outputs, faults in zip(clusters, cluster_faults)
+            if faults
+        ]
+        worker_args = (
+            self.circuit,
+            fault_simulator is not None,
+            fault_sim_batch,
+            self.worker_settings(),
+        )
+
+        progress = self.progress
+        if progress is not None:
+            progress.start(
+                "PODEM",
+                len(target_faults),
+                self.no_of_collapsed_faults,
+                detected=self.random_detected + self.detected_count(),
+                patterns=self.random_patterns,
+            )
+            detected_before = self.detected_count()
+
+        # Position of every primary input in the full-width vectors
+        input_positions = {
+            gate.outputpin: position
+            for position, gate in enumerate(self.circuit.primary_input_gates)
+        }
+        vector_width = len(input_positions)
+        vectors = []
+        # The vectors of an interrupted run are not generated again
+        seen_vectors = set(resumed[0]) if resumed is not None else set()
+
+        def merge(results):
+            # The results are merged in partition order as the partitions complete
+            for input_names, sub_vectors, sub_status, counters, slowest in results:
+                positions = [input_positions[name] for name in input_names]
+                for sub_vector in sub_vectors:
+                    test_cube = ["X"] * vector_width
+                    for position, char in zip(positions, sub_vector):
+                        test_cube[position] = char
+                    vector = self.fill_test_cube("".join(test_cube))
+                    if vector not in seen_vectors:
+                        seen_vectors.add(vector)
+                        self.add_vector(vectors, vector)
+                fault_status.update(sub_status)
+                self.merge_shard_counters(counters)
+                for seconds, fault, backtracks, status in slowest:
+                    self.record_search_time(fault, seconds, backtracks, status)
+                if self.checkpoint is not None and self.checkpoint.due():
+                    # The boundary faults that a partition leaves undetected are only
+                    # resolved on the whole circuit, so they stay pending in a checkpoint
+                    self.save_checkpoint(
+                        vectors,
+                        {
+                            fault: status
+                            for fault, status in fault_status.items()
+                            if status is Fault_Status.DETECTED
+                            or fault not in boundary_faults
+                        },
+                    )
+                if progress is not None:
+                    progress.update(
+                        len(fault_status),
+                        self.detected_count() - detected_before,
+                        len(vectors),
+                    )
+
+        if jobs is None or jobs == 1 or len(tasks) <= 1:
+            _init_partition_worker(*worker_args)
+            merge(_run_partition(task) for task in tasks)
+        else:
+            # Forked workers inherit the circuit and extract their sub-circuits from it
+            if "fork" in multiprocessing.get_all_start_methods():
+                context = multiprocessing.get_context("fork")
+            else:
+                context = multiprocessing.get_context()
+            with context.Pool(
+                min(jobs, len(tasks)),
+                initializer=_init_partition_worker,
+                initargs=worker_args,
+            ) as pool:
+                merge(pool.imap(_run_partition, tasks, chunksize=1))
+
+        # Aborted faults and boundary faults of a partition may be detected by the vectors
+        # of another partition
+        if fault_simulator is not None:
+            remaining_faults, all_vectors = self.resumed_aborted_faults(
+                resumed, vectors, fault_status
+            )
+            remaining_faults += [
+                fault
+                for fault in target_faults
+                if fault_status[fault] is Fault_Status.ABORTED
+                or (
+                    fault in boundary_faults
+                    and fault_status[fault] is not Fault_Status.DETECTED
+                )
+            ]
+            for start in range(0, len(all_vectors), 64):
+                self.drop_detected_faults(
+                    fault_simulator,
+                    all_vectors[start : start + 64],
+                    remaining_faults,
+                    fault_status,
+                )
+
+        # The boundary faults left may only be observable at the outputs of other partitions
+        retarget_faults = [
+            fault
+            for fault in target_faults
+            if fault in boundary_faults
+            and fault_status[fault] is not Fault_Status.DETECTED
+        ]
+        if retarget_faults:
+            self.boundary_retargeted = len(retarget_faults)
+            # generate_tests() adds its vectors to the pattern file itself
+            retarget_vectors, retarget_status = self.generate_tests(
+                retarget_faults, fault_simulator, fault_sim_batch, show_progress=False
+            )
+            vectors.extend(retarget_vectors)
+            fault_status.update(retarget_status)
+
+        if progress is not None:
+            progress.update(
+                len(fault_status),
+                self.detected_count() - detected_before,
+                len(vectors),
+                final=True,
+            )
+
+        return vectors, fault_status
+
+    def resumed_aborted_faults(self, resumed, vectors, fault_status):
+        """
+        Adds an interrupted run to the final fault simulation of the shards or partitions.
+
+        The faults aborted by a shard or partition are fault simulated with the vectors of
+        all the others once they are done. When resuming, the shards and partitions of the
+        interrupted run are in the checkpoint: their aborted faults are fault simulated
+        again, with the checkpointed vectors and the new ones, and the new aborted faults
+        with the checkpointed vectors as well.
+
+        Args:
+            resumed (tuple): The test vectors and the fault status of the interrupted run,
+                             or None if the run is not resumed.
+            vectors (list): The test vectors of the shards or partitions of this run.
+            fault_status (dict): The status of the faults resolved by this run, updated in
+                                 place with the aborted faults of the interrupted run.
+
+        Returns:
+            tuple: The aborted faults of the interrupted run, and the test vectors to fault
+                   simulate.
+        """
+        if resumed is None:
+            return [], vectors
+
+        resumed_vectors, resumed_status = resumed
+        resumed_faults = [
+            fault
+            for fault, status in resumed_status.items()
+            if status is Fault_Status.ABORTED
+        ]
+        for fault in resumed_faults:
+            fault_status[fault] = Fault_Status.ABORTED
+
+        return resumed_faults, resumed_vectors + vectors
+
+    def worker_settings(self):
+        """
+        Returns the search limits and test cube settings passed to the PODEM agents of the
+        worker processes.
+
+        Returns:
+            dict: The settings, by PODEM attribute name.
+        """
+        return {
+            "backtrack_limit": self.backtrack_limit,
+            "fault_time_limit": self.fault_time_limit,
+            "deadline": self.deadline,
+            "secondary_faults": self.secondary_faults,
+            "x_fill": self.x_fill,
+            "random_seed": self.random_seed,
+            "implication": self.implication,
+            "cone_restriction": self.cone_restriction,
+            "slow_fault_limit": self.slow_fault_limit,
+            "learning": self.learning,
+        }
+
+    def merge_shard_counters(self, counters):
+        """
+        Adds the counters of a shard run by _run_shard() to the counters of the run.
+
+        Args:
+            counters (dict): The counters of the shard, by PODEM attribute name.
+
+        Returns:
+            None
+        """
+        for name, value in counters.items():
+            setattr(self, name, getattr(self, name) + value)
+
+        return
+
+    def drop_detected_faults(self, fault_simulator, vectors, faults, fault_status):
+        """
+        Fault simulates new test vectors and drops every fault they detect.
+
+        Args:
+            fault_simulator (FaultSimulator): The fault simulator of the circuit.
+            vectors (list): The test vectors to simulate, with no X values.
+            faults (list): The faults that have not been targeted by PODEM yet, or aborted.
+            fault_status (dict): The status of the faults resolved so far, updated in place.
+
+        Returns:
+            None
+        """
+        remaining_faults = [
+            fault
+            for fault in faults
+            if fault_status.get(fault) is not Fault_Status.DETECTED
+        ]
+        with self.timer.phase("fault simulation"):
+            detections = fault_simulator.simulate(vectors, remaining_faults)
+
+        for fault in detections:
+            fault_status[fault] = Fault_Status.DETECTED
+        self.fault_sim_detected += len(detections)
+
+        return
+
+    def reset_values(self):
+        """
+        Sets the output of every gate in the circuit to X and clears the assignment trail.
+
+        Returns:
+            None
         """
-        self.fault_is_activated = False
         for gate in self.circuit.gates.values():
             # Set the output of each gate to X
             gate.value = D_Value.X
+        self.trail = []
+        self.unresolved_outputs = self.all_outputs
+        self.error_outputs = 0
+
+        return
+
+    def init_PODEM(self):
+        """
+        Initializes the output of each gate to X.
+
+        Only the gates recorded on the assignment trail by the previous fault can hold a
+        value other than X, so undoing the whole trail restores the initial state.
+        """
+        self.fault_is_activated = False
+        self.undo(0)
+        self.d_frontier_gates.clear()
+        self.d_frontier_heap = []
+
+        return
+
+    def assign(self, gate, value):
+        """
+        Assigns a value to a gate, records it on the trail, and implies it.
+
+        Args:
+            gate (Gate): The gate to assign, usually a primary input.
+            value (D_Value): The value to assign.
+
+        Returns:
+            None
+        """
+        self.trail.append((gate, gate.value))
+        gate.value = value
+        self.value_changed(gate)
+        self.imply(gate)
+
+        return
+
+    def undo(self, trail_mark):
+        """
+        Restores the gate values recorded on the trail after the given mark.
+
+        Args:
+            trail_mark (int): The length of the trail to return to.
+
+        Returns:
+            None
+        """
+        trail = self.trail
+        while len(trail) > trail_mark:
+            gate, old_value = trail.pop()
+            gate.value = old_value
+            self.value_changed(gate)
+
+        return
+
+    def value_changed(self, gate):
+        """
+        Updates the incremental search state after the value of a gate has changed.
+
+        Args:
+            gate (Gate): The gate whose value has changed.
+
+        Returns:
+            None
+        """
+        if gate.type == "output_pin":
+            if gate.value == D_Value.X:
+                self.unresolved_outputs |= self.po_reach[gate]
+            else:
+                self.unresolved_outputs &= ~self.po_reach[gate]
+            if gate.value == D_Value.D or gate.value == D_Value.D_PRIME:
+                self.error_outputs |= self.po_reach[gate]
+            else:
+                self.error_outputs &= ~self.po_reach[gate]
+
+        self.update_d_frontier(gate)
+
+        return
+
+    def update_d_frontier(self, gate):
+        """
+        Updates the D-frontier after the value of a gate has changed.
+
+        Only the gate itself and its output gates can enter or leave the D-frontier.
+
+        Args:
+            gate (Gate): The gate whose value has changed.
+
+        Returns:
+            None
+        """
+        self.check_d_frontier_gate(gate)
+        for next_gate in gate.output_gates:
+            self.check_d_frontier_gate(next_gate)
 
         return
 
+    def check_d_frontier_gate(self, gate):
+        """
+        Adds a gate to the D-frontier if it has an X output and a D or D' input,
+        and removes it otherwise.
+
+        Args:
+            gate (Gate): The gate to check.
+
+        Returns:
+            None
+        """
+        # Observability of the most observable input pin with a D or D' value
+        pin_CCb = None
+        if gate.value == D_Value.X:
+            for input_gate, input_CCb in zip(gate.input_gates, gate.pin_CCb):
+                if input_gate.value == D_Value.D or input_gate.value == D_Value.D_PRIME:
+                    if pin_CCb is None or input_CCb < pin_CCb:
+                        pin_CCb = input_CCb
+
+        if pin_CCb is not None:
+            if self.d_frontier_gates.get(gate) != pin_CCb:
+                self.d_frontier_gates[gate] = pin_CCb
+                heapq.heappush(self.d_frontier_heap, (pin_CCb, gate.id, gate))
+        else:
+            self.d_frontier_gates.pop(gate, None)
+
+        return
+
+    def select_d_frontier_gate(self):
+        """
+        Selects the D-frontier gate whose D input pin has the smallest CCb value, among
+        the gates that have an X path to a primary output.
+
+        Returns:
+            Gate: The selected gate, or None if no D-frontier gate can propagate the fault.
+        """
+        heap = self.d_frontier_heap
+        # Gates that are in the D-frontier but currently have no X path
+        blocked = []
+        selected = None
+
+        while heap:
+            entry = heap[0]
+            gate = entry[2]
+            # Discard the entries of gates that left the D-frontier, and the outdated
+            # entries of gates whose most observable D input pin has changed
+            if self.d_frontier_gates.get(gate) != entry[0]:
+                heapq.heappop(heap)
+            elif self.check_X_path(gate):
+                selected = gate
+                break
+            else:
+                # The X path may be restored by backtracking, so keep the entry
+                blocked.append(heapq.heappop(heap))
+
+        for entry in blocked:
+            heapq.heappush(heap, entry)
+
+        return selected
+
     def imply_all(self):  # todo: check if needed
         for PI in self.Primary_Inputs:
             self.imply(PI)
 
         return
 
-    def imply(self, _input_gate):
+    def imply(self, source_gate):
+        """
+        Propagates the value of a gate to all parts of the circuit that it affects.
+
+        The gates whose inputs changed are scheduled into one bucket per logic level and the
+        buckets are processed in level order, so every affected gate is evaluated exactly
+        once, after all of its changed inputs, and the recursion depth does not depend on
+        the depth of the circuit.
+
+        Args:
+            source_gate (Gate): The gate whose value or fault was set, usually a primary input.
+
+        Returns:
+            None
+        """
+        if self.implication == "recursive":
+            self.imply_recursive(source_gate)
+            return
+
+        levels = self.gate_levels
+        buckets = self.level_buckets
+        scheduled = self.scheduled_gates
+        trail = self.trail
+        po_reach = self.po_reach
+        cone_outputs = self.cone_outputs
+        learning = self.fault_fanout is not None
+
+        level = levels[source_gate]
+        buckets[level].append(source_gate)
+        scheduled.add(source_gate)
+        last_level = level
+        # Lowest level scheduled below the current one by a learned implication
+        restart_level = len(buckets)
+
+        while level <= last_level:
+            bucket = buckets[level]
+            for gate in bucket:
+                initial_value = gate.value
+                gate.evaluate()
+                self.gate_evaluations += 1
+
+                changed_gates = (gate,)
+                if initial_value != gate.value:
+                    if learning and gate.value == D_Value.X:
+                        # A value set by a learned implication does not follow from
+                        # the inputs of the gate yet
+                        gate.value = initial_value
+                        continue
+                    # Record the change so it can be undone
+                    trail.append((gate, initial_value))
+                    self.value_changed(gate)
+                    if learning:
+                        changed_gates = self.apply_learned_implications(gate)
+                elif gate.type != "input_pin":
+                    # A primary input is assigned before its implication, so it is
+                    # propagated even if the evaluation did not change it
+                    continue
+                elif learning:
+                    changed_gates = self.apply_learned_implications(gate)
+
+                # Schedule the output gates in the cone, which are on a higher level than
+                # the gate, but not always than the current level for learned values
+                for changed_gate in changed_gates:
+                    for next_gate in changed_gate.output_gates:
+                        self.implication_events += 1
+                        if next_gate not in scheduled and (
+                            cone_outputs is None or po_reach[next_gate] & cone_outputs
+                        ):
+                            scheduled.add(next_gate)
+                            next_level = levels[next_gate]
+                            buckets[next_level].append(next_gate)
+                            if next_level > last_level:
+                                last_level = next_level
+                            elif next_level < level and next_level < restart_level:
+                                restart_level = next_level
+            # The gates of the level may be scheduled again by a learned value
+            scheduled.difference_update(bucket)
+            bucket.clear()
+            if restart_level < level:
+                level = restart_level
+                restart_level = len(buckets)
+            else:
+                level += 1
+
+        return
+
+    def imply_recursive(self, _input_gate):
         """
         Propagates a _input_gate's value to all parts of the circuit that it affects.
 
         This function starts from the primary input, simulates the gate, and recursively calls itself on the next gates.
+        A reconvergent gate is evaluated once per changed input path; kept to compare with imply().
 
         Args:
             primary_input (Gate): The primary input gate.
@@ -166,19 +1997,33 @@ class PODEM:
         """
         initial_output_value = _input_gate.value
         _input_gate.evaluate()
+        self.gate_evaluations += 1
 
         ## Simulate the gate # todo: check if needed
         # self.simulate_gate(next_gate)
 
-        if (
-            initial_output_value == _input_gate.value
-            and _input_gate.type != "input_pin"
-        ):
+        changed_gates = (_input_gate,)
+        if initial_output_value != _input_gate.value:
+            if self.fault_fanout is not None and _input_gate.value == D_Value.X:
+                # A value set by a learned implication does not follow from the inputs yet
+                _input_gate.value = initial_output_value
+                return
+            # Record the change so it can be undone
+            self.trail.append((_input_gate, initial_output_value))
+            self.value_changed(_input_gate)
+            if self.fault_fanout is not None:
+                changed_gates = self.apply_learned_implications(_input_gate)
+        elif _input_gate.type != "input_pin":
             return
+        elif self.fault_fanout is not None:
+            changed_gates = self.apply_learned_implications(_input_gate)
 
-        # Iterate over all output gates connected to the primary input
-        for next_gate in _input_gate.output_gates:
-            self.imply(next_gate)
+        # Iterate over all output gates in the cone connected to the changed gates
+        for changed_gate in changed_gates:
+            for next_gate in changed_gate.output_gates:
+                self.implication_events += 1
+                if self.in_cone(next_gate):
+                    self.imply_recursive(next_gate)
 
     def simulate_gate(self, gate):
         """
@@ -256,29 +2101,21 @@ class PODEM:
         """
         Checks if there is an error at the primary outputs of the circuit.
 
-        This function iterates through the primary output gates and checks if any of them have a value
-        of D or D'. If such a gate is found, it returns True, indicating that there is an error.
+        The primary outputs with a value of D or D' are kept in a bitset by value_changed(),
+        so the check does not depend on the number of primary outputs.
 
         Returns:
             bool: True if there is an error at the primary outputs, False otherwise.
         """
-        # Iterate through the primary output gates
-        for output_gate in self.circuit.primary_output_gates:
-            # Check if the gate has a value of D or D'
-            if output_gate.value == D_Value.D or output_gate.value == D_Value.D_PRIME:
-                # If an error is found, return True
-                return True
-
-        # If no error is found, return False
-        return False
+        return self.error_outputs != 0
 
     def ret_success_vector(self):
         """
-        Returns the test vector for the circuit by iterating through the primary input gates
-        and appending their values to the test vector list.
+        Returns the test cube for the circuit by iterating through the primary input gates
+        and appending their values to the test vector.
 
         Returns:
-            list: The test vector for the circuit.
+            str: The test cube for the circuit, with 'X' for the unassigned primary inputs.
         """
         # Initialize an empty list to store the test vector
         test_vector = ""
@@ -286,7 +2123,7 @@ class PODEM:
         # Iterate through the primary input gates
         for PI in self.circuit.primary_input_gates:
             # Append the value of each primary input gate to the test vector
-            test_vector += str(PI.value.value[0])
+            test_vector += GOOD_VALUE_CHARS[PI.value]
 
         # Return the test vector
         return test_vector
@@ -295,13 +2132,14 @@ class PODEM:
         """
         Check if the circuit contains a gate with D or D' value. If so, check for an X path.
 
-        This function iterates through all the gates in the circuit and checks if any gate has a value of D or D'.
+        Only the gates recorded on the assignment trail can hold a value other than X, so
+        only they are checked instead of all the gates in the circuit.
 
         Returns:
             bool: True if a gate with D or D' value is found, False otherwise.
         """
-        # Iterate through all the gates in the circuit
-        for gate in self.circuit.gates.values():
+        # Iterate through the gates whose value has changed
+        for gate, _ in self.trail:
             # Check if the gate has a value of D or D'
             if gate.value == D_Value.D or gate.value == D_Value.D_PRIME:
                 # If a gate with D or D' value is found, check for an X path
@@ -316,6 +2154,9 @@ class PODEM:
         """
         Check if there is an X path from the given gate to an output pin.
 
+        Gates that cannot reach a primary output whose value is still X are pruned using the
+        precomputed primary output reachability bitsets, and every gate is visited at most once.
+
         Args:
             gate (Gate): The gate to start the search from.
 
@@ -326,11 +2167,28 @@ class PODEM:
         if gate.type == "output_pin":
             return True
 
-        # Recursive case: If the gate has an X value and there is an X path from one of its output gates, return True
-        if gate.value == D_Value.X:
-            for output_gate in gate.output_gates:
-                if self.check_X_path(output_gate):
-                    return True
+        unresolved_outputs = self.unresolved_outputs
+        po_reach = self.po_reach
+        if gate.value != D_Value.X or not po_reach[gate] & unresolved_outputs:
+            return False
+
+        # Depth-first search over the gates with an X value
+        visited = {gate}
+        stack = [gate]
+        while stack:
+            current_gate = stack.pop()
+            for output_gate in current_gate.output_gates:
+                if output_gate in visited:
+                    continue
+                visited.add(output_gate)
+                if output_gate.type == "output_pin":
+                    if output_gate.value == D_Value.X:
+                        return True
+                elif (
+                    output_gate.value == D_Value.X
+                    and po_reach[output_gate] & unresolved_outputs
+                ):
+                    stack.append(output_gate)
 
         # If no X path is found, return False
         return False
@@ -348,8 +2206,7 @@ class PODEM:
 
                 primary_input.explored = True
                 # Imply new PI value
-                primary_input.value = value
-                self.imply(primary_input)
+                self.assign(primary_input, value)
                 # If error at a PO
                 # SUCCESS; Exit;
                 # self.circuit.print_circuit()
@@ -367,7 +2224,8 @@ class PODEM:
 
         The D frontier is a list of gates that are relevant to the fault detection process.
         These gates have input gates with a value of D or D' and have an X path from
-        one of their output gates.
+        one of their output gates. Such an input gate is on the assignment trail, so only
+        the output gates of the trail are checked instead of all the gates in the circuit.
 
         Returns:
             None
@@ -375,8 +2233,17 @@ class PODEM:
         # Initialize the D frontier list
         self.D_Frontier = []
 
-        # Iterate through all the gates in the circuit
-        for gate in self.circuit.gates.values():
+        # Candidate gates: the output gates in the cone of the gates whose value has changed
+        candidates = []
+        seen = set()
+        for changed_gate, _ in self.trail:
+            for gate in changed_gate.output_gates:
+                if gate not in seen and self.in_cone(gate):
+                    seen.add(gate)
+                    candidates.append(gate)
+
+        # Iterate through the candidate gates
+        for gate in candidates:
             # Check if the gate has an X value
             if gate.value == D_Value.X:
                 # Iterate through the input gates of the gate
@@ -424,8 +2291,7 @@ class PODEM:
         )
 
         # Imply the target primary input value
-        target_primary_input.value = target_primary_input_value
-        self.imply(target_primary_input)
+        self.assign(target_primary_input, target_primary_input_value)
         target_primary_input.explored = True
 
         return
@@ -510,12 +2376,12 @@ class PODEM:
             tuple: A tuple containing the objective gate and its value. If the fault is not activated or if the fault gate value is ONE or ZERO, then None is returned.
         """
 
-        # Check if the fault is activated
-        if (
+        # Check if the fault is activated (the flag follows the current values so that
+        # it is cleared when the activating assignments are undone)
+        self.fault_is_activated = (
             self.fault_gate.value == D_Value.D
             or self.fault_gate.value == D_Value.D_PRIME
-        ):
-            self.fault_is_activated = True
+        )
 
         # If the fault is not activated, check if the fault gate value is ONE or ZERO
         # (this indicates a fault that cannot be activated)
@@ -531,16 +2397,13 @@ class PODEM:
 
         else:
 
-            # Generate the D frontier
-            self.generate_d_frontier()
+            # Find the gate in the D frontier with the smallest CCb value
+            g = self.select_d_frontier_gate()
             # If the D frontier is empty, return None
             # (there is no way to uncover the fault)
-            if len(self.D_Frontier) == 0:
+            if g is None:
                 return None, None
 
-            # Find the gate in the D frontier with the smallest CCb value
-            g = min(self.D_Frontier, key=lambda gate: gate.CCb)
-
             objective_gate = None
             objective_value = None
             # Find the first input gate with X value
@@ -584,79 +2447,90 @@ class PODEM:
         target_PI = objective_gate
         target_PI_value = objective_value
 
-        # Traverse backward from the objective gate
+        # Traverse backward from the objective gate, one level per iteration, so the
+        # depth of the circuit is not bounded by the recursion limit
         while target_PI.type != "input_pin":
+            gate_value = target_PI_value
 
             # If the target_PI has an inversion parity, flip the target_PI_value
             if target_PI.inversion_parity:
                 target_PI_value = self.oppositeVal(target_PI_value)
 
             if self.check_imply_gate(target_PI, target_PI_value):
-                target_PI = self.get_hardest_to_satisfy_gate(
-                    objective_gate, objective_value
-                )
+                target_PI = self.get_hardest_to_satisfy_gate(target_PI, gate_value)
             else:
-                target_PI = self.get_easiest_to_satisfy_gate(
-                    objective_gate, objective_value
-                )
-
-            # Recursively call the function to traverse backward
-            target_PI, target_PI_value = self.backtrace_advanced(
-                target_PI, target_PI_value
-            )
+                target_PI = self.get_easiest_to_satisfy_gate(target_PI, gate_value)
 
         # Return the target primary input gate and value
         return target_PI, target_PI_value
 
     def advanced_PODEM(self):
         """
-        Recursively attempts to find a test vector that satisfies all the primary outputs of the circuit.
-
-        Returns:
-            bool: True if a test vector is found, False other
-            wise.
-        """
-        # Check if there is an error at the primary outputs
-        if self.check_error_at_primary_outputs():
-            return True
-
-        # Get the objective gate and its value
-        objective_gate, objective_value = self.get_objective()
+        Searches for a test vector that propagates the fault to a primary output.
 
-        # If no objective gate is found, return False
-        # It is not possible to find a test vector that uncovers the fault
-        if objective_gate is None:
-            return False
-
-        # Backtrace to find the primary input that affects the objective gate
-        target_PI, target_PI_value = self.backtrace_advanced(
-            objective_gate, objective_value
-        )
+        Every decision assigns a primary input and remembers the trail length before the
+        assignment. On a conflict, the search backtracks to the latest decision whose opposite
+        value has not been tried yet by undoing the trail down to that decision level.
 
-        # Set the value of the target primary input
-        target_PI.value = target_PI_value
+        The search is aborted when it exceeds the backtrack limit, the time limit of a fault,
+        or the time budget of the run.
 
-        # Imply the value to the target primary input
-        self.imply(target_PI)
+        Returns:
+            Fault_Status: DETECTED if a test vector is found, UNTESTABLE if the whole search
+            space is exhausted, and ABORTED if a limit is hit first.
+        """
+        # Decision stack of [primary input, value, trail mark, both values tried]
+        decisions = []
+        backtracks = 0
+
+        deadline = self.deadline
+        if self.fault_time_limit is not None:
+            fault_deadline = time.monotonic() + self.fault_time_limit
+            if deadline is None or fault_deadline < deadline:
+                deadline = fault_deadline
+
+        while True:
+            # Check if there is an error at the primary outputs
+            if self.check_error_at_primary_outputs():
+                return Fault_Status.DETECTED
+
+            if deadline is not None and time.monotonic() > deadline:
+                return Fault_Status.ABORTED
+
+            # Get the objective gate and its value
+            objective_gate, objective_value = self.get_objective()
+
+            if objective_gate is not None:
+                # Backtrace to find the primary input that affects the objective gate
+                target_PI, target_PI_value = self.backtrace_advanced(
+                    objective_gate, objective_value
+                )
 
-        # Recursively call advanced_PODEM
-        if self.advanced_PODEM():
-            return True
+                # Set the value of the target primary input and imply it
+                decisions.append([target_PI, target_PI_value, len(self.trail), False])
+                self.assign(target_PI, target_PI_value)
+                continue
 
-        # Backtracking
-        # If the first attempt fails, try the other possible value for the target primary input
-        target_PI_value = self.oppositeVal(target_PI_value)
-        self.imply(target_PI)
+            # Backtracking
+            # Release the primary inputs whose both values have been tried as unknown
+            while decisions and decisions[-1][3]:
+                self.undo(decisions.pop()[2])
 
-        if self.advanced_PODEM():
-            return True
+            # It is not possible to find a test vector that uncovers the fault
+            if not decisions:
+                return Fault_Status.UNTESTABLE
 
-        # Backtracking
-        # If both attempts fail, release the target primary input as unknown
-        target_PI_value = D_Value.X
-        self.imply(target_PI)
+            backtracks += 1
+            self.backtracks += 1
+            if self.backtrack_limit is not None and backtracks > self.backtrack_limit:
+                return Fault_Status.ABORTED
 
-        return False
+            # Try the other possible value for the latest primary input
+            decision = decisions[-1]
+            self.undo(decision[2])
+            decision[1] = self.oppositeVal(decision[1])
+            decision[3] = True
+            self.assign(decision[0], decision[1])
 
     def report(self):
         """
@@ -671,8 +2545,39 @@ class PODEM:
         total_faults = self.no_of_faults
         if total_faults == 0:
             self.fault_coverage = 0
+            self.fault_efficiency = 0
         else:
             self.fault_coverage = (self.uncovered_faults / total_faults) * 100
+            # Share of the faults that are resolved, either detected or proven untestable
+            self.fault_efficiency = (
+                (self.uncovered_faults + self.untestable_faults) / total_faults
+            ) * 100
+
+        if self.no_of_collapsed_faults == 0:
+            self.collapsed_fault_coverage = 0
+        else:
+            self.collapsed_fault_coverage = (
+                self.collapsed_detected / self.no_of_collapsed_faults
+            ) * 100
+
+        # Number of checkpoints and the time spent writing them
+        checkpoint_saves, checkpoint_time = 0, 0.0
+        if self.checkpoint is not None:
+            checkpoint_saves = self.checkpoint.saves
+            checkpoint_time = self.checkpoint.save_time
+
+        # Number of learned implications and the time spent learning them
+        learned_count, learning_time = 0, 0.0
+        if self.learning is not None:
+            learned_count = self.learning.implication_count
+            learning_time = self.learning.learn_time
+
+        # Coverage estimated from a fault sample
+        sample_report = ""
+        if self.sample_population:
+            sample_report = f"""
+        Sampled Faults          : {total_faults} of {self.sample_population} (stratified by {self.sample_strata})
+        Estimated Coverage      : {self.estimated_coverage:.2f}% ({SAMPLE_CONFIDENCE}% confidence interval {self.coverage_interval[0]:.2f}% - {self.coverage_interval[1]:.2f}%)"""
 
         # Gather statistics for the report
         total_cells = len(self.circuit.gates)
@@ -684,7 +2589,32 @@ class PODEM:
         Total Faults Tested     : {total_faults}
         Uncovered Faults        : {self.uncovered_faults}
         Failures                : {self.failures}
+          Untestable            : {self.untestable_faults}
+          Aborted               : {self.aborted_faults}
         Fault Coverage          : {self.fault_coverage:.2f}%
+        Fault Efficiency        : {self.fault_efficiency:.2f}%{sample_report}
+
+        Collapsed Faults        : {self.no_of_collapsed_faults}
+          Detected by Random    : {self.random_detected}
+          Detected by ATPG      : {self.atpg_detected}
+          Detected as Secondary : {self.secondary_detected} ({self.secondary_calls} targeted)
+          Detected by Fault Sim : {self.fault_sim_detected}
+          Untestable            : {self.collapsed_untestable}
+          Aborted               : {self.collapsed_aborted}
+        Collapsed Coverage      : {self.collapsed_fault_coverage:.2f}%
+        Missed Dominating Faults: {self.dominating_targeted} ({self.dominating_detected} detected)
+        Unobservable Faults     : {self.unobservable_faults}
+        PODEM Invocations       : {self.podem_calls}
+        Backtracks              : {self.backtracks}
+        Implication Events      : {self.implication_events}
+        Gate Evaluations        : {self.gate_evaluations}
+        Cone-Restricted Faults  : {self.cone_restricted_faults}
+        Static Learning         : {learned_count} implications ({learning_time:.4f} s), {self.learned_applied} applied
+        Partitions              : {self.partition_count} ({self.boundary_faults} boundary faults, {self.boundary_retargeted} targeted again)
+        Random Patterns         : {self.random_patterns} ({self.random_batches} batches)
+        Checkpoints             : {checkpoint_saves} ({checkpoint_time:.4f} s)
+        Test Patterns           : {self.no_of_patterns}
+          Before Compaction     : {self.patterns_before_compaction}
                                   
         ================== Circuit Details ==================
         Total Cells             : {total_cells}
@@ -695,4 +2625,144 @@ class PODEM:
         for gate_type, count in gate_types.items():
             report_str += f"                                  {gate_type}: {count}\n"
 
+        # Slowest PODEM searches, slowest first
+        if self.slowest_faults:
+            report_str += """
+        ================== Slowest Faults ==================
+"""
+            for seconds, fault, backtracks, status in sorted(
+                self.slowest_faults, key=lambda entry: entry[0], reverse=True
+            ):
+                report_str += (
+                    f"        {fault[0]} stuck-at-{fault[1]}: {seconds:.4f} s, "
+                    f"{backtracks} backtracks, {status.value}\n"
+                )
+
         return report_str
+
+
+# PODEM agent of a worker process, created once per worker by _init_worker()
+_worker_podem = None
+_worker_options = None
+
+# Circuit and settings of a worker process of a partitioned run, see _init_partition_worker()
+_partition_options = None
+
+
+def _init_worker(circuit, fault_simulation, fault_sim_batch, settings):
+    """
+    Initializes a worker process of a parallel run with its own PODEM agent.
+
+    Args:
+        circuit (Circuit): The circuit object, with SCOAP values already calculated.
+        fault_simulation (bool): Fault simulate the test vectors of every shard.
+        fault_sim_batch (int): The number of test vectors fault simulated together.
+        settings (dict): The search limits and test cube settings of the run, by PODEM
+                         attribute name.
+
+    Returns:
+        None
+    """
+    global _worker_podem, _worker_options
+    _worker_podem = _worker_agent(circuit, settings)
+    fault_simulator = FaultSimulator(circuit) if fault_simulation else None
+    _worker_options = (fault_simulator, fault_sim_batch)
+
+
+def _run_shard(shard):
+    """
+    Runs PODEM on a shard of faults in a worker process.
+
+    Args:
+        shard (list): The faults of the shard.
+
+    Returns:
+        tuple: The test vectors of the shard, the status of its faults, the counters of the
+               run, and the slowest PODEM searches of the shard.
+    """
+    podem = _worker_podem
+    fault_simulator, fault_sim_batch = _worker_options
+
+    # Counters of this shard only
+    for name in SHARD_COUNTERS:
+        setattr(podem, name, 0)
+    podem.slowest_faults = []
+
+    vectors, fault_status = podem.generate_tests(
+        shard, fault_simulator, fault_sim_batch, show_progress=False
+    )
+    counters = {name: getattr(podem, name) for name in SHARD_COUNTERS}
+
+    return vectors, fault_status, counters, podem.slowest_faults
+
+
+def _worker_agent(circuit, settings):
+    """
+    Creates the PODEM agent of a worker process.
+
+    Args:
+        circuit (Circuit): The circuit object, with SCOAP values already calculated.
+        settings (dict): The search limits and test cube settings of the run, by PODEM
+                         attribute name.
+
+    Returns:
+        PODEM: The PODEM agent, with every gate set to X.
+    """
+    podem = PODEM(circuit=circuit, output_file=None)
+    podem.reset_values()
+    for name, value in settings.items():
+        setattr(podem, name, value)
+    if podem.learning is not None:
+        podem.set_static_learning(podem.learning)
+
+    return podem
+
+
+def _init_partition_worker(circuit, fault_simulation, fault_sim_batch, settings):
+    """
+    Initializes a worker process of a partitioned run.
+
+    Args:
+        circuit (Circuit): The circuit object the partitions are extracted from.
+        fault_simulation (bool): Fault simulate the test vectors of every partition.
+        fault_sim_batch (int): The number of test vectors fault simulated together.
+        settings (dict): The search limits and test cube settings of the run, by PODEM
+                         attribute name.
+
+    Returns:
+        None
+    """
+    global _partition_options
+    _partition_options = (circuit, fault_simulation, fault_sim_batch, settings)
+
+
+def _run_partition(task):
+    """
+    Extracts a partition as a sub-circuit and runs PODEM on its faults.
+
+    Args:
+        task (tuple): The primary output indices of the partition, and its faults.
+
+    Returns:
+        tuple: The names of the primary inputs of the sub-circuit, its test vectors over
+               these inputs, the status of its faults, the counters of the run, and the
+               slowest PODEM searches of the partition.
+    """
+    outputs, faults = task
+    circuit, fault_simulation, fault_sim_batch, settings = _partition_options
+
+    compiled = circuit.compiled
+    subcircuit = circuit.extract_subcircuit(
+        [compiled.gates[compiled.primary_outputs[idx]] for idx in outputs]
+    )
+    subcircuit.calculate_SCOAP()
+
+    podem = _worker_agent(subcircuit, settings)
+    fault_simulator = FaultSimulator(subcircuit) if fault_simulation else None
+    vectors, fault_status = podem.generate_tests(
+        faults, fault_simulator, fault_sim_batch, show_progress=False
+    )
+    counters = {name: getattr(podem, name) for name in SHARD_COUNTERS}
+    input_names = [gate.outputpin for gate in subcircuit.primary_input_gates]
+
+    return input_names, vectors, fault_status, counters, podem.slowest_faults
@@ -0,0 +1,189 @@
+# Apache License
+# Version 2.0, January 2004
+# http://www.apache.org/licenses/
+
+# Copyright (c) 2024, Youssef Kandil (youssefkandil@aucegypt.edu) 
+#                     Mohamed Shalan (mshalan@aucegypt.edu)
+# 
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import math
+
+
+def popcount(bits):
+    """
+    Returns the number of bits set in a bitset.
+
+    Args:
+        bits (int): The bitset.
+
+    Returns:
+        int: The number of bits set.
+    """
+    return bin(bits).count("1")
+
+
+# int.bit_count() is much faster on the gate bitsets of large circuits (Python 3.10+)
+if hasattr(int, "bit_count"):
+    popcount = int.bit_count
+
+
+class Partitioner:
+    """
+    Groups the primary outputs of a circuit into clusters with overlapping fanin cones.
+
+    The fanin cone of every primary output is kept as a bitset of compiled gate ids. Each
+    cluster is extracted as a standalone sub-circuit (see Circuit.extract_subcircuit())
+    holding the transitive fanin of its outputs, so a fault is detected in the circuit by
+    the test vectors of a sub-circuit whose outputs it reaches.
+    """
+
+    def __init__(self, circuit):
+        """
+        Computes the fanin cone of every primary output of a compiled circuit.
+
+        Args:
+            circuit (Circuit): The circuit object representing the design.
+
+        Returns:
+            None
+        """
+        self.circuit = circuit
+        compiled = circuit.compiled
+
+        # Gate ids of every cone, built as one byte array per primary output
+        cone_bytes = [
+            bytearray((compiled.size + 7) // 8)
+            for _ in range(len(compiled.primary_outputs))
+        ]
+        for gid, reach in enumerate(compiled.po_reach):
+            while reach:
+                low_bit = reach & -reach
+                cone_bytes[low_bit.bit_length() - 1][gid >> 3] |= 1 << (gid & 7)
+                reach ^= low_bit
+
+        self.cones = [int.from_bytes(cone, "little") for cone in cone_bytes]
+        self.cone_sizes = [popcount(cone) for cone in self.cones]
+
+        return
+
+    def cluster_outputs(self, count):
+        """
+        Groups the primary outputs into at most 'count' clusters.
+
+        The clusters are seeded farthest first: the output with the largest cone, then
+        repeatedly the output whose cone shares the smallest fraction with the seeds. The
+        other outputs are added, largest cone first, to the cluster that already holds the
+        largest fraction of their cone, among the clusters with fewer than their share of
+        the outputs, so the clusters stay balanced and share as little logic as possible.
+
+        Args:
+            count (int): The number of clusters.
+
+        Returns:
+            list: The clusters, each a sorted list of primary output indices (bit positions
+                  of the po_reach bitsets).
+        """
+        cones = self.cones
+        sizes = self.cone_sizes
+        outputs = sorted(
+            (idx for idx in range(len(cones)) if sizes[idx]),
+            key=lambda idx: (-sizes[idx], idx),
+        )
+        count = max(1, min(count, len(outputs)))
+        if not outputs:
+            return []
+        capacity = math.ceil(len(outputs) / count)
+
+        # Farthest-first seeds
+        seeds = [outputs[0]]
+        # Largest fraction of the cone of every output shared with a seed
+        shared = {idx: 0.0 for idx in outputs}
+        while len(seeds) < count:
+            for idx in outputs:
+                shared[idx] = max(
+                    shared[idx], popcount(cones[idx] & cones[seeds[-1]]) / sizes[idx]
+                )
+            seeds.append(
+                min(
+                    (idx for idx in outputs if idx not in seeds),
+                    key=lambda idx: (shared[idx], -sizes[idx], idx),
+                )
+            )
+
+        clusters = [[seed] for seed in seeds]
+        cluster_cones = [cones[seed] for seed in seeds]
+        cluster_sizes = [sizes[seed] for seed in seeds]
+        seeded = set(seeds)
+        for idx in outputs:
+            if idx in seeded:
+                continue
+            best = None
+            best_key = None
+            for cluster_idx, cluster in enumerate(clusters):
+                if len(cluster) >= capacity:
+                    continue
+                key = (
+                    -popcount(cones[idx] & cluster_cones[cluster_idx]),
+                    cluster_sizes[cluster_idx],
+                    cluster_idx,
+                )
+                if best_key is None or key < best_key:
+                    best, best_key = cluster_idx, key
+            clusters[best].append(idx)
+            cluster_cones[best] |= cones[idx]
+            cluster_sizes[best] = popcount(cluster_cones[best])
+
+        return [sorted(cluster) for cluster in clusters]
+
+    def assign_faults(self, faults, clusters):
+        """
+        Assigns every fault to the cluster that holds the most of the outputs it reaches.
+
+        A fault that reaches outputs of other clusters as well is a boundary fault: its
+        cluster may miss a test that only observes it at the other outputs, so it must be
+        targeted again on the whole circuit if its cluster does not detect it.
+
+        Args:
+            faults (list): The faults to assign, as (net, stuck-at value) tuples.
+            clusters (list): The clusters of primary output indices, see cluster_outputs().
+
+        Returns:
+            tuple: The list of faults of every cluster, in the order of 'faults', the set of
+                   boundary faults, and the list of faults that reach no primary output.
+        """
+        compiled = self.circuit.compiled
+        po_reach = compiled.po_reach
+        index = compiled.index
+        cluster_outputs = [sum(1 << idx for idx in cluster) for cluster in clusters]
+
+        cluster_faults = [[] for _ in clusters]
+        boundary_faults = set()
+        unobservable_faults = []
+        for fault in faults:
+            reach = po_reach[index[fault[0]]]
+            if not reach:
+                unobservable_faults.append(fault)
+                continue
+
+            best = None
+            best_shared = 0
+            for cluster_idx, outputs in enumerate(cluster_outputs):
+                shared = popcount(reach & outputs)
+                if shared > best_shared:
+                    best, best_shared = cluster_idx, shared
+            cluster_faults[best].append(fault)
+            if reach & ~cluster_outputs[best]:
+                boundary_faults.add(fault)
+
+        return cluster_faults, boundary_faults, unobservable_faults
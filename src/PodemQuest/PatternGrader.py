@@ -0,0 +1,124 @@
+# Apache License
+# Version 2.0, January 2004
+# http://www.apache.org/licenses/
+
+# Copyright (c) 2024, Youssef Kandil (youssefkandil@aucegypt.edu) 
+#                     Mohamed Shalan (mshalan@aucegypt.edu)
+# 
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import argparse
+from .Circuit import Circuit
+from .FaultSimulator import FaultSimulator
+from .PatternWriter import PatternReader
+
+# Number of patterns fault simulated together
+GRADE_BATCH_SIZE = 64
+
+
+def grade_patterns(circuit, filename):
+    """
+    Fault simulates the patterns of a pattern file against every fault of a circuit.
+
+    The file is read one pattern at a time by PatternReader, and the faults are dropped
+    as soon as a pattern detects them, so the memory does not depend on the number of
+    patterns.
+
+    Args:
+        circuit (Circuit): The circuit object representing the design.
+        filename (str): The path of a pattern file in any of the PATTERN_FORMATS.
+
+    Returns:
+        tuple: The number of patterns, and the set of detected faults.
+
+    Raises:
+        ValueError: If the primary inputs listed in the file or the width of a pattern
+                    do not match the circuit.
+    """
+    reader = PatternReader(filename)
+    input_names = [gate.outputpin for gate in circuit.primary_input_gates]
+    if reader.input_names is not None and reader.input_names != input_names:
+        raise ValueError(f"The primary inputs of {filename} do not match the circuit")
+
+    fault_simulator = FaultSimulator(circuit)
+    remaining_faults = list(circuit.faults)
+    detected_faults = set()
+
+    def simulate(patterns):
+        detections = fault_simulator.simulate(patterns, remaining_faults)
+        detected_faults.update(detections)
+        remaining_faults[:] = [
+            fault for fault in remaining_faults if fault not in detections
+        ]
+
+    no_of_patterns = 0
+    patterns = []
+    for pattern in reader:
+        no_of_patterns += 1
+        if len(pattern) != len(input_names):
+            raise ValueError(
+                f"Pattern {no_of_patterns} of {filename} has {len(pattern)} bits, "
+                f"not {len(input_names)}"
+            )
+        patterns.append(pattern)
+        if len(patterns) == GRADE_BATCH_SIZE:
+            simulate(patterns)
+            patterns = []
+    simulate(patterns)
+
+    return no_of_patterns, detected_faults
+
+
+def main(argv=None):
+    """
+    Fault grades a pattern file: podemquest grade [options].
+
+    Args:
+        argv (list): The command line arguments. Defaults to None, which uses sys.argv.
+
+    Returns:
+        int: 0.
+    """
+    parser = argparse.ArgumentParser(
+        prog="podemquest grade",
+        description="Fault simulate a pattern file and report its fault coverage.",
+    )
+    parser.add_argument(
+        "-i",
+        "--input_file",
+        type=str,
+        required=True,
+        help="The bench file of the circuit",
+    )
+    parser.add_argument(
+        "-p",
+        "--pattern_file",
+        type=str,
+        required=True,
+        help="The pattern file, in any of the output formats",
+    )
+
+    args = parser.parse_args(argv)
+    circuit = Circuit(args.input_file)
+    try:
+        no_of_patterns, detected_faults = grade_patterns(circuit, args.pattern_file)
+    except ValueError as error:
+        parser.error(str(error))
+
+    no_of_faults = len(circuit.faults)
+    coverage = len(detected_faults) / no_of_faults * 100 if no_of_faults else 0.0
+    print(f"Test Patterns           : {no_of_patterns}")
+    print(f"Detected Faults         : {len(detected_faults)} of {no_of_faults}")
+    print(f"Fault Coverage          : {coverage:.2f}%")
+
+    return 0
@@ -0,0 +1,419 @@
+# Apache License
+# Version 2.0, January 2004
+# http://www.apache.org/licenses/
+
+# Copyright (c) 2024, Youssef Kandil (youssefkandil@aucegypt.edu) 
+#                     Mohamed Shalan (mshalan@aucegypt.edu)
+# 
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import queue
+import struct
+import threading
+
+# Formats of the test pattern file
+PATTERN_FORMATS = ("text", "stil", "binary")
+
+# Header of the text format, unchanged from the first versions of the tool
+TEXT_HEADER = """* Test pattern file
+            * generated by PodemQuest
+"""
+
+# First bytes of the binary format, followed by the format version
+BINARY_MAGIC = b"PQPAT"
+BINARY_VERSION = 1
+
+# Number of patterns encoded and written together by the writer thread
+PATTERN_BUFFER_SIZE = 4096
+
+# Number of pattern buffers waiting for the writer thread before write() blocks
+PATTERN_QUEUE_SIZE = 4
+
+
+class PatternWriter:
+    """
+    Streaming writer of a test pattern file.
+
+    Patterns are collected into buffers of PATTERN_BUFFER_SIZE patterns, and every full
+    buffer is handed to a background thread that encodes it and writes it to the file. The
+    queue of buffers is bounded, so the memory of the writer does not depend on the number
+    of patterns, and the patterns written so far are on disk if the run stops early.
+
+    The file is written in one of the PATTERN_FORMATS:
+
+    - text: the numbered patterns of the first versions of the tool, optionally preceded
+      by comment lines listing the primary inputs and outputs.
+    - stil: a STIL-like ASCII file with the signals, their groups and one V statement per
+      pattern.
+    - binary: the names of the primary inputs and outputs, then one bit per primary input
+      and ceil(inputs / 8) bytes per pattern.
+    """
+
+    def __init__(
+        self,
+        filename,
+        input_names,
+        output_names,
+        format="text",
+        header=False,
+        buffer_size=PATTERN_BUFFER_SIZE,
+    ):
+        """
+        Initializes a PatternWriter object and starts its writer thread.
+
+        Args:
+            filename (str): The path of the pattern file.
+            input_names (list): The names of the primary inputs, in pattern order.
+            output_names (list): The names of the primary outputs.
+            format (str): One of PATTERN_FORMATS. Defaults to "text".
+            header (bool): List the primary inputs and outputs in the text format; the
+                           other formats always list them. Defaults to False.
+            buffer_size (int): The number of patterns written together. Defaults to
+                               PATTERN_BUFFER_SIZE.
+
+        Returns:
+            None
+        """
+        if format not in PATTERN_FORMATS:
+            raise ValueError(f"Unknown pattern format '{format}'")
+
+        self.filename = filename
+        self.input_names = list(input_names)
+        self.output_names = list(output_names)
+        self.format = format
+        self.header = header
+        self.buffer_size = buffer_size
+
+        # Number of patterns written so far
+        self.count = 0
+
+        self.buffer = []
+        self.queue = queue.Queue(PATTERN_QUEUE_SIZE)
+        # Exception raised by the writer thread, re-raised by write() and close()
+        self.error = None
+        self.thread = threading.Thread(target=self.run, daemon=True)
+        self.thread.start()
+
+        return
+
+    def write(self, pattern):
+        """
+        Adds a pattern to the file.
+
+        Args:
+            pattern (str): The pattern, one '0'/'1' character per primary input.
+
+        Returns:
+            None
+        """
+        self.buffer.append(pattern)
+        self.count += 1
+        if len(self.buffer) >= self.buffer_size:
+            self.flush()
+
+        return
+
+    def flush(self):
+        """
+        Hands the buffered patterns to the writer thread.
+
+        Returns:
+            None
+        """
+        if self.error is not None:
+            raise self.error
+        if self.buffer:
+            self.queue.put(self.buffer)
+            self.buffer = []
+
+        return
+
+    def close(self):
+        """
+        Writes the buffered patterns, waits for the writer thread and closes the file.
+
+        Returns:
+            int: The number of patterns written.
+        """
+        if self.thread is None:
+            return self.count
+
+        # A failed writer thread drains the queue until it gets the end marker, so the
+        # buffer is handed over without the error check of flush()
+        if self.buffer:
+            self.queue.put(self.buffer)
+            self.buffer = []
+        self.queue.put(None)
+        self.thread.join()
+        self.thread = None
+        if self.error is not None:
+            raise self.error
+
+        return self.count
+
+    def run(self):
+        """
+        Encodes and writes the pattern buffers until close() is called, in the writer thread.
+
+        Returns:
+            None
+        """
+        try:
+            mode = "wb" if self.format == "binary" else "w"
+            with open(self.filename, mode) as f:
+                f.write(self.encode_header())
+                index = 1
+                while True:
+                    patterns = self.queue.get()
+                    if patterns is None:
+                        break
+                    f.write(self.encode_patterns(patterns, index))
+                    index += len(patterns)
+                f.write(self.encode_footer())
+        except Exception as error:
+            self.error = error
+            # Keep draining the queue, so write() never blocks on a dead thread
+            while self.queue.get() is not None:
+                pass
+
+        return
+
+    def encode_header(self):
+        """
+        Returns the beginning of the file, before the first pattern.
+
+        Returns:
+            str or bytes: The header in the format of the file.
+        """
+        if self.format == "text":
+            header = TEXT_HEADER
+            if self.header:
+                header += f"* inputs: {' '.join(self.input_names)}\n"
+                header += f"* outputs: {' '.join(self.output_names)}\n"
+            return header
+
+        if self.format == "stil":
+            signals = [f'    "{name}" In;\n' for name in self.input_names]
+            signals += [f'    "{name}" Out;\n' for name in self.output_names]
+            inputs = " + ".join(f'"{name}"' for name in self.input_names)
+            outputs = " + ".join(f'"{name}"' for name in self.output_names)
+            return (
+                'STIL 1.0;\n\nHeader {\n    Source "PodemQuest";\n}\n\n'
+                f"Signals {{\n{''.join(signals)}}}\n\n"
+                f"SignalGroups {{\n    \"_pi\" = '{inputs}';\n"
+                f"    \"_po\" = '{outputs}';\n}}\n\n"
+                'Pattern "podemquest" {\n'
+            )
+
+        header = BINARY_MAGIC + struct.pack(
+            "<BII", BINARY_VERSION, len(self.input_names), len(self.output_names)
+        )
+        for name in self.input_names + self.output_names:
+            encoded = name.encode()
+            header += struct.pack("<H", len(encoded)) + encoded
+        return header
+
+    def encode_patterns(self, patterns, index):
+        """
+        Encodes a buffer of patterns.
+
+        Args:
+            patterns (list): The patterns.
+            index (int): The number of the first pattern, from 1.
+
+        Returns:
+            str or bytes: The patterns in the format of the file.
+        """
+        if self.format == "text":
+            return "".join(
+                f"{index + offset}: {pattern}\n"
+                for offset, pattern in enumerate(patterns)
+            )
+
+        if self.format == "stil":
+            return "".join(
+                f'    "{index + offset}": V {{ "_pi" = {pattern}; }}\n'
+                for offset, pattern in enumerate(patterns)
+            )
+
+        no_of_bytes = (len(self.input_names) + 7) // 8
+        if no_of_bytes == 0:
+            return b""
+        return b"".join(
+            int(pattern, 2).to_bytes(no_of_bytes, "big") for pattern in patterns
+        )
+
+    def encode_footer(self):
+        """
+        Returns the end of the file, after the last pattern.
+
+        Returns:
+            str or bytes: The footer in the format of the file.
+        """
+        if self.format == "stil":
+            return "}\n"
+        if self.format == "binary":
+            return b""
+        return ""
+
+
+class PatternReader:
+    """
+    Streaming reader of a test pattern file written by PatternWriter.
+
+    The format is detected from the beginning of the file. The names of the primary inputs
+    and outputs are read when the file is opened (they are None for a text file without
+    header), and the patterns are read lazily by iterating over the reader.
+    """
+
+    def __init__(self, filename):
+        """
+        Initializes a PatternReader object and reads the header of the file.
+
+        Args:
+            filename (str): The path of the pattern file.
+
+        Returns:
+            None
+        """
+        self.filename = filename
+        self.input_names = None
+        self.output_names = None
+
+        with open(filename, "rb") as f:
+            start = f.read(len(BINARY_MAGIC))
+            if start == BINARY_MAGIC:
+                self.format = "binary"
+                self.read_binary_header(f)
+            elif start.startswith(b"STIL"):
+                self.format = "stil"
+            else:
+                self.format = "text"
+
+        if self.format != "binary":
+            self.read_text_header()
+
+        return
+
+    def read_text_header(self):
+        """
+        Reads the names of the primary inputs and outputs of a text or STIL file.
+
+        Only the lines before the first pattern are read.
+
+        Returns:
+            None
+        """
+        with open(self.filename, "r") as f:
+            if self.format == "text":
+                for line in f:
+                    line = line.strip()
+                    if line.startswith("* inputs:"):
+                        self.input_names = line.split(":", 1)[1].split()
+                    elif line.startswith("* outputs:"):
+                        self.output_names = line.split(":", 1)[1].split()
+                    elif line and not line.startswith("*"):
+                        break
+                return
+
+            # "name" In; or "name" Out; in the Signals block
+            self.input_names = []
+            self.output_names = []
+            for line in f:
+                line = line.strip()
+                if line.startswith("Pattern"):
+                    break
+                if line.startswith('"') and line.endswith((" In;", " Out;")):
+                    name, direction = line.rsplit(" ", 1)
+                    names = self.input_names if direction == "In;" else self.output_names
+                    names.append(name.strip('"'))
+
+        return
+
+    def read_binary_header(self, f):
+        """
+        Reads the names of the primary inputs and outputs of a binary file.
+
+        Args:
+            f (file): The file, positioned after BINARY_MAGIC.
+
+        Returns:
+            None
+        """
+        version, no_of_inputs, no_of_outputs = struct.unpack("<BII", f.read(9))
+        if version != BINARY_VERSION:
+            raise ValueError(
+                f"Unsupported binary pattern format version {version} in {self.filename}"
+            )
+
+        names = []
+        for _ in range(no_of_inputs + no_of_outputs):
+            (length,) = struct.unpack("<H", f.read(2))
+            names.append(f.read(length).decode())
+        self.input_names = names[:no_of_inputs]
+        self.output_names = names[no_of_inputs:]
+        # Offset of the first pattern
+        self.data_offset = f.tell()
+
+        return
+
+    def __iter__(self):
+        """
+        Yields the patterns of the file in order.
+
+        Returns:
+            Iterator[str]: The patterns, one '0'/'1' character per primary input.
+        """
+        if self.format == "binary":
+            return self.iter_binary()
+        return self.iter_text()
+
+    def iter_binary(self):
+        """
+        Yields the patterns of a binary file, reading PATTERN_BUFFER_SIZE patterns at a time.
+
+        Returns:
+            Iterator[str]: The patterns.
+        """
+        no_of_inputs = len(self.input_names)
+        no_of_bytes = (no_of_inputs + 7) // 8
+        if no_of_bytes == 0:
+            return
+
+        with open(self.filename, "rb") as f:
+            f.seek(self.data_offset)
+            while True:
+                data = f.read(no_of_bytes * PATTERN_BUFFER_SIZE)
+                if not data:
+                    break
+                for start in range(0, len(data), no_of_bytes):
+                    value = int.from_bytes(data[start : start + no_of_bytes], "big")
+                    yield format(value, f"0{no_of_inputs}b")
+
+    def iter_text(self):
+        """
+        Yields the patterns of a text or STIL file, one line at a time.
+
+        Returns:
+            Iterator[str]: The patterns.
+        """
+        stil = self.format == "stil"
+        with open(self.filename, "r") as f:
+            for line in f:
+                line = line.strip()
+                if stil:
+                    # "n": V { "_pi" = 0101; }
+                    if ": V {" in line:
+                        yield line.split("=", 1)[1].split(";", 1)[0].strip()
+                elif line and not line.startswith("*"):
+                    yield line.split(":", 1)[1].strip()
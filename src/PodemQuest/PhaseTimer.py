@@ -0,0 +1,93 @@
+# Apache License
+# Version 2.0, January 2004
+# http://www.apache.org/licenses/
+
+# Copyright (c) 2024, Youssef Kandil (youssefkandil@aucegypt.edu) 
+#                     Mohamed Shalan (mshalan@aucegypt.edu)
+# 
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import time
+from contextlib import contextmanager
+
+
+class PhaseTimer:
+    """
+    Wall time of the phases of a run.
+
+    Phases are timed with perf_counter() and may be nested: the time spent in an inner
+    phase is only counted for the inner phase, so the times of all phases add up to the
+    timed part of the run. A phase entered several times accumulates its time.
+    """
+
+    def __init__(self):
+        """
+        Initializes a PhaseTimer object.
+
+        Returns:
+            None
+        """
+        # Seconds spent in every phase, in the order the phases are first entered
+        self.times = {}
+
+        # Stack of [phase, start time, seconds spent in inner phases]
+        self.stack = []
+
+        return
+
+    @contextmanager
+    def phase(self, name):
+        """
+        Times a phase of the run.
+
+        Args:
+            name (str): The name of the phase.
+
+        Returns:
+            None
+        """
+        self.times.setdefault(name, 0.0)
+        entry = [name, time.perf_counter(), 0.0]
+        self.stack.append(entry)
+        try:
+            yield
+        finally:
+            elapsed = time.perf_counter() - entry[1]
+            self.stack.pop()
+            self.times[name] += elapsed - entry[2]
+            if self.stack:
+                self.stack[-1][2] += elapsed
+
+    def total(self):
+        """
+        Returns the time spent in all phases.
+
+        Returns:
+            float: The number of seconds.
+        """
+        return sum(self.times.values())
+
+    def report(self):
+        """
+        Generates the phase time breakdown of the run.
+
+        Returns:
+            str: One line per phase with its time and share of the total time.
+        """
+        total = self.total()
+        report_str = ""
+        for name, seconds in self.times.items():
+            share = seconds / total * 100 if total > 0 else 0.0
+            report_str += f"        {name:<24}: {seconds:.4f} s ({share:.1f}%)\n"
+
+        return report_str
@@ -20,12 +20,37 @@
 #!/usr/bin/env python3
 
 import argparse
+import cProfile
+import io
+import math
+import pstats
+import sys
 import time
 from .PODEM import PODEM
 from .Circuit import Circuit
+from .CircuitCache import default_cache_dir
+from .Checkpoint import Checkpoint, CheckpointError, CHECKPOINT_INTERVAL
+from .PatternWriter import PATTERN_FORMATS
+from .PhaseTimer import PhaseTimer
+from .ProgressReporter import ProgressReporter, PROGRESS_INTERVAL
+
+# Number of functions listed in the report of a profiled run
+PROFILE_LINES = 25
 
 
 def main():
+    # The benchmark suite has its own arguments: podemquest bench [options]
+    if len(sys.argv) > 1 and sys.argv[1] == "bench":
+        from .Benchmark import main as bench_main
+
+        sys.exit(bench_main(sys.argv[2:]))
+
+    # Fault grading of an existing pattern file: podemquest grade [options]
+    if len(sys.argv) > 1 and sys.argv[1] == "grade":
+        from .PatternGrader import main as grade_main
+
+        sys.exit(grade_main(sys.argv[2:]))
+
     # Initialize the argument parser
     parser = argparse.ArgumentParser(description="Run PODEM on a specified input file.")
 
@@ -52,33 +77,318 @@ def main():
         default=None,
     )
 
+    parser.add_argument(
+        "--no_fault_sim",
+        action="store_true",
+        help="Disable fault simulation and fault dropping after each test vector",
+    )
+    parser.add_argument(
+        "--no_collapse",
+        action="store_true",
+        help="Target every fault instead of the collapsed fault list",
+    )
+    parser.add_argument(
+        "-j",
+        "--jobs",
+        type=int,
+        help="Shard the faults over this number of worker processes",
+        default=None,
+    )
+    parser.add_argument(
+        "--partitions",
+        type=int,
+        help="Split the circuit into this number of output-cone partitions run independently",
+        default=None,
+    )
+    parser.add_argument(
+        "--fault_sim_batch",
+        type=int,
+        help="The number of test vectors fault simulated together",
+        default=1,
+    )
+    parser.add_argument(
+        "--backtrack_limit",
+        type=int,
+        help="Abort a fault after this number of backtracks (0 disables the limit)",
+        default=1000,
+    )
+    parser.add_argument(
+        "--fault_time_limit",
+        type=float,
+        help="Abort a fault after this number of seconds",
+        default=None,
+    )
+    parser.add_argument(
+        "--time_budget",
+        type=float,
+        help="Stop targeting new faults after this number of seconds",
+        default=None,
+    )
+    parser.add_argument(
+        "--random_patterns",
+        action="store_true",
+        help="Detect the random pattern testable faults with random vectors before PODEM",
+    )
+    parser.add_argument(
+        "--random_threshold",
+        type=float,
+        help="Stop the random pattern phase when a batch detects less than this fraction of the faults left",
+        default=0.01,
+    )
+    parser.add_argument(
+        "--random_seed",
+        type=int,
+        help="The seed of the random test vectors",
+        default=0,
+    )
+    parser.add_argument(
+        "--no_compaction",
+        action="store_true",
+        help="Keep every generated test vector instead of compacting the test set",
+    )
+    parser.add_argument(
+        "--compaction_orders",
+        type=int,
+        help="The number of random vector orders tried by compaction after the reverse order",
+        default=0,
+    )
+    parser.add_argument(
+        "--secondary_faults",
+        type=int,
+        help="The number of secondary faults targeted under the test cube of every detected fault",
+        default=0,
+    )
+    parser.add_argument(
+        "--x_fill",
+        type=str,
+        choices=["zero", "random"],
+        help="How the X values left in the test cubes are filled",
+        default="zero",
+    )
+    parser.add_argument(
+        "--implication",
+        type=str,
+        choices=["event", "recursive"],
+        help="The implication engine: level-ordered events or the recursive traversal",
+        default="event",
+    )
+    parser.add_argument(
+        "--no_cone",
+        action="store_true",
+        help="Imply every assignment on the whole circuit instead of the cone of influence of the fault",
+    )
+    parser.add_argument(
+        "--static_learning",
+        action="store_true",
+        help="Learn the indirect implications of the circuit before the search and apply them during implication",
+    )
+    parser.add_argument(
+        "-q",
+        "--quiet",
+        action="store_true",
+        help="Do not print the progress of the run",
+    )
+    parser.add_argument(
+        "--progress_json",
+        type=str,
+        help="Write the progress of the run to this file as JSON lines",
+    )
+    parser.add_argument(
+        "--progress_interval",
+        type=float,
+        help="The minimum number of seconds between two progress updates",
+        default=PROGRESS_INTERVAL,
+    )
+    parser.add_argument(
+        "--no_cache",
+        action="store_true",
+        help="Parse the input file and calculate SCOAP without the circuit cache",
+    )
+    parser.add_argument(
+        "--cache_dir",
+        type=str,
+        help="The directory of the circuit cache",
+        default=default_cache_dir(),
+    )
+    parser.add_argument(
+        "--pattern_format",
+        type=str,
+        choices=PATTERN_FORMATS,
+        help="The format of the output file: numbered text, STIL-like ASCII or bit-packed binary",
+        default="text",
+    )
+    parser.add_argument(
+        "--pattern_header",
+        action="store_true",
+        help="List the primary inputs and outputs at the top of a text output file",
+    )
+    parser.add_argument(
+        "--sample",
+        type=int,
+        help="Estimate the fault coverage from a random sample of this number of faults",
+        default=None,
+    )
+    parser.add_argument(
+        "--sample_fraction",
+        type=float,
+        help="Estimate the fault coverage from a random sample of this fraction of the faults",
+        default=None,
+    )
+    parser.add_argument(
+        "--sample_strata",
+        type=str,
+        choices=["type", "level"],
+        help="Stratify the fault sample by gate type or by logic level",
+        default="type",
+    )
+    parser.add_argument(
+        "--checkpoint",
+        type=str,
+        help="Periodically save the progress of the run to this file",
+        default=None,
+    )
+    parser.add_argument(
+        "--checkpoint_interval",
+        type=float,
+        help="The minimum number of seconds between two checkpoints",
+        default=CHECKPOINT_INTERVAL,
+    )
+    parser.add_argument(
+        "--resume",
+        action="store_true",
+        help="Resume the run from the --checkpoint file, if it exists",
+    )
+    parser.add_argument(
+        "--profile",
+        type=str,
+        help="Run under cProfile and dump the statistics to this file",
+        default=None,
+    )
+    parser.add_argument(
+        "--slowest_faults",
+        type=int,
+        help="Time every PODEM search and report this number of the slowest faults",
+        default=0,
+    )
+
     ## Parse arguments
     args = parser.parse_args()
+    if args.resume and not args.checkpoint:
+        parser.error("--resume requires --checkpoint")
+    if args.sample is not None and args.sample_fraction is not None:
+        parser.error("--sample and --sample_fraction are mutually exclusive")
+    if args.sample is not None and args.sample < 1:
+        parser.error("--sample must be at least 1")
+    if args.sample_fraction is not None and not 0 < args.sample_fraction <= 1:
+        parser.error("--sample_fraction must be in (0, 1]")
+    if args.jobs is not None and args.jobs < 1:
+        parser.error("--jobs must be at least 1")
+    if args.partitions is not None and args.partitions < 1:
+        parser.error("--partitions must be at least 1")
+    if args.fault_sim_batch < 1:
+        parser.error("--fault_sim_batch must be at least 1")
+    if args.slowest_faults < 0:
+        parser.error("--slowest_faults must be at least 0")
+    if args.backtrack_limit < 0:
+        parser.error("--backtrack_limit must be at least 0")
+    if args.progress_interval < 0:
+        parser.error("--progress_interval must be at least 0")
+    if args.checkpoint_interval < 0:
+        parser.error("--checkpoint_interval must be at least 0")
     input_file = args.input_file
     output_file = args.output_file
     report_file = args.report_file
 
+    # Wall time of every phase of the run
+    timer = PhaseTimer()
+
+    checkpoint = None
+    if args.checkpoint:
+        checkpoint = Checkpoint(args.checkpoint, interval=args.checkpoint_interval)
+
+    # Progress updates, with no per-fault work at all in quiet mode without a JSON file
+    progress = None
+    if not args.quiet or args.progress_json:
+        progress = ProgressReporter(
+            stream=None if args.quiet else sys.stdout,
+            json_file=args.progress_json,
+            interval=args.progress_interval,
+        )
+
+    # Start timing the run
+    start_time = time.perf_counter()
+
+    profiler = None
+    if args.profile:
+        profiler = cProfile.Profile()
+        profiler.enable()
+
     # Create Circuit object from the input file
-    circuit = Circuit(input_file)
+    circuit = Circuit(
+        input_file,
+        cache_dir=None if args.no_cache else args.cache_dir,
+        timer=timer,
+    )
 
-    # Create PODEM agent and pass the circuit
-    podem_agent = PODEM(circuit=circuit, output_file=output_file)
+    # Size of the fault sample, if any
+    fault_sample = args.sample
+    if args.sample_fraction is not None:
+        fault_sample = max(1, math.ceil(args.sample_fraction * len(circuit.faults)))
 
-    # Start timing the PODEM computation
-    start_time = time.time()
+    # Create PODEM agent and pass the circuit
+    podem_agent = PODEM(circuit=circuit, output_file=output_file, timer=timer)
 
     # Compute the PODEM algorithm
-    podem_agent.compute(algorithm="advanced")
+    try:
+        podem_agent.compute(
+            algorithm="advanced",
+            fault_simulation=not args.no_fault_sim,
+            fault_sim_batch=args.fault_sim_batch,
+            collapse_faults=not args.no_collapse,
+            jobs=args.jobs,
+            partitions=args.partitions,
+            backtrack_limit=args.backtrack_limit or None,
+            fault_time_limit=args.fault_time_limit,
+            time_budget=args.time_budget,
+            random_patterns=args.random_patterns,
+            random_threshold=args.random_threshold,
+            random_seed=args.random_seed,
+            compaction=not args.no_compaction,
+            compaction_orders=args.compaction_orders,
+            secondary_faults=args.secondary_faults,
+            x_fill=args.x_fill,
+            implication=args.implication,
+            cone_restriction=not args.no_cone,
+            static_learning=args.static_learning,
+            progress=progress,
+            slowest_faults=args.slowest_faults,
+            pattern_format=args.pattern_format,
+            pattern_header=args.pattern_header,
+            checkpoint=checkpoint,
+            resume=args.resume,
+            fault_sample=fault_sample,
+            sample_strata=args.sample_strata,
+        )
+    except CheckpointError as error:
+        # The checkpoint cannot be resumed by this run
+        parser.error(str(error))
+    if progress is not None:
+        progress.close()
+
+    # Generate the PODEM report
+    with timer.phase("report"):
+        report = podem_agent.report()
+
+    if profiler is not None:
+        profiler.disable()
+        profiler.dump_stats(args.profile)
 
     # End timing
-    end_time = time.time()
+    end_time = time.perf_counter()
 
     # Calculate total time taken
     total_time = end_time - start_time
 
-    # Generate the PODEM report
-    report = podem_agent.report()
-
     # Combine time taken with the report
     combined_report = f"""
     ================== PODEM Fault Coverage Report ==================
@@ -86,11 +396,23 @@ def main():
         {report.strip()}
 
     ------------------------------------------------------------------
+    Phase Times:
+{timer.report()}
     Total Time Taken: {total_time:.4f} seconds
 
     ==================================================================
     """
 
+    # The functions with the largest cumulative time of a profiled run
+    if profiler is not None:
+        stream = io.StringIO()
+        stats = pstats.Stats(args.profile, stream=stream)
+        stats.sort_stats("cumulative").print_stats(PROFILE_LINES)
+        combined_report += f"""
+    ================== Profile ({args.profile}) ==================
+{stream.getvalue()}
+    """
+
     # Optionally print the report to the console
     # print(combined_report)
 
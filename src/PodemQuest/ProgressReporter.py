@@ -0,0 +1,179 @@
+# Apache License
+# Version 2.0, January 2004
+# http://www.apache.org/licenses/
+
+# Copyright (c) 2024, Youssef Kandil (youssefkandil@aucegypt.edu) 
+#                     Mohamed Shalan (mshalan@aucegypt.edu)
+# 
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import json
+import sys
+import time
+
+# Minimum number of seconds between two progress updates
+PROGRESS_INTERVAL = 0.5
+
+
+class ProgressReporter:
+    """
+    Throttled progress of a PODEM run.
+
+    The run calls update() as often as it likes, but a progress record is only emitted when
+    the interval has elapsed since the previous one, so the cost of a call that emits
+    nothing is a single clock read. Every record holds the faults done so far, the faults
+    per second, the estimated time left, the fault coverage and the number of patterns. It
+    is printed as one line on the console stream and/or written as one JSON object per
+    line to a file.
+    """
+
+    def __init__(self, stream=sys.stdout, json_file=None, interval=PROGRESS_INTERVAL):
+        """
+        Initializes a ProgressReporter object.
+
+        Args:
+            stream (file): The console stream of the progress lines, or None to print nothing.
+                           Defaults to sys.stdout.
+            json_file (str): The path of the JSON lines file, or None to write no file.
+                             Defaults to None.
+            interval (float): The minimum number of seconds between two progress records.
+                              Defaults to PROGRESS_INTERVAL.
+
+        Returns:
+            None
+        """
+        self.stream = stream
+        self.json_stream = None
+        if json_file is not None:
+            # Line buffered, so every record is visible as soon as it is written
+            self.json_stream = open(json_file, "w", buffering=1)
+        self.interval = interval
+
+        self.phase = None
+        self.total = 0
+        self.coverage_total = 0
+        self.base_detected = 0
+        self.base_patterns = 0
+        self.start_time = 0
+        self.next_update = 0
+
+        return
+
+    def start(self, phase, total, coverage_total, detected=0, patterns=0):
+        """
+        Starts a new phase of the run.
+
+        Args:
+            phase (str): The name of the phase.
+            total (int): The number of faults handled by the phase.
+            coverage_total (int): The number of faults the coverage is computed over.
+            detected (int): The faults detected before the phase. Defaults to 0.
+            patterns (int): The patterns generated before the phase. Defaults to 0.
+
+        Returns:
+            None
+        """
+        self.phase = phase
+        self.total = total
+        self.coverage_total = coverage_total
+        self.base_detected = detected
+        self.base_patterns = patterns
+        self.start_time = time.monotonic()
+        self.next_update = self.start_time + self.interval
+
+        return
+
+    def update(self, done, detected, patterns, final=False):
+        """
+        Emits a progress record if the interval has elapsed since the previous one.
+
+        Args:
+            done (int): The faults of the phase resolved so far.
+            detected (int): The faults detected by the phase so far.
+            patterns (int): The patterns generated by the phase so far.
+            final (bool): Emit the record regardless of the interval, at the end of the
+                          phase. Defaults to False.
+
+        Returns:
+            None
+        """
+        now = time.monotonic()
+        if not final and now < self.next_update:
+            return
+        self.next_update = now + self.interval
+
+        elapsed = now - self.start_time
+        rate = done / elapsed if elapsed > 0 else 0.0
+        eta = (self.total - done) / rate if rate > 0 else None
+        detected += self.base_detected
+        patterns += self.base_patterns
+        if self.coverage_total:
+            coverage = detected / self.coverage_total * 100
+        else:
+            coverage = 0.0
+
+        if self.stream is not None:
+            percentage = done / self.total * 100 if self.total else 100.0
+            eta_str = "--:--:--" if eta is None else _format_seconds(eta)
+            self.stream.write(
+                f"{self.phase}: {done} / {self.total} faults ({percentage:.2f}%), "
+                f"{rate:.1f} faults/s, ETA {eta_str}, coverage {coverage:.2f}%, "
+                f"{patterns} patterns\n"
+            )
+            self.stream.flush()
+
+        if self.json_stream is not None:
+            record = {
+                "time": time.time(),
+                "phase": self.phase,
+                "done": done,
+                "total": self.total,
+                "elapsed": round(elapsed, 3),
+                "faults_per_second": round(rate, 3),
+                "eta": None if eta is None else round(eta, 3),
+                "detected": detected,
+                "coverage": round(coverage, 4),
+                "patterns": patterns,
+                "final": final,
+            }
+            self.json_stream.write(json.dumps(record) + "\n")
+
+        return
+
+    def close(self):
+        """
+        Closes the JSON lines file.
+
+        Returns:
+            None
+        """
+        if self.json_stream is not None:
+            self.json_stream.close()
+            self.json_stream = None
+
+        return
+
+
+def _format_seconds(seconds):
+    """
+    Formats a number of seconds as H:MM:SS.
+
+    Args:
+        seconds (float): The number of seconds.
+
+    Returns:
+        str: The formatted duration.
+    """
+    minutes, seconds = divmod(int(seconds), 60)
+    hours, minutes = divmod(minutes, 60)
+    return f"{hours}:{minutes:02d}:{seconds:02d}"
@@ -0,0 +1,343 @@
+# Apache License
+# Version 2.0, January 2004
+# http://www.apache.org/licenses/
+
+# Copyright (c) 2024, Youssef Kandil (youssefkandil@aucegypt.edu) 
+#                     Mohamed Shalan (mshalan@aucegypt.edu)
+# 
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import time
+from array import array
+from collections import deque
+from .CompiledCircuit import (
+    INPUT_PIN,
+    OUTPUT_PIN,
+    BUFF,
+    NOT,
+    AND,
+    NAND,
+    OR,
+    NOR,
+    XOR,
+    XNOR,
+)
+from .DAlgebra import D_Value
+
+# Maximum number of nets implied by one assignment during learning; the implications
+# found before the limit are still valid
+LEARNING_IMPLICATION_LIMIT = 2000
+
+# Output value of a gate that requires every input to be non-controlling: the
+# contrapositive of an implication of this value cannot be found by direct implication
+NON_CONTROLLED_OUTPUT = {AND: 1, NAND: 0, OR: 0, NOR: 1}
+
+
+class StaticLearning:
+    """
+    Static learning of the indirect implications of a circuit (SOCRATES).
+
+    Every net is assigned 0 and 1 in turn on the fault-free circuit and the assignment is
+    propagated by direct forward and backward implications. When net a = v implies that a
+    gate b takes the output value that needs all of its inputs to be non-controlling, the
+    contrapositive b = not w => a = not v is learned: it cannot be found by direct
+    implication, since the controlling input of b is not known.
+
+    The implications are stored in a compact table of arrays keyed by 2 * gate id + value,
+    so they can be mapped to the gates of the circuit or of a sub-circuit by net name.
+    """
+
+    def __init__(self, circuit, implication_limit=LEARNING_IMPLICATION_LIMIT):
+        """
+        Initializes a StaticLearning object.
+
+        Args:
+            circuit (Circuit): The compiled circuit to learn from.
+            implication_limit (int): The maximum number of nets implied by one assignment.
+                                     Defaults to LEARNING_IMPLICATION_LIMIT.
+
+        Returns:
+            None
+        """
+        self.circuit = circuit
+        self.implication_limit = implication_limit
+
+        # Learned implications: 2 * source gate id + source value -> array of
+        # 2 * target gate id + target value
+        self.implications = {}
+
+        # Learning statistics: the number of learned implications, the nets that can only
+        # take one value, and the time spent learning
+        self.implication_count = 0
+        self.constant_nets = 0
+        self.learn_time = 0.0
+
+        return
+
+    def learn(self):
+        """
+        Learns the indirect implications of every net of the circuit.
+
+        Returns:
+            None
+        """
+        start_time = time.perf_counter()
+        compiled = self.circuit.compiled
+        types = compiled.types
+
+        fanout_sets = [set(compiled.get_fanout(gid)) for gid in range(compiled.size)]
+
+        # Values of the nets: -1 for X, 0 or 1
+        self.values = [-1] * compiled.size
+
+        learned = {}
+        for gid in range(compiled.size):
+            # A primary output is a buffer of the net it observes
+            if types[gid] == OUTPUT_PIN:
+                continue
+            for value in (0, 1):
+                implied = self.simulate(gid, value)
+                if implied is None:
+                    # The net can never take this value
+                    self.constant_nets += 1
+                    continue
+                for target in implied:
+                    target_gid, target_value = target >> 1, target & 1
+                    if NON_CONTROLLED_OUTPUT.get(types[target_gid]) != target_value:
+                        continue
+                    # A gate driven by the target is already evaluated from it
+                    if gid in fanout_sets[target_gid]:
+                        continue
+                    learned.setdefault(target ^ 1, []).append((gid << 1) | (value ^ 1))
+
+        self.implications = {
+            source: array("i", targets) for source, targets in learned.items()
+        }
+        self.implication_count = sum(len(targets) for targets in learned.values())
+        del self.values
+        self.learn_time = time.perf_counter() - start_time
+
+        return
+
+    def simulate(self, gid, value):
+        """
+        Propagates the assignment of a net by direct forward and backward implications.
+
+        Args:
+            gid (int): The gate id of the net.
+            value (int): The value assigned to the net, 0 or 1.
+
+        Returns:
+            list: The implied nets other than the assigned one, as 2 * gate id + value, or
+                  None if the assignment leads to a conflict.
+        """
+        compiled = self.circuit.compiled
+        fanout = compiled.fanout
+        fanout_offsets = compiled.fanout_offsets
+        values = self.values
+        limit = self.implication_limit
+
+        self.touched = [gid]
+        self.queue = deque([gid])
+        values[gid] = value
+        conflict = False
+
+        while self.queue and len(self.touched) < limit:
+            net = self.queue.popleft()
+            if not self.imply_backward(net):
+                conflict = True
+                break
+            for idx in range(fanout_offsets[net], fanout_offsets[net + 1]):
+                next_gid = fanout[idx]
+                output_value = self.evaluate(next_gid)
+                if values[next_gid] < 0:
+                    if output_value >= 0:
+                        self.set_value(next_gid, output_value)
+                elif output_value >= 0 and output_value != values[next_gid]:
+                    conflict = True
+                    break
+                elif not self.imply_backward(next_gid):
+                    conflict = True
+                    break
+            if conflict:
+                break
+
+        implied = [(net << 1) | values[net] for net in self.touched if net != gid]
+        for net in self.touched:
+            values[net] = -1
+
+        return None if conflict else implied
+
+    def set_value(self, gid, value):
+        """
+        Assigns an implied value to a net.
+
+        Args:
+            gid (int): The gate id of the net.
+            value (int): The implied value, 0 or 1.
+
+        Returns:
+            bool: False if the net already has the opposite value, True otherwise.
+        """
+        current_value = self.values[gid]
+        if current_value < 0:
+            self.values[gid] = value
+            self.touched.append(gid)
+            self.queue.append(gid)
+            return True
+
+        return current_value == value
+
+    def evaluate(self, gid):
+        """
+        Computes the output value of a gate from the values of its inputs.
+
+        Args:
+            gid (int): The gate id.
+
+        Returns:
+            int: The output value, 0, 1 or -1 for X.
+        """
+        compiled = self.circuit.compiled
+        gate_type = compiled.types[gid]
+        values = self.values
+        inputs = compiled.get_fanin(gid)
+
+        if gate_type == INPUT_PIN:
+            return values[gid]
+        if gate_type == BUFF or gate_type == OUTPUT_PIN:
+            return values[inputs[0]]
+        if gate_type == NOT:
+            input_value = values[inputs[0]]
+            return input_value if input_value < 0 else input_value ^ 1
+
+        if gate_type == XOR or gate_type == XNOR:
+            parity = 1 if gate_type == XNOR else 0
+            for input_gid in inputs:
+                input_value = values[input_gid]
+                if input_value < 0:
+                    return -1
+                parity ^= input_value
+            return parity
+
+        # AND, NAND, OR and NOR: the controlling input value and the inversion
+        controlling = 0 if gate_type == AND or gate_type == NAND else 1
+        inversion = 1 if gate_type == NAND or gate_type == NOR else 0
+        output_value = controlling ^ 1
+        for input_gid in inputs:
+            input_value = values[input_gid]
+            if input_value == controlling:
+                return controlling ^ inversion
+            if input_value < 0:
+                output_value = -1
+
+        return output_value if output_value < 0 else output_value ^ inversion
+
+    def imply_backward(self, gid):
+        """
+        Implies the values of the inputs of a gate that are determined by its output value.
+
+        Args:
+            gid (int): The gate id, whose value is not X.
+
+        Returns:
+            bool: False if an input already has the opposite value, True otherwise.
+        """
+        compiled = self.circuit.compiled
+        gate_type = compiled.types[gid]
+        values = self.values
+        output_value = values[gid]
+        inputs = compiled.get_fanin(gid)
+
+        if gate_type == INPUT_PIN:
+            return True
+        if gate_type == BUFF or gate_type == OUTPUT_PIN:
+            return self.set_value(inputs[0], output_value)
+        if gate_type == NOT:
+            return self.set_value(inputs[0], output_value ^ 1)
+
+        # The single X input of the gate, if all the others are known
+        unknown_input = None
+        if gate_type == XOR or gate_type == XNOR:
+            parity = output_value ^ (1 if gate_type == XNOR else 0)
+            for input_gid in inputs:
+                input_value = values[input_gid]
+                if input_value < 0:
+                    if unknown_input is not None:
+                        return True
+                    unknown_input = input_gid
+                else:
+                    parity ^= input_value
+            if unknown_input is None:
+                return parity == 0
+            return self.set_value(unknown_input, parity)
+
+        controlling = 0 if gate_type == AND or gate_type == NAND else 1
+        inversion = 1 if gate_type == NAND or gate_type == NOR else 0
+        if output_value ^ inversion != controlling:
+            # Every input must be non-controlling
+            for input_gid in inputs:
+                if not self.set_value(input_gid, controlling ^ 1):
+                    return False
+            return True
+
+        # One input must be controlling: imply it if it is the only X input left
+        for input_gid in inputs:
+            input_value = values[input_gid]
+            if input_value == controlling:
+                return True
+            if input_value < 0:
+                if unknown_input is not None:
+                    return True
+                unknown_input = input_gid
+        if unknown_input is None:
+            return False
+
+        return self.set_value(unknown_input, controlling)
+
+    def gate_implications(self, circuit):
+        """
+        Maps the learned implications to the gates of a circuit by net name.
+
+        The circuit may be a sub-circuit extracted from the learned circuit: it holds the
+        whole fanin of its gates, so the implications between its gates still hold.
+
+        Args:
+            circuit (Circuit): The circuit whose gates the implications are mapped to.
+
+        Returns:
+            dict: Gate -> (implications of value 0, implications of value 1), each a tuple
+                  of (target gate, D_Value) pairs.
+        """
+        names = self.circuit.compiled.names
+        gates = circuit.gates
+        target_values = (D_Value.ZERO, D_Value.ONE)
+
+        gate_implications = {}
+        for source, targets in self.implications.items():
+            source_gate = gates.get(names[source >> 1])
+            if source_gate is None:
+                continue
+            mapped_targets = []
+            for target in targets:
+                target_gate = gates.get(names[target >> 1])
+                if target_gate is not None:
+                    mapped_targets.append((target_gate, target_values[target & 1]))
+            if mapped_targets:
+                implications = gate_implications.setdefault(source_gate, [(), ()])
+                implications[source & 1] = tuple(mapped_targets)
+
+        return {
+            gate: tuple(implications)
+            for gate, implications in gate_implications.items()
+        }
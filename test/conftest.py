@@ -0,0 +1,101 @@
+# Apache License
+# Version 2.0, January 2004
+# http://www.apache.org/licenses/
+
+# Copyright (c) 2024, Youssef Kandil (youssefkandil@aucegypt.edu) 
+#                     Mohamed Shalan (mshalan@aucegypt.edu)
+# 
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import os
+import sys
+
+import pytest
+
+TEST_DIR = os.path.dirname(os.path.abspath(__file__))
+
+# Run the tests against the source tree when the package is not installed
+sys.path.insert(0, os.path.join(os.path.dirname(TEST_DIR), "src"))
+
+from PodemQuest import main  # noqa: E402
+from PodemQuest.Benchmark import generate_circuit  # noqa: E402
+
+
+def bench_path(name):
+    """
+    Returns the path of a bench file of the test directory.
+    """
+    return os.path.join(TEST_DIR, name)
+
+
+@pytest.fixture
+def generated_circuit(tmp_path):
+    """
+    Writes a random circuit of Benchmark.generate_circuit() and returns its path.
+
+    Seeds 3 and 4 of a 12 input, 150 gate circuit leave dominating faults undetected by
+    the collapsed fault list, so they also exercise the missed-fault pass.
+    """
+
+    def generate(seed, inputs=12, gates=150):
+        path = tmp_path / f"generated_{inputs}_{gates}_{seed}.bench"
+        generate_circuit(str(path), inputs, gates, seed)
+        return str(path)
+
+    return generate
+
+
+@pytest.fixture
+def run_podem(tmp_path, monkeypatch):
+    """
+    Runs the podemquest command line in this process.
+
+    The returned function takes the bench file and the extra command line options, and
+    returns the pattern file and the fault coverage report (without the phase times) of
+    the run. The pattern file is returned as bytes in the binary format, and its path is
+    kept in the 'output_file' attribute of the function.
+    """
+    runs = []
+
+    def run(bench_file, *options):
+        runs.append(bench_file)
+        output_file = tmp_path / f"patterns_{len(runs)}.txt"
+        report_file = tmp_path / f"report_{len(runs)}.txt"
+        if "--cache_dir" not in options:
+            options = ("--no_cache",) + options
+        monkeypatch.setattr(
+            sys,
+            "argv",
+            [
+                "podemquest",
+                "-i",
+                bench_file,
+                "-o",
+                str(output_file),
+                "-r",
+                str(report_file),
+                "-q",
+                *[str(option) for option in options],
+            ],
+        )
+        main()
+
+        run.output_file = str(output_file)
+        report = report_file.read_text()
+        if "binary" in options:
+            patterns = output_file.read_bytes()
+        else:
+            patterns = output_file.read_text()
+        return patterns, report[: report.index("Phase Times:")]
+
+    return run
@@ -0,0 +1,43 @@
+# Apache License
+# Version 2.0, January 2004
+# http://www.apache.org/licenses/
+
+# Copyright (c) 2024, Youssef Kandil (youssefkandil@aucegypt.edu) 
+#                     Mohamed Shalan (mshalan@aucegypt.edu)
+# 
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import pytest
+
+from conftest import bench_path
+
+from PodemQuest.Benchmark import run_case
+
+
+def test_run_case_phases(tmp_path):
+    metrics = run_case(bench_path("s27.bench"), str(tmp_path), {})
+    phases = metrics["phase_times"]
+
+    # Writing the patterns is part of the output phase, as in the report
+    for phase in ("parse", "compile", "SCOAP", "ATPG search", "output", "report"):
+        assert phase in phases
+    assert metrics["output_time"] == pytest.approx(phases["output"] + phases["report"])
+    assert metrics["total_time"] == pytest.approx(sum(phases.values()))
+    assert metrics["total_time"] == pytest.approx(
+        metrics["parse_time"]
+        + metrics["scoap_time"]
+        + metrics["atpg_time"]
+        + metrics["output_time"]
+    )
+    assert (tmp_path / "s27.txt").exists()
+    assert (tmp_path / "s27_report.txt").exists()
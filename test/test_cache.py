@@ -0,0 +1,78 @@
+# Apache License
+# Version 2.0, January 2004
+# http://www.apache.org/licenses/
+
+# Copyright (c) 2024, Youssef Kandil (youssefkandil@aucegypt.edu) 
+#                     Mohamed Shalan (mshalan@aucegypt.edu)
+# 
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import os
+import shutil
+import stat
+
+import pytest
+
+from conftest import bench_path
+
+from PodemQuest import CircuitCache
+from PodemQuest.CircuitCache import file_mode, source_digest
+
+
+@pytest.mark.parametrize("name", ["c17.bench", "s27.bench"])
+def test_cold_and_warm_cache_identical_output(run_podem, tmp_path, name):
+    cache_dir = tmp_path / "cache"
+    uncached = run_podem(bench_path(name))
+
+    # The first run parses the file and stores the cache file, the second loads it
+    cold = run_podem(bench_path(name), "--cache_dir", cache_dir)
+    cache_files = os.listdir(cache_dir)
+    assert len(cache_files) == 1
+    warm = run_podem(bench_path(name), "--cache_dir", cache_dir)
+
+    assert cold == uncached
+    assert warm == uncached
+    assert os.listdir(cache_dir) == cache_files
+
+
+def test_cache_file_mode(run_podem, tmp_path):
+    cache_dir = tmp_path / "cache"
+    run_podem(bench_path("c17.bench"), "--cache_dir", cache_dir)
+
+    (cache_file,) = os.listdir(cache_dir)
+    mode = stat.S_IMODE(os.stat(cache_dir / cache_file).st_mode)
+    assert mode == file_mode()
+
+
+def test_source_digest(tmp_path):
+    package_dir = os.path.dirname(CircuitCache.__file__)
+    for name in os.listdir(package_dir):
+        if name.endswith(".py"):
+            shutil.copy(os.path.join(package_dir, name), tmp_path)
+
+    digest = source_digest(str(tmp_path))
+    assert digest == source_digest()
+    with open(tmp_path / "Gate.py", "a") as file:
+        file.write("\n")
+    assert source_digest(str(tmp_path)) != digest
+
+
+def test_cache_key_tool_version(run_podem, tmp_path, monkeypatch):
+    # A cache file of another release, or of other sources, is never loaded
+    cache_dir = tmp_path / "cache"
+    run_podem(bench_path("c17.bench"), "--cache_dir", cache_dir)
+    monkeypatch.setattr(
+        CircuitCache, "tool_version", lambda: "unknown-0123456789abcdef"
+    )
+    run_podem(bench_path("c17.bench"), "--cache_dir", cache_dir)
+    assert len(os.listdir(cache_dir)) == 2
@@ -0,0 +1,223 @@
+# Apache License
+# Version 2.0, January 2004
+# http://www.apache.org/licenses/
+
+# Copyright (c) 2024, Youssef Kandil (youssefkandil@aucegypt.edu) 
+#                     Mohamed Shalan (mshalan@aucegypt.edu)
+# 
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import os
+import re
+import stat
+import threading
+
+import pytest
+
+from conftest import bench_path
+
+from PodemQuest.Checkpoint import Checkpoint
+from PodemQuest.CircuitCache import file_mode
+
+
+class Interrupted(Exception):
+    """
+    Stands in for a crash or a preemption of the run.
+    """
+
+
+def circuit_path(generated_circuit, circuit):
+    """
+    Returns the bench file of a test case: the name of a bench file of the test
+    directory, the seed of a generated circuit, or its (seed, inputs, gates).
+    """
+    if isinstance(circuit, int):
+        return generated_circuit(circuit)
+    if isinstance(circuit, tuple):
+        return generated_circuit(*circuit)
+    return bench_path(circuit)
+
+
+def assert_aborts(options, report):
+    """
+    Checks that the backtrack limit of a test case aborts faults, so that the resumed
+    run has to fault simulate the aborted faults of the interrupted one.
+    """
+    if "--backtrack_limit" in options:
+        assert not re.search(r"Aborted\s*: 0\n", report)
+
+
+def without_checkpoint_counts(report):
+    """
+    Removes the number of checkpoints written from a report.
+    """
+    return re.sub(r"Checkpoints\s*:.*\n", "", report)
+
+
+@pytest.mark.parametrize(
+    "circuit, options, saves",
+    [
+        ("c17.bench", (), 2),
+        ("s27.bench", (), 3),
+        (3, (), 5),
+        (4, (), 10),
+        (4, ("--random_patterns",), 3),
+        (3, ("--fault_sim_batch", 4), 4),
+        (3, ("-j", 2), 2),
+        ((12, 16, 300), ("-j", 2, "--backtrack_limit", 2), 2),
+        ((14, 16, 300), ("-j", 2, "--backtrack_limit", 2), 1),
+    ],
+)
+def test_resume_identical_output(
+    run_podem, generated_circuit, monkeypatch, tmp_path, circuit, options, saves
+):
+    bench_file = circuit_path(generated_circuit, circuit)
+    checkpoint_file = str(tmp_path / "run.checkpoint")
+    checkpoint_options = ("--checkpoint", checkpoint_file, "--checkpoint_interval", 0)
+
+    patterns, report = run_podem(bench_file, *options)
+    assert_aborts(options, report)
+
+    # Stop the run right after writing the checkpoint number 'saves'
+    save = Checkpoint.save
+
+    def interrupted_save(self, *args):
+        save(self, *args)
+        if self.saves == saves:
+            raise Interrupted()
+
+    with monkeypatch.context() as patch:
+        patch.setattr(Checkpoint, "save", interrupted_save)
+        with pytest.raises(Interrupted):
+            run_podem(bench_file, *options, *checkpoint_options)
+    assert os.path.exists(checkpoint_file)
+
+    resumed_patterns, resumed_report = run_podem(
+        bench_file, *options, *checkpoint_options, "--resume"
+    )
+    assert resumed_patterns == patterns
+    assert without_checkpoint_counts(resumed_report) == without_checkpoint_counts(
+        report
+    )
+
+
+def test_checkpoint_file_mode(run_podem, tmp_path):
+    checkpoint_file = tmp_path / "run.checkpoint"
+    run_podem(bench_path("c17.bench"), "--checkpoint", checkpoint_file)
+
+    mode = stat.S_IMODE(os.stat(checkpoint_file).st_mode)
+    assert mode == file_mode()
+
+
+@pytest.mark.parametrize(
+    "circuit, options",
+    [
+        (3, ("--partitions", 2)),
+        (4, ("--partitions", 3)),
+        (10, ("--partitions", 3)),
+        ((13, 16, 300), ("--partitions", 3, "--backtrack_limit", 2)),
+        ((12, 16, 300), ("-j", 2, "--partitions", 2, "--backtrack_limit", 2)),
+        ((14, 16, 300), ("-j", 2, "--partitions", 2, "--backtrack_limit", 2)),
+    ],
+)
+def test_resume_partitions_same_coverage(
+    run_podem, generated_circuit, monkeypatch, tmp_path, circuit, options
+):
+    # A resumed partitioned run targets the boundary faults left undetected again, so
+    # its patterns may differ, but not the status of any fault
+    bench_file = circuit_path(generated_circuit, circuit)
+    checkpoint_file = str(tmp_path / "run.checkpoint")
+    checkpoint_options = ("--checkpoint", checkpoint_file, "--checkpoint_interval", 0)
+
+    _, report = run_podem(bench_file, *options)
+    assert_aborts(options, report)
+
+    save = Checkpoint.save
+
+    def interrupted_save(self, *args):
+        save(self, *args)
+        raise Interrupted()
+
+    with monkeypatch.context() as patch:
+        patch.setattr(Checkpoint, "save", interrupted_save)
+        with pytest.raises(Interrupted):
+            run_podem(bench_file, *options, *checkpoint_options)
+
+    _, resumed_report = run_podem(
+        bench_file, *options, *checkpoint_options, "--resume"
+    )
+    for label in ("Uncovered Faults", "Untestable", "Aborted", "Fault Coverage"):
+        pattern = rf"{label}\s*:.*"
+        assert re.search(pattern, resumed_report).group() == re.search(
+            pattern, report
+        ).group()
+
+
+@pytest.mark.parametrize(
+    "bench_name, options, message",
+    [
+        ("s27.bench", (), "is for a different netlist"),
+        ("c17.bench", ("--no_collapse",), "was written with collapse_faults="),
+        (None, (), "is not a checkpoint file"),
+    ],
+)
+def test_resume_mismatch_is_reported(
+    run_podem, tmp_path, capsys, bench_name, options, message
+):
+    checkpoint_file = tmp_path / "run.checkpoint"
+    if bench_name is None:
+        bench_name = "c17.bench"
+        checkpoint_file.write_text("not a checkpoint")
+    else:
+        run_podem(bench_path("c17.bench"), "--checkpoint", checkpoint_file)
+
+    # The pattern file of the run is not opened before the checkpoint is validated
+    pattern_files = set(tmp_path.glob("patterns_*"))
+    with pytest.raises(SystemExit) as error:
+        run_podem(
+            bench_path(bench_name),
+            *options,
+            "--checkpoint",
+            checkpoint_file,
+            "--resume",
+        )
+    assert error.value.code == 2
+    stderr = capsys.readouterr().err
+    assert message in stderr
+    assert "Traceback" not in stderr
+    assert set(tmp_path.glob("patterns_*")) == pattern_files
+
+
+def test_interrupted_run_closes_pattern_file(run_podem, tmp_path, monkeypatch):
+    # The patterns streamed before the failure are written and the writer thread stops
+    save = Checkpoint.save
+
+    def interrupted_save(self, vectors, *args):
+        save(self, vectors, *args)
+        if vectors:
+            raise Interrupted()
+
+    threads = threading.active_count()
+    monkeypatch.setattr(Checkpoint, "save", interrupted_save)
+    with pytest.raises(Interrupted):
+        run_podem(
+            bench_path("s27.bench"),
+            "--no_compaction",
+            "--checkpoint",
+            tmp_path / "run.checkpoint",
+            "--checkpoint_interval",
+            0,
+        )
+
+    assert threading.active_count() == threads
+    assert "\n1: " in (tmp_path / "patterns_1.txt").read_text()
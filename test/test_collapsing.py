@@ -0,0 +1,79 @@
+# Apache License
+# Version 2.0, January 2004
+# http://www.apache.org/licenses/
+
+# Copyright (c) 2024, Youssef Kandil (youssefkandil@aucegypt.edu) 
+#                     Mohamed Shalan (mshalan@aucegypt.edu)
+# 
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import pytest
+
+from conftest import bench_path
+
+from PodemQuest.Circuit import Circuit
+
+
+@pytest.mark.parametrize(
+    "name, faults, classes, collapsed",
+    [("c17.bench", 406, 282, 237), ("s27.bench", 82, 41, 35)],
+)
+def test_collapsed_fault_counts(name, faults, classes, collapsed):
+    circuit = Circuit(bench_path(name))
+    circuit.collapse_faults()
+
+    assert len(circuit.faults) == faults
+    assert len(circuit.equivalent_faults) == classes
+    assert len(circuit.collapsed_faults) == collapsed
+
+    # The equivalence classes partition the fault list
+    class_faults = [
+        fault for members in circuit.equivalent_faults.values() for fault in members
+    ]
+    assert sorted(class_faults) == sorted(circuit.faults)
+
+
+@pytest.mark.parametrize("name", ["c17.bench", "s27.bench"])
+def test_expand_faults_restores_fault_list(name):
+    circuit = Circuit(bench_path(name))
+    circuit.collapse_faults()
+
+    detected, unresolved = circuit.expand_faults(set(circuit.collapsed_faults))
+    assert detected == set(circuit.faults)
+    assert unresolved == []
+
+
+def test_and_gate_classes(tmp_path):
+    bench_file = tmp_path / "and.bench"
+    bench_file.write_text("INPUT(a)\nINPUT(b)\nOUTPUT(g)\ng = AND(a, b)\n")
+    circuit = Circuit(str(bench_file))
+    circuit.collapse_faults()
+
+    # The stuck-at-0 faults are equivalent, and g stuck-at-1 dominates a stuck-at-1
+    assert circuit.equivalent_faults[("a", 0)] == [
+        ("a", 0),
+        ("b", 0),
+        ("output_pin_g", 0),
+        ("g", 0),
+    ]
+    assert circuit.collapsed_faults == [("a", 0), ("a", 1), ("b", 1)]
+    assert circuit.dominating_faults == {("a", 1): [("output_pin_g", 1)]}
+
+    # A test of a stuck-at-1 detects the dominating class, without b stuck-at-1
+    detected, unresolved = circuit.expand_faults({("a", 1)})
+    assert detected == {("a", 1), ("output_pin_g", 1), ("g", 1)}
+    assert unresolved == []
+
+    # Without the dominated fault, the dominating class has to be fault simulated
+    detected, unresolved = circuit.expand_faults({("a", 0)})
+    assert sorted(unresolved) == [("g", 1), ("output_pin_g", 1)]
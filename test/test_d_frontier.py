@@ -0,0 +1,87 @@
+# Apache License
+# Version 2.0, January 2004
+# http://www.apache.org/licenses/
+
+# Copyright (c) 2024, Youssef Kandil (youssefkandil@aucegypt.edu) 
+#                     Mohamed Shalan (mshalan@aucegypt.edu)
+# 
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+from PodemQuest.Circuit import Circuit
+from PodemQuest.DAlgebra import D_Value
+from PodemQuest.PODEM import PODEM
+
+BENCH = """INPUT(a)
+INPUT(b)
+INPUT(c)
+INPUT(d)
+OUTPUT(g)
+OUTPUT(h)
+g = AND(a, b)
+h = AND(c, d)
+"""
+
+
+def make_agent(tmp_path):
+    """
+    Returns a PODEM agent on two independent AND gates, g = AND(a, b) and h = AND(c, d),
+    with set input pin observabilities.
+    """
+    bench_file = tmp_path / "frontier.bench"
+    bench_file.write_text(BENCH)
+    circuit = Circuit(str(bench_file))
+    circuit.calculate_SCOAP()
+    agent = PODEM(circuit=circuit, output_file=str(tmp_path / "patterns.txt"))
+    agent.reset_values()
+
+    gates = circuit.gates
+    gates["g"].pin_CCb = [1, 5]
+    gates["h"].pin_CCb = [3, 3]
+    return agent, gates
+
+
+def set_value(agent, gate, value):
+    """
+    Sets the value of a gate without implying it, as the search would.
+    """
+    gate.value = value
+    agent.value_changed(gate)
+
+
+def test_key_improves(tmp_path):
+    agent, gates = make_agent(tmp_path)
+    set_value(agent, gates["b"], D_Value.D)
+    set_value(agent, gates["c"], D_Value.D)
+    assert agent.select_d_frontier_gate() is gates["h"]
+
+    # A more observable pin of g turns D' after g entered the D-frontier
+    set_value(agent, gates["a"], D_Value.D_PRIME)
+    assert agent.select_d_frontier_gate() is gates["g"]
+
+
+def test_stale_entry_after_reentry(tmp_path):
+    agent, gates = make_agent(tmp_path)
+    set_value(agent, gates["a"], D_Value.D)
+    set_value(agent, gates["c"], D_Value.D)
+    assert agent.select_d_frontier_gate() is gates["g"]
+
+    # g leaves the D-frontier and enters it again through its less observable pin
+    set_value(agent, gates["a"], D_Value.X)
+    set_value(agent, gates["b"], D_Value.D)
+    assert agent.select_d_frontier_gate() is gates["h"]
+
+    # And leaves it for good once its output is set
+    set_value(agent, gates["h"], D_Value.ZERO)
+    assert agent.select_d_frontier_gate() is gates["g"]
+    set_value(agent, gates["g"], D_Value.ZERO)
+    assert agent.select_d_frontier_gate() is None
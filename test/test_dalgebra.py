@@ -0,0 +1,147 @@
+# Apache License
+# Version 2.0, January 2004
+# http://www.apache.org/licenses/
+
+# Copyright (c) 2024, Youssef Kandil (youssefkandil@aucegypt.edu) 
+#                     Mohamed Shalan (mshalan@aucegypt.edu)
+# 
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+from itertools import product
+
+import pytest
+
+from PodemQuest.DAlgebra import (
+    AND_FOLD,
+    AND_INIT,
+    D_Value,
+    FAULT_TABLE,
+    INVERTED_STATE_VALUE,
+    OR_FOLD,
+    OR_INIT,
+    STATE_VALUE,
+    XOR_FOLD,
+    XOR_INIT,
+)
+
+ZERO, ONE, D, DP, X = D_Value
+
+# Five-valued truth tables, rows and columns in the order 0, 1, D, D', X
+AND_TABLE = (
+    (ZERO, ZERO, ZERO, ZERO, ZERO),
+    (ZERO, ONE, D, DP, X),
+    (ZERO, D, D, ZERO, X),
+    (ZERO, DP, ZERO, DP, X),
+    (ZERO, X, X, X, X),
+)
+OR_TABLE = (
+    (ZERO, ONE, D, DP, X),
+    (ONE, ONE, ONE, ONE, ONE),
+    (D, ONE, D, ONE, X),
+    (DP, ONE, ONE, DP, X),
+    (X, ONE, X, X, X),
+)
+XOR_TABLE = (
+    (ZERO, ONE, D, DP, X),
+    (ONE, ZERO, DP, D, X),
+    (D, DP, ZERO, ONE, X),
+    (DP, D, ONE, ZERO, X),
+    (X, X, X, X, X),
+)
+NOT_TABLE = (ONE, ZERO, DP, D, X)
+
+# Three-valued (0, 1, X) operators on the good and faulty components
+AND3 = ((0, 0, 0), (0, 1, "X"), (0, "X", "X"))
+OR3 = ((0, 1, "X"), (1, 1, 1), ("X", 1, "X"))
+XOR3 = ((0, 1, "X"), (1, 0, "X"), ("X", "X", "X"))
+
+# Good and faulty components of each value, and the fold state encoding of a component
+COMPONENTS = {ZERO: (0, 0), ONE: (1, 1), D: (1, 0), DP: (0, 1), X: ("X", "X")}
+INDEX = {0: 0, 1: 1, "X": 2}
+FOLDS = {
+    "AND": (AND_FOLD, AND_INIT, AND3, AND_TABLE),
+    "OR": (OR_FOLD, OR_INIT, OR3, OR_TABLE),
+    "XOR": (XOR_FOLD, XOR_INIT, XOR3, XOR_TABLE),
+}
+
+
+def state(good, faulty):
+    return 3 * INDEX[good] + INDEX[faulty]
+
+
+def value(good, faulty):
+    """
+    Returns the five-valued value of a pair of components.
+    """
+    if good == "X" or faulty == "X":
+        return X
+    for five_valued, components in COMPONENTS.items():
+        if components == (good, faulty):
+            return five_valued
+
+
+@pytest.mark.parametrize("name", FOLDS)
+def test_fold_table(name):
+    fold, _, op, _ = FOLDS[name]
+    for good, faulty in product((0, 1, "X"), repeat=2):
+        for input_value, (input_good, input_faulty) in COMPONENTS.items():
+            expected = state(
+                op[INDEX[good]][INDEX[input_good]],
+                op[INDEX[faulty]][INDEX[input_faulty]],
+            )
+            assert fold[state(good, faulty)][input_value] == expected
+
+
+@pytest.mark.parametrize("name", FOLDS)
+def test_two_input_gates(name):
+    fold, init, _, table = FOLDS[name]
+    for a, b in product(D_Value, repeat=2):
+        folded = fold[fold[init][a]][b]
+        assert STATE_VALUE[folded] == table[a][b]
+        assert INVERTED_STATE_VALUE[folded] == NOT_TABLE[table[a][b]]
+
+
+@pytest.mark.parametrize("name", FOLDS)
+def test_three_input_gates(name):
+    # Folding the components separately is exact, e.g. AND(D, X, D') = 0, where
+    # chaining the five-valued table would give X
+    fold, init, op, _ = FOLDS[name]
+    for inputs in product(D_Value, repeat=3):
+        folded = init
+        for input_value in inputs:
+            folded = fold[folded][input_value]
+        good = faulty = 1 if name == "AND" else 0
+        for input_value in inputs:
+            input_good, input_faulty = COMPONENTS[input_value]
+            good = op[INDEX[good]][INDEX[input_good]]
+            faulty = op[INDEX[faulty]][INDEX[input_faulty]]
+        assert STATE_VALUE[folded] == value(good, faulty)
+
+
+def test_inverted_state_value():
+    inverted = {0: 1, 1: 0, "X": "X"}
+    for good, faulty in product((0, 1, "X"), repeat=2):
+        expected = value(inverted[good], inverted[faulty])
+        assert INVERTED_STATE_VALUE[state(good, faulty)] == expected
+        assert STATE_VALUE[state(good, faulty)] == value(good, faulty)
+
+
+def test_fault_table():
+    # Rows are the fault-free value, columns the fault value
+    stuck_at_0 = (ZERO, D, D, ZERO, X)
+    stuck_at_1 = (DP, ONE, ONE, DP, X)
+    for fault_free in D_Value:
+        assert FAULT_TABLE[fault_free][ZERO] == stuck_at_0[fault_free]
+        assert FAULT_TABLE[fault_free][D] == stuck_at_0[fault_free]
+        assert FAULT_TABLE[fault_free][ONE] == stuck_at_1[fault_free]
+        assert FAULT_TABLE[fault_free][DP] == stuck_at_1[fault_free]
+        assert FAULT_TABLE[fault_free][X] == X
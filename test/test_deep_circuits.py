@@ -0,0 +1,48 @@
+# Apache License
+# Version 2.0, January 2004
+# http://www.apache.org/licenses/
+
+# Copyright (c) 2024, Youssef Kandil (youssefkandil@aucegypt.edu) 
+#                     Mohamed Shalan (mshalan@aucegypt.edu)
+# 
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+# Number of levels of the chain, well above the default recursion limit
+CHAIN_DEPTH = 3000
+
+
+def write_chain(path, depth):
+    """
+    Writes a chain of alternating AND and NOT gates, one level per gate.
+    """
+    lines = ["INPUT(A)", "INPUT(B)", f"OUTPUT(N{depth - 1})"]
+    net = "A"
+    for idx in range(depth):
+        if idx % 2 == 0:
+            lines.append(f"N{idx} = AND({net}, B)")
+        else:
+            lines.append(f"N{idx} = NOT({net})")
+        net = f"N{idx}"
+
+    path.write_text("\n".join(lines) + "\n")
+
+
+def test_deep_chain(run_podem, tmp_path):
+    # Every fault is backtraced through up to CHAIN_DEPTH levels; a sample keeps the
+    # number of searches small
+    bench_file = tmp_path / "chain.bench"
+    write_chain(bench_file, CHAIN_DEPTH)
+
+    patterns, report = run_podem(str(bench_file), "--sample", 10)
+    assert "Fault Coverage          : 100.00%" in report
+    assert len(patterns.splitlines()) > 2
@@ -0,0 +1,192 @@
+# Apache License
+# Version 2.0, January 2004
+# http://www.apache.org/licenses/
+
+# Copyright (c) 2024, Youssef Kandil (youssefkandil@aucegypt.edu) 
+#                     Mohamed Shalan (mshalan@aucegypt.edu)
+# 
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import re
+
+import pytest
+
+from conftest import bench_path
+
+GATE_LINE = re.compile(r"^\s*(\S+)\s*=\s*(\w+)\s*\(([^)]*)\)")
+PORT_LINE = re.compile(r"^\s*(INPUT|OUTPUT)\s*\(\s*([^)\s]+)\s*\)")
+
+# Two-valued functions of the bench gate types
+GATE_FUNCTIONS = {
+    "AND": lambda values: all(values),
+    "NAND": lambda values: not all(values),
+    "OR": lambda values: any(values),
+    "NOR": lambda values: not any(values),
+    "XOR": lambda values: sum(values) % 2 == 1,
+    "XNOR": lambda values: sum(values) % 2 == 0,
+    "NOT": lambda values: not values[0],
+    "BUFF": lambda values: values[0],
+}
+
+
+class SerialFaultSimulator:
+    """
+    Serial two-valued stuck-at fault simulator, written from the bench file alone.
+
+    It shares no code with the package, so it checks the detections claimed by a run
+    independently of the fault simulator and the circuit model of PodemQuest.
+    """
+
+    def __init__(self, bench_file):
+        self.inputs = []
+        self.outputs = []
+        gates = {}
+        with open(bench_file) as f:
+            for line in f:
+                line = line.split("#", 1)[0]
+                port = PORT_LINE.match(line)
+                if port:
+                    if port.group(1) == "INPUT":
+                        self.inputs.append(port.group(2))
+                    else:
+                        self.outputs.append(port.group(2))
+                    continue
+                gate = GATE_LINE.match(line)
+                if gate:
+                    fanin = [net.strip() for net in gate.group(3).split(",")]
+                    gates[gate.group(1)] = (gate.group(2).upper(), fanin)
+
+        # Topological order of the gates
+        self.gates = []
+        placed = set(self.inputs)
+        pending = list(gates)
+        while pending:
+            blocked = []
+            for net in pending:
+                if all(source in placed for source in gates[net][1]):
+                    self.gates.append((net,) + gates[net])
+                    placed.add(net)
+                else:
+                    blocked.append(net)
+            assert len(blocked) < len(pending), "combinational loop"
+            pending = blocked
+
+    def simulate(self, pattern, fault=None):
+        """
+        Returns the primary output values of a pattern, with an optional stuck-at fault.
+
+        A fault on a net forces the net everywhere; a fault on "output_pin_<net>" only
+        forces the value observed at the primary output <net>.
+        """
+        net_fault = fault if fault and not fault[0].startswith("output_pin_") else None
+        values = {}
+        for net, bit in zip(self.inputs, pattern):
+            values[net] = bit == "1"
+            if net_fault and net_fault[0] == net:
+                values[net] = bool(net_fault[1])
+        for net, gate_type, fanin in self.gates:
+            values[net] = GATE_FUNCTIONS[gate_type]([values[src] for src in fanin])
+            if net_fault and net_fault[0] == net:
+                values[net] = bool(net_fault[1])
+
+        observed = []
+        for net in self.outputs:
+            if fault and fault[0] == f"output_pin_{net}":
+                observed.append(bool(fault[1]))
+            else:
+                observed.append(values[net])
+        return observed
+
+    def faults(self):
+        """
+        Returns every stuck-at fault of the nets and primary output pins.
+        """
+        nets = self.inputs + [gate[0] for gate in self.gates]
+        nets += [f"output_pin_{net}" for net in self.outputs]
+        return [(net, value) for net in nets for value in (0, 1)]
+
+    def detected(self, patterns):
+        """
+        Returns the faults detected by a list of fully specified patterns.
+        """
+        remaining = set(self.faults())
+        detected = set()
+        for pattern in patterns:
+            good = self.simulate(pattern)
+            for fault in list(remaining):
+                if self.simulate(pattern, fault) != good:
+                    detected.add(fault)
+                    remaining.discard(fault)
+        return detected
+
+
+def read_patterns(text):
+    """
+    Returns the patterns of a text pattern file.
+    """
+    return [
+        line.split(":", 1)[1].strip()
+        for line in text.splitlines()
+        if line.strip() and not line.lstrip().startswith("*")
+    ]
+
+
+def report_count(report, label):
+    """
+    Returns the integer of a line of the fault coverage report.
+    """
+    return int(re.search(rf"{label}\s*:\s*(\d+)", report).group(1))
+
+
+@pytest.mark.parametrize(
+    "options",
+    [
+        (),
+        ("--no_collapse",),
+        ("--no_fault_sim",),
+        ("--no_compaction",),
+        ("--fault_sim_batch", 8),
+        ("--random_patterns",),
+        ("--secondary_faults", 2),
+        ("--compaction_orders", 2),
+        ("--x_fill", "random"),
+        ("--implication", "recursive"),
+        ("--no_cone",),
+        ("-j", 2),
+        ("--partitions", 3),
+        ("--static_learning",),
+    ],
+)
+@pytest.mark.parametrize("circuit", ["c17.bench", "s27.bench", 3, 4])
+def test_patterns_detect_reported_faults(
+    run_podem, generated_circuit, circuit, options
+):
+    if isinstance(circuit, int):
+        bench_file = generated_circuit(circuit)
+    else:
+        bench_file = bench_path(circuit)
+
+    patterns, report = run_podem(bench_file, *options)
+    simulator = SerialFaultSimulator(bench_file)
+    detected = simulator.detected(read_patterns(patterns))
+
+    assert report_count(report, "Total Faults Tested") == len(simulator.faults())
+    assert report_count(report, "Uncovered Faults") == len(detected)
+
+
+@pytest.mark.parametrize("batch", [0, -3])
+def test_fault_sim_batch_below_one_is_rejected(run_podem, capsys, batch):
+    with pytest.raises(SystemExit) as error:
+        run_podem(bench_path("c17.bench"), "--fault_sim_batch", batch)
+    assert error.value.code == 2
+    assert "--fault_sim_batch must be at least 1" in capsys.readouterr().err
@@ -0,0 +1,98 @@
+# Apache License
+# Version 2.0, January 2004
+# http://www.apache.org/licenses/
+
+# Copyright (c) 2024, Youssef Kandil (youssefkandil@aucegypt.edu) 
+#                     Mohamed Shalan (mshalan@aucegypt.edu)
+# 
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import pytest
+
+from PodemQuest.Circuit import Circuit
+from PodemQuest.DAlgebra import D_Value
+from PodemQuest.PODEM import PODEM
+
+# a reaches z through four reconvergent paths
+BENCH = """INPUT(a)
+INPUT(b)
+INPUT(c)
+OUTPUT(z)
+n1 = NOT(a)
+n2 = AND(a, b)
+n3 = OR(n1, c)
+n4 = NAND(n2, n3)
+n5 = XOR(n2, a)
+z = AND(n4, n5)
+"""
+
+ASSIGNMENTS = [("b", D_Value.ONE), ("c", D_Value.ZERO), ("a", D_Value.ONE)]
+
+
+def make_agent(tmp_path, implication, fault=None):
+    """
+    Returns a PODEM agent on the reconvergent circuit with the given implication
+    engine, and the fault (net, stuck-at value) injected if any.
+    """
+    bench_file = tmp_path / "reconvergent.bench"
+    bench_file.write_text(BENCH)
+    circuit = Circuit(str(bench_file))
+    circuit.calculate_SCOAP()
+    agent = PODEM(circuit=circuit, output_file=str(tmp_path / "patterns.txt"))
+    agent.reset_values()
+    agent.implication = implication
+    if fault is not None:
+        gate = circuit.gates[fault[0]]
+        gate.faulty = True
+        gate.fault_value = D_Value.ZERO if fault[1] == 0 else D_Value.ONE
+    return agent
+
+
+def net_values(agent):
+    """
+    Returns the value of every net of the circuit of an agent.
+    """
+    return {name: gate.value for name, gate in agent.circuit.gates.items()}
+
+
+@pytest.mark.parametrize("fault", [None, ("n2", 0), ("a", 1), ("n3", 0)])
+def test_engines_imply_the_same_values(tmp_path, fault):
+    event = make_agent(tmp_path, "event", fault)
+    recursive = make_agent(tmp_path, "recursive", fault)
+
+    for name, value in ASSIGNMENTS:
+        marks = (len(event.trail), len(recursive.trail))
+        event.assign(event.circuit.gates[name], value)
+        recursive.assign(recursive.circuit.gates[name], value)
+        assert net_values(event) == net_values(recursive)
+
+    # Undoing the last assignment restores the same values in both
+    event.undo(marks[0])
+    recursive.undo(marks[1])
+    assert net_values(event) == net_values(recursive)
+    event.assign(event.circuit.gates["a"], D_Value.ZERO)
+    recursive.assign(recursive.circuit.gates["a"], D_Value.ZERO)
+    assert net_values(event) == net_values(recursive)
+
+
+def test_event_engine_evaluates_fewer_gates(tmp_path):
+    event = make_agent(tmp_path, "event")
+    recursive = make_agent(tmp_path, "recursive")
+
+    for name, value in ASSIGNMENTS:
+        event.assign(event.circuit.gates[name], value)
+        recursive.assign(recursive.circuit.gates[name], value)
+
+    # Every reconvergent gate is evaluated once by the event engine, and once per
+    # changed path by the recursive one
+    assert event.gate_evaluations < recursive.gate_evaluations
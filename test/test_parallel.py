@@ -0,0 +1,57 @@
+# Apache License
+# Version 2.0, January 2004
+# http://www.apache.org/licenses/
+
+# Copyright (c) 2024, Youssef Kandil (youssefkandil@aucegypt.edu) 
+#                     Mohamed Shalan (mshalan@aucegypt.edu)
+# 
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import pytest
+
+from conftest import bench_path
+
+
+@pytest.mark.parametrize("seed", [3, 4])
+def test_jobs_identical_output(run_podem, generated_circuit, seed):
+    # The missed-fault pass runs on the main agent after the shards, so a shard run in
+    # this process must not leave its values on the circuit
+    bench_file = generated_circuit(seed)
+    patterns, report = run_podem(bench_file, "-j", 1)
+    assert "Missed Dominating Faults: 0 " not in report
+
+    for jobs in (2, 3):
+        assert run_podem(bench_file, "-j", jobs) == (patterns, report)
+
+
+@pytest.mark.parametrize("name", ["c17.bench", "s27.bench"])
+def test_jobs_identical_output_benchmarks(run_podem, name):
+    patterns, report = run_podem(bench_path(name), "-j", 1)
+    for jobs in (2, 3):
+        assert run_podem(bench_path(name), "-j", jobs) == (patterns, report)
+
+
+@pytest.mark.parametrize("jobs", [0, -2])
+def test_jobs_below_one_are_rejected(run_podem, capsys, jobs):
+    with pytest.raises(SystemExit) as error:
+        run_podem(bench_path("c17.bench"), "-j", jobs)
+    assert error.value.code == 2
+    assert "--jobs must be at least 1" in capsys.readouterr().err
+
+
+@pytest.mark.parametrize("partitions", [0, -1])
+def test_partitions_below_one_are_rejected(run_podem, capsys, partitions):
+    with pytest.raises(SystemExit) as error:
+        run_podem(bench_path("c17.bench"), "--partitions", partitions)
+    assert error.value.code == 2
+    assert "--partitions must be at least 1" in capsys.readouterr().err
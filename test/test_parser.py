@@ -0,0 +1,104 @@
+# Apache License
+# Version 2.0, January 2004
+# http://www.apache.org/licenses/
+
+# Copyright (c) 2024, Youssef Kandil (youssefkandil@aucegypt.edu) 
+#                     Mohamed Shalan (mshalan@aucegypt.edu)
+# 
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+import re
+
+import pytest
+
+from conftest import bench_path
+from PodemQuest.Circuit import Circuit
+
+
+def reversed_bench(tmp_path):
+    """
+    Writes the c17 test circuit with its gates in reverse order, so every gate is listed
+    before its fanin gates, and returns its path.
+    """
+    with open(bench_path("c17.bench")) as file:
+        lines = file.read().splitlines()
+    gates = [line for line in lines if "=" in line]
+    others = [line for line in lines if "=" not in line]
+    path = tmp_path / "reversed.bench"
+    path.write_text("\n".join(others + gates[::-1]) + "\n")
+    return str(path)
+
+
+def connections(circuit):
+    """
+    Returns the input and output nets of every gate of a circuit by net name.
+    """
+    return {
+        net: (
+            gate.type,
+            [input_gate.outputpin for input_gate in gate.input_gates],
+            sorted(output_gate.outputpin for output_gate in gate.output_gates),
+        )
+        for net, gate in circuit.gates.items()
+    }
+
+
+def test_forward_references(tmp_path):
+    circuit = Circuit(bench_path("c17.bench"))
+    reversed_circuit = Circuit(reversed_bench(tmp_path))
+
+    assert not reversed_circuit.pending_inputs
+    assert connections(reversed_circuit) == connections(circuit)
+    assert sorted(reversed_circuit.faults) == sorted(circuit.faults)
+
+
+def test_forward_reference_output_order(tmp_path):
+    # The output gates of a net are listed in file order, including the gates that
+    # referred to the net before it was defined
+    path = tmp_path / "forward.bench"
+    path.write_text(
+        "INPUT(a)\nOUTPUT(y)\nOUTPUT(z)\n"
+        "y = AND(n, a)\nn = NOT(a)\nz = OR(a, n)\n"
+    )
+    circuit = Circuit(str(path))
+    gates = circuit.gates
+
+    assert gates["y"].input_gates == [gates["n"], gates["a"]]
+    assert [gate.outputpin for gate in gates["n"].output_gates] == ["y", "z"]
+    assert [gate.outputpin for gate in gates["a"].output_gates] == ["y", "n", "z"]
+
+
+def test_forward_references_same_coverage(tmp_path, run_podem):
+    _, report = run_podem(bench_path("c17.bench"))
+    _, reversed_report = run_podem(reversed_bench(tmp_path))
+    # The search order follows the gate order, so only the fault counts must match
+    for label in ("Total Faults", "Uncovered Faults", "Untestable", "Fault Coverage"):
+        pattern = rf"{label}.*:.*"
+        assert re.search(pattern, reversed_report).group() == re.search(
+            pattern, report
+        ).group()
+
+
+@pytest.mark.parametrize(
+    "bench",
+    [
+        # Gate input that is never defined
+        "INPUT(a)\nOUTPUT(y)\ny = AND(a, b)\n",
+        # Dangling primary output
+        "INPUT(a)\nOUTPUT(y)\nOUTPUT(z)\ny = NOT(a)\n",
+    ],
+)
+def test_undefined_net(tmp_path, bench):
+    path = tmp_path / "undefined.bench"
+    path.write_text(bench)
+    with pytest.raises(ValueError, match="never defined"):
+        Circuit(str(path))
@@ -0,0 +1,92 @@
+# Apache License
+# Version 2.0, January 2004
+# http://www.apache.org/licenses/
+
+# Copyright (c) 2024, Youssef Kandil (youssefkandil@aucegypt.edu) 
+#                     Mohamed Shalan (mshalan@aucegypt.edu)
+# 
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import pytest
+
+from conftest import bench_path
+
+from PodemQuest.Circuit import Circuit
+from PodemQuest.Partitioner import Partitioner
+
+
+def circuit_path(generated_circuit, circuit):
+    """
+    Returns the bench file of a test case: the name of a bench file of the test
+    directory or the seed of a generated circuit.
+    """
+    if isinstance(circuit, int):
+        return generated_circuit(circuit)
+    return bench_path(circuit)
+
+
+@pytest.mark.parametrize("circuit", ["c17.bench", "s27.bench", 3, 4])
+@pytest.mark.parametrize("count", [1, 2, 3, 8])
+def test_clusters_cover_every_output(generated_circuit, circuit, count):
+    circuit = Circuit(circuit_path(generated_circuit, circuit))
+    compiled = circuit.compiled
+    partitioner = Partitioner(circuit)
+    clusters = partitioner.cluster_outputs(count)
+
+    # Every observable primary output is in exactly one cluster
+    observable = [idx for idx, size in enumerate(partitioner.cone_sizes) if size]
+    assert sorted(idx for cluster in clusters for idx in cluster) == observable
+    assert 1 <= len(clusters) <= count
+
+    # The sub-circuits of the clusters hold every primary output and its whole cone
+    output_names = set()
+    for cluster in clusters:
+        output_gates = [
+            compiled.gates[compiled.primary_outputs[idx]] for idx in cluster
+        ]
+        subcircuit = circuit.extract_subcircuit(output_gates)
+        output_names.update(gate.outputpin for gate in subcircuit.primary_output_gates)
+        for idx in cluster:
+            cone = partitioner.cones[idx]
+            for gid in range(compiled.size):
+                if cone >> gid & 1:
+                    assert compiled.names[gid] in subcircuit.gates
+    assert output_names == {
+        compiled.names[compiled.primary_outputs[idx]] for idx in observable
+    }
+
+
+@pytest.mark.parametrize("circuit", ["c17.bench", "s27.bench", 3, 4])
+@pytest.mark.parametrize("count", [1, 2, 3])
+def test_every_fault_assigned_once(generated_circuit, circuit, count):
+    circuit = Circuit(circuit_path(generated_circuit, circuit))
+    compiled = circuit.compiled
+    partitioner = Partitioner(circuit)
+    clusters = partitioner.cluster_outputs(count)
+    cluster_faults, boundary_faults, unobservable_faults = partitioner.assign_faults(
+        circuit.faults, clusters
+    )
+
+    assigned = [fault for faults in cluster_faults for fault in faults]
+    assert sorted(assigned + unobservable_faults) == sorted(circuit.faults)
+
+    for cluster, faults in zip(clusters, cluster_faults):
+        outputs = sum(1 << idx for idx in cluster)
+        for fault in faults:
+            reach = compiled.po_reach[compiled.index[fault[0]]]
+            # A fault is assigned to a cluster whose outputs it reaches, and it is a
+            # boundary fault when it reaches the outputs of another cluster too
+            assert reach & outputs
+            assert (fault in boundary_faults) == bool(reach & ~outputs)
+    if len(clusters) == 1:
+        assert not boundary_faults
@@ -0,0 +1,126 @@
+# Apache License
+# Version 2.0, January 2004
+# http://www.apache.org/licenses/
+
+# Copyright (c) 2024, Youssef Kandil (youssefkandil@aucegypt.edu) 
+#                     Mohamed Shalan (mshalan@aucegypt.edu)
+# 
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import random
+import re
+import time
+
+import pytest
+
+from conftest import bench_path
+
+from PodemQuest import main
+
+from PodemQuest.Circuit import Circuit
+from PodemQuest.PatternGrader import grade_patterns
+from PodemQuest.PatternWriter import PATTERN_FORMATS, PatternReader, PatternWriter
+
+
+@pytest.mark.parametrize("header", [False, True])
+@pytest.mark.parametrize("width", [1, 8, 13])
+@pytest.mark.parametrize("format", PATTERN_FORMATS)
+def test_writer_reader_round_trip(tmp_path, format, width, header):
+    rng = random.Random(width)
+    patterns = ["".join(rng.choice("01") for _ in range(width)) for _ in range(10)]
+    input_names = [f"in{idx}" for idx in range(width)]
+    output_names = ["out0", "out1"]
+    filename = str(tmp_path / f"patterns.{format}")
+
+    # A small buffer hands several buffers to the writer thread
+    writer = PatternWriter(
+        filename, input_names, output_names, format=format, header=header, buffer_size=3
+    )
+    for pattern in patterns:
+        writer.write(pattern)
+    assert writer.close() == len(patterns)
+
+    reader = PatternReader(filename)
+    assert reader.format == format
+    assert list(reader) == patterns
+    if format == "text" and not header:
+        assert reader.input_names is None
+    else:
+        assert reader.input_names == input_names
+        assert reader.output_names == output_names
+
+
+def test_writer_error_stops_thread(tmp_path):
+    # The directory of the pattern file does not exist, so the writer thread fails
+    filename = str(tmp_path / "missing" / "patterns.txt")
+    writer = PatternWriter(filename, ["in0", "in1"], ["out0"])
+    writer.write("01")
+    writer.write("10")
+    while writer.error is None:
+        time.sleep(0.001)
+
+    with pytest.raises(FileNotFoundError):
+        writer.close()
+    assert writer.thread is None
+    assert writer.close() == 2
+
+
+@pytest.mark.parametrize("compaction", [(), ("--no_compaction",)])
+@pytest.mark.parametrize("name", ["c17.bench", "s27.bench"])
+def test_pattern_formats_round_trip(run_podem, name, compaction):
+    # Without compaction, the patterns are streamed to the file as they are generated
+    _, report = run_podem(bench_path(name), *compaction)
+    expected = list(PatternReader(run_podem.output_file))
+    detected = int(re.search(r"Uncovered Faults\s*:\s*(\d+)", report).group(1))
+    circuit = Circuit(bench_path(name))
+
+    for format in PATTERN_FORMATS:
+        _, format_report = run_podem(
+            bench_path(name), *compaction, "--pattern_format", format
+        )
+        assert format_report == report
+
+        reader = PatternReader(run_podem.output_file)
+        assert list(reader) == expected
+        no_of_patterns, detected_faults = grade_patterns(
+            circuit, run_podem.output_file
+        )
+        assert no_of_patterns == len(expected)
+        assert len(detected_faults) == detected
+
+
+def test_grade_command(run_podem, monkeypatch, capsys):
+    _, report = run_podem(bench_path("c17.bench"), "--pattern_format", "stil")
+    coverage = re.search(r"Fault Coverage\s*:\s*(\S+)", report).group(1)
+
+    pattern_file = run_podem.output_file
+
+    monkeypatch.setattr(
+        "sys.argv",
+        ["podemquest", "grade", "-i", bench_path("c17.bench"), "-p", pattern_file],
+    )
+
+    with pytest.raises(SystemExit) as error:
+        main()
+    assert error.value.code == 0
+    assert f"Fault Coverage          : {coverage}" in capsys.readouterr().out
+
+    # The primary inputs listed in the file belong to another circuit
+    monkeypatch.setattr(
+        "sys.argv",
+        ["podemquest", "grade", "-i", bench_path("s27.bench"), "-p", pattern_file],
+    )
+    with pytest.raises(SystemExit) as error:
+        main()
+    assert error.value.code == 2
+    assert "do not match the circuit" in capsys.readouterr().err
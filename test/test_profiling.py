@@ -0,0 +1,86 @@
+# Apache License
+# Version 2.0, January 2004
+# http://www.apache.org/licenses/
+
+# Copyright (c) 2024, Youssef Kandil (youssefkandil@aucegypt.edu) 
+#                     Mohamed Shalan (mshalan@aucegypt.edu)
+# 
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import pstats
+import re
+
+import pytest
+
+from conftest import bench_path
+
+from PodemQuest.Circuit import Circuit
+from PodemQuest.PODEM import PODEM
+
+SLOW_FAULT_LINE = re.compile(
+    r"^\s+\S+ stuck-at-[01]: [\d.]+ s, \d+ backtracks, \w+$", re.MULTILINE
+)
+
+
+def test_profile_writes_stats(run_podem, tmp_path):
+    profile_file = tmp_path / "run.prof"
+    run_podem(bench_path("s27.bench"), "--profile", profile_file)
+
+    # The statistics can be read back, and the report lists the slowest functions
+    stats = pstats.Stats(str(profile_file))
+    assert stats.total_calls > 0
+    report = (tmp_path / "report_1.txt").read_text()
+    assert f"Profile ({profile_file})" in report
+    assert "cumulative" in report
+
+
+@pytest.mark.parametrize("count", [1, 3])
+def test_slowest_faults(run_podem, count):
+    _, report = run_podem(bench_path("c17.bench"), "--slowest_faults", count)
+
+    section = report[report.index("Slowest Faults") :]
+    assert len(SLOW_FAULT_LINE.findall(section)) == count
+
+
+def test_no_slowest_faults_by_default(run_podem):
+    _, report = run_podem(bench_path("s27.bench"))
+
+    assert "Slowest Faults" not in report
+
+
+@pytest.mark.parametrize("count", [-1, -5])
+def test_negative_slowest_faults_are_rejected(run_podem, capsys, count):
+    with pytest.raises(SystemExit) as error:
+        run_podem(bench_path("c17.bench"), "--slowest_faults", count)
+    assert error.value.code == 2
+    assert "--slowest_faults must be at least 0" in capsys.readouterr().err
+
+
+@pytest.mark.parametrize(
+    "option", ["--backtrack_limit", "--progress_interval", "--checkpoint_interval"]
+)
+def test_negative_limits_are_rejected(run_podem, capsys, option):
+    with pytest.raises(SystemExit) as error:
+        run_podem(bench_path("c17.bench"), option, -1)
+    assert error.value.code == 2
+    assert f"{option} must be at least 0" in capsys.readouterr().err
+
+
+def test_compute_ignores_negative_slowest_faults(tmp_path):
+    agent = PODEM(
+        circuit=Circuit(bench_path("s27.bench")),
+        output_file=str(tmp_path / "patterns.txt"),
+    )
+    agent.compute(algorithm="advanced", slowest_faults=-1)
+
+    assert agent.slowest_faults == []
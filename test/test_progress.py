@@ -0,0 +1,139 @@
+# Apache License
+# Version 2.0, January 2004
+# http://www.apache.org/licenses/
+
+# Copyright (c) 2024, Youssef Kandil (youssefkandil@aucegypt.edu) 
+#                     Mohamed Shalan (mshalan@aucegypt.edu)
+# 
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+import json
+import re
+import sys
+
+import pytest
+
+from conftest import bench_path
+from PodemQuest import main
+
+PROGRESS_LINE = re.compile(
+    r"(\w+): (\d+) / (\d+) faults \((\d+\.\d\d)%\), (\d+\.\d) faults/s, "
+    r"ETA (\d+:\d\d:\d\d|--:--:--), coverage (\d+\.\d\d)%, (\d+) patterns"
+)
+
+# Fewer faults than the 20 steps of a percentage-based progress
+SMALL_BENCH = """INPUT(a)
+INPUT(b)
+OUTPUT(y)
+y = AND(a, b)
+"""
+
+
+@pytest.fixture
+def run_progress(tmp_path, monkeypatch, capsys):
+    """
+    Runs the podemquest command line with the progress enabled.
+
+    The returned function takes the bench file and the progress interval, and returns
+    the progress lines printed on the console, the parsed JSON lines records and the
+    report of the run.
+    """
+
+    def run(bench_file, interval, *options):
+        json_file = tmp_path / "progress.jsonl"
+        report_file = tmp_path / "report.txt"
+        monkeypatch.setattr(
+            sys,
+            "argv",
+            [
+                "podemquest",
+                "-i",
+                bench_file,
+                "-o",
+                str(tmp_path / "patterns.txt"),
+                "-r",
+                str(report_file),
+                "--no_cache",
+                "--progress_json",
+                str(json_file),
+                "--progress_interval",
+                str(interval),
+                *options,
+            ],
+        )
+        capsys.readouterr()
+        main()
+
+        lines = capsys.readouterr().out.splitlines()
+        records = [json.loads(line) for line in json_file.read_text().splitlines()]
+        return lines, records, report_file.read_text()
+
+    return run
+
+
+def report_value(report, label):
+    return re.search(rf"{label}\s*:\s*(\S+)", report).group(1)
+
+
+def check_records(lines, records, report):
+    """
+    Checks that the console lines and the JSON lines records describe the same progress,
+    and that the last record of the run matches its report.
+    """
+    progress_lines = [PROGRESS_LINE.fullmatch(line) for line in lines]
+    progress_lines = [match for match in progress_lines if match is not None]
+    assert len(progress_lines) == len(records)
+
+    for match, record in zip(progress_lines, records):
+        phase, done, total = match.group(1), int(match.group(2)), int(match.group(3))
+        assert phase == record["phase"]
+        assert (done, total) == (record["done"], record["total"])
+        assert 0 <= done <= total
+        assert int(match.group(8)) == record["patterns"]
+        assert float(match.group(7)) == pytest.approx(record["coverage"], abs=0.01)
+        assert (record["eta"] is None) == (match.group(6) == "--:--:--")
+
+    for previous, record in zip(records, records[1:]):
+        if record["phase"] == previous["phase"]:
+            assert record["done"] >= previous["done"]
+            assert record["patterns"] >= previous["patterns"]
+
+    last = records[-1]
+    assert last["final"]
+    assert last["done"] == last["total"]
+    assert f"{last['coverage']:.2f}%" == report_value(report, "Collapsed Coverage")
+
+
+def test_progress(run_progress):
+    lines, records, report = run_progress(bench_path("c17.bench"), 0)
+    assert len(records) > 2
+    check_records(lines, records, report)
+
+
+def test_progress_throttled(run_progress):
+    # No interval elapses during the run, so only the final record of each phase is
+    # emitted
+    lines, records, report = run_progress(
+        bench_path("c17.bench"), 3600, "--random_patterns"
+    )
+    assert [record["phase"] for record in records] == ["Random", "PODEM"]
+    assert all(record["final"] for record in records)
+    check_records(lines, records, report)
+
+
+@pytest.mark.parametrize("interval", [0, 3600])
+def test_progress_few_faults(tmp_path, run_progress, interval):
+    bench_file = tmp_path / "small.bench"
+    bench_file.write_text(SMALL_BENCH)
+    lines, records, report = run_progress(str(bench_file), interval)
+    assert records[-1]["total"] < 20
+    check_records(lines, records, report)
@@ -0,0 +1,108 @@
+# Apache License
+# Version 2.0, January 2004
+# http://www.apache.org/licenses/
+
+# Copyright (c) 2024, Youssef Kandil (youssefkandil@aucegypt.edu) 
+#                     Mohamed Shalan (mshalan@aucegypt.edu)
+# 
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import re
+
+import pytest
+
+from conftest import bench_path
+
+from PodemQuest.Circuit import Circuit
+
+ESTIMATE_LINE = re.compile(
+    r"Estimated Coverage\s*:\s*([\d.]+)% \(95% confidence interval "
+    r"([\d.]+)% - ([\d.]+)%\)"
+)
+
+
+def report_value(report, label):
+    """
+    Returns the first number of a line of the fault coverage report.
+    """
+    return float(re.search(rf"{label}\s*:\s*([\d.]+)", report).group(1))
+
+
+@pytest.mark.parametrize("strata", ["type", "level"])
+@pytest.mark.parametrize("name", ["c17.bench", "s27.bench"])
+def test_sample_size(name, strata):
+    circuit = Circuit(bench_path(name))
+    for size in range(1, len(circuit.faults) + 1):
+        circuit.sample_faults(size, strata, seed=size)
+        no_of_strata = len(circuit.fault_strata)
+
+        # Only a sample smaller than the number of strata grows, to one fault per stratum
+        assert len(circuit.sampled_faults) == max(size, no_of_strata)
+        for population, sample in circuit.fault_strata.values():
+            assert 1 <= len(sample) <= population
+
+
+@pytest.mark.parametrize("strata", ["type", "level"])
+@pytest.mark.parametrize("circuit", ["c17.bench", 3, 4])
+def test_estimate_against_full_run(run_podem, generated_circuit, circuit, strata):
+    if isinstance(circuit, int):
+        bench_file = generated_circuit(circuit)
+    else:
+        bench_file = bench_path(circuit)
+
+    _, report = run_podem(bench_file)
+    coverage = report_value(report, "Fault Coverage")
+
+    # A 95% interval misses the true coverage for some samples, so the sample is drawn
+    # with a fixed seed
+    _, sample_report = run_podem(
+        bench_file,
+        "--sample",
+        100,
+        "--sample_strata",
+        strata,
+        "--random_seed",
+        1,
+    )
+    assert f"Sampled Faults          : 100 of {len(Circuit(bench_file).faults)}" in (
+        sample_report
+    )
+    estimate, low, high = map(float, ESTIMATE_LINE.search(sample_report).groups())
+    assert low <= coverage <= high
+    assert low <= estimate <= high
+    assert abs(estimate - coverage) < 5
+
+
+def test_whole_sample_estimate_is_exact(run_podem):
+    faults = len(Circuit(bench_path("s27.bench")).faults)
+    _, report = run_podem(bench_path("s27.bench"), "--sample", faults)
+
+    estimate, low, high = map(float, ESTIMATE_LINE.search(report).groups())
+    assert estimate == report_value(report, "Fault Coverage")
+    assert low <= estimate <= high
+
+
+@pytest.mark.parametrize(
+    "options, message",
+    [
+        (("--sample", 0), "--sample must be at least 1"),
+        (("--sample", -5), "--sample must be at least 1"),
+        (("--sample_fraction", 0), "--sample_fraction must be in (0, 1]"),
+        (("--sample_fraction", 1.5), "--sample_fraction must be in (0, 1]"),
+    ],
+)
+def test_invalid_sample_sizes_are_rejected(run_podem, capsys, options, message):
+    with pytest.raises(SystemExit) as error:
+        run_podem(bench_path("c17.bench"), *options)
+    assert error.value.code == 2
+    assert message in capsys.readouterr().err
@@ -0,0 +1,94 @@
+# Apache License
+# Version 2.0, January 2004
+# http://www.apache.org/licenses/
+
+# Copyright (c) 2024, Youssef Kandil (youssefkandil@aucegypt.edu) 
+#                     Mohamed Shalan (mshalan@aucegypt.edu)
+# 
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+import pytest
+
+from PodemQuest.Circuit import Circuit
+from PodemQuest.DAlgebra import D_Value
+from PodemQuest.Gate import Gate
+
+# Net a fans out to a three input XOR, a three input XNOR and an AND gate
+BENCH = """INPUT(p)
+INPUT(q)
+INPUT(r)
+INPUT(s)
+INPUT(t)
+INPUT(u)
+OUTPUT(x)
+OUTPUT(xn)
+OUTPUT(g)
+a = AND(p, q)
+b = NAND(r, s)
+c = AND(t, u)
+x = XOR(a, b, c)
+xn = XNOR(a, b, c)
+g = AND(a, c)
+"""
+
+
+@pytest.fixture
+def gates(tmp_path):
+    bench_file = tmp_path / "scoap.bench"
+    bench_file.write_text(BENCH)
+    circuit = Circuit(str(bench_file))
+    circuit.calculate_SCOAP()
+    return circuit.gates
+
+
+def test_parity_controllability(gates):
+    # a: CC0 2, CC1 3, b: CC0 3, CC1 2, c: CC0 2, CC1 3
+    # Even parity is cheapest with a = b = c = 0, a = b = 1 or b = c = 1 (7),
+    # odd parity with b = 1 only (6)
+    assert gates["x"].calculate_parity_CC() == (7, 6)
+    assert (gates["x"].CC0, gates["x"].CC1) == (8, 7)
+    assert (gates["xn"].CC0, gates["xn"].CC1) == (7, 8)
+
+
+def test_parity_observability(gates):
+    # Every side input of a parity gate costs the cheaper of its two values
+    assert gates["x"].pin_CCb == [5, 5, 5]
+    assert gates["xn"].pin_CCb == [5, 5, 5]
+    assert gates["b"].CCb == 5
+
+
+def test_fanout_stem_observability(gates):
+    # Branch to g: 0 + CC1(c) + 1 = 4, branches to x and xn: 5
+    assert gates["g"].pin_CCb == [4, 4]
+    assert gates["a"].CCb == 4
+    assert gates["c"].CCb == 4
+    # The fanin of the stem is observed through the stem: 4 + CC1(q) + 1
+    assert gates["p"].CCb == 6
+    assert gates["q"].CCb == 6
+
+
+@pytest.mark.parametrize(
+    "gate_type, zero, one",
+    [
+        ("AND", True, False),
+        ("NOR", True, False),
+        ("NOT", True, True),
+        ("BUFF", True, True),
+        ("OR", False, True),
+        ("NAND", False, True),
+        ("XOR", False, True),
+    ],
+)
+def test_controllable_value(gate_type, zero, one):
+    gate = Gate(0, gate_type, [], "n")
+    assert gate.check_controllable_value(D_Value.ZERO) == zero
+    assert gate.check_controllable_value(D_Value.ONE) == one
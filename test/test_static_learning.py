@@ -0,0 +1,83 @@
+# Apache License
+# Version 2.0, January 2004
+# http://www.apache.org/licenses/
+
+# Copyright (c) 2024, Youssef Kandil (youssefkandil@aucegypt.edu) 
+#                     Mohamed Shalan (mshalan@aucegypt.edu)
+# 
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+from PodemQuest.Circuit import Circuit
+from PodemQuest.DAlgebra import D_Value
+from PodemQuest.StaticLearning import LEARNING_IMPLICATION_LIMIT, StaticLearning
+
+# b = 0 implies d = e = 0 and f = 0, so f = 1 implies b = 1, which direct implication
+# cannot find from f = 1 alone
+BENCH = """INPUT(a)
+INPUT(b)
+INPUT(c)
+OUTPUT(f)
+d = AND(a, b)
+e = AND(b, c)
+f = OR(d, e)
+"""
+
+
+def make_circuit(tmp_path):
+    """
+    Returns the compiled reconvergent circuit of BENCH.
+    """
+    bench_file = tmp_path / "learning.bench"
+    bench_file.write_text(BENCH)
+    return Circuit(str(bench_file))
+
+
+def learned_implications(learning, circuit):
+    """
+    Returns the learned implications as a set of (source net, source value, target
+    net, target value) tuples.
+    """
+    implications = set()
+    for gate, targets in learning.gate_implications(circuit).items():
+        for source_value, value_targets in zip((D_Value.ZERO, D_Value.ONE), targets):
+            for target_gate, target_value in value_targets:
+                implications.add(
+                    (gate.outputpin, source_value, target_gate.outputpin, target_value)
+                )
+    return implications
+
+
+def test_learns_contrapositive_implication(tmp_path):
+    circuit = make_circuit(tmp_path)
+    learning = StaticLearning(circuit)
+    learning.learn()
+
+    implications = learned_implications(learning, circuit)
+    assert ("f", D_Value.ONE, "b", D_Value.ONE) in implications
+    assert learning.implication_count == len(implications)
+    assert learning.implication_limit == LEARNING_IMPLICATION_LIMIT
+
+
+def test_implication_limit_caps_learning(tmp_path):
+    circuit = make_circuit(tmp_path)
+    learning = StaticLearning(circuit)
+    learning.learn()
+    capped = StaticLearning(circuit, implication_limit=2)
+    capped.learn()
+
+    # The propagation of b = 0 stops before it reaches f, and the implications learned
+    # before the limit are a subset of the full set
+    full_implications = learned_implications(learning, circuit)
+    capped_implications = learned_implications(capped, circuit)
+    assert ("f", D_Value.ONE, "b", D_Value.ONE) not in capped_implications
+    assert capped_implications < full_implications